@@ -98,6 +98,12 @@ if __name__ == "__main__":
     parser.add_argument("--task", type=str, default="PnPCounterToCab", help="task")
     parser.add_argument("--layout", type=int, help="kitchen layout (choose number 0-9)")
     parser.add_argument("--style", type=int, help="kitchen style (choose number 0-11)")
+    parser.add_argument(
+        "--capture_dir",
+        type=str,
+        default=None,
+        help="directory to save rgb-d images to when pressing '5'",
+    )
     args = parser.parse_args()
 
     raw_layouts = dict(
@@ -124,6 +130,7 @@ if __name__ == "__main__":
         "robots": "PandaMobile",
         "controller_configs": load_controller_config(default_controller="OSC_POSE"),
         "translucent_robot": True,
+        "capture_dir": args.capture_dir,
     }
 
     args.renderer = "mjviewer"
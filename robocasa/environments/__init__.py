@@ -1,3 +1,189 @@
-from .kitchen.kitchen import REGISTERED_KITCHEN_ENVS
+"""
+Registry of kitchen environments. Environment modules are imported lazily: the module that defines an
+environment is only imported the first time the environment is created (e.g. through robosuite.make) or
+accessed as an attribute of the robocasa package.
+"""
+import importlib
 
-ALL_KITCHEN_ENVIRONMENTS = REGISTERED_KITCHEN_ENVS.keys()
+# maps the name of each kitchen environment to the module that defines it
+KITCHEN_ENV_MODULES = {
+    "Kitchen": "robocasa.environments.kitchen.kitchen",
+    "KitchenDemo": "robocasa.environments.kitchen.kitchen",
+    "CupcakeCleanup": "robocasa.environments.kitchen.multi_stage.baking.cupcake_cleanup",
+    "OrganizeBakingIngredients": "robocasa.environments.kitchen.multi_stage.baking.organize_baking_ingredients",
+    "PastryDisplay": "robocasa.environments.kitchen.multi_stage.baking.pastry_display",
+    "FillKettle": "robocasa.environments.kitchen.multi_stage.boiling.fill_kettle",
+    "HeatMultipleWater": "robocasa.environments.kitchen.multi_stage.boiling.heat_multiple_water",
+    "VeggieBoil": "robocasa.environments.kitchen.multi_stage.boiling.veggie_boil",
+    "ArrangeTea": "robocasa.environments.kitchen.multi_stage.brewing.arrange_tea",
+    "KettleBoiling": "robocasa.environments.kitchen.multi_stage.brewing.kettle_boiling",
+    "PrepareCoffee": "robocasa.environments.kitchen.multi_stage.brewing.prepare_coffee",
+    "ArrangeVegetables": "robocasa.environments.kitchen.multi_stage.chopping_food.arrange_vegetables",
+    "BreadSetupSlicing": "robocasa.environments.kitchen.multi_stage.chopping_food.bread_setup_slicing",
+    "ClearingTheCuttingBoard": "robocasa.environments.kitchen.multi_stage.chopping_food.clearing_the_cutting_board",
+    "MeatTransfer": "robocasa.environments.kitchen.multi_stage.chopping_food.meat_transfer",
+    "OrganizeVegetables": "robocasa.environments.kitchen.multi_stage.chopping_food.organize_vegetables",
+    "BowlAndCup": "robocasa.environments.kitchen.multi_stage.clearing_table.bowl_and_cup",
+    "CandleCleanup": "robocasa.environments.kitchen.multi_stage.clearing_table.candle_cleanup",
+    "ClearingCleaningReceptacles": "robocasa.environments.kitchen.multi_stage.clearing_table.clearing_cleaning_receptacles",
+    "CondimentCollection": "robocasa.environments.kitchen.multi_stage.clearing_table.condiment_collection",
+    "DessertAssembly": "robocasa.environments.kitchen.multi_stage.clearing_table.dessert_assembly",
+    "DrinkwareConsolidation": "robocasa.environments.kitchen.multi_stage.clearing_table.drinkware_consolidation",
+    "FoodCleanup": "robocasa.environments.kitchen.multi_stage.clearing_table.food_cleanup",
+    "DefrostByCategory": "robocasa.environments.kitchen.multi_stage.defrosting_food.defrost_by_category",
+    "MicrowaveThawing": "robocasa.environments.kitchen.multi_stage.defrosting_food.microwave_thawing",
+    "QuickThaw": "robocasa.environments.kitchen.multi_stage.defrosting_food.quick_thaw",
+    "ThawInSink": "robocasa.environments.kitchen.multi_stage.defrosting_food.thaw_in_sink",
+    "AssembleCookingArray": "robocasa.environments.kitchen.multi_stage.frying.assemble_cooking_array",
+    "FryingPanAdjustment": "robocasa.environments.kitchen.multi_stage.frying.frying_pan_adjustment",
+    "MealPrepStaging": "robocasa.environments.kitchen.multi_stage.frying.meal_prep_staging",
+    "SearingMeat": "robocasa.environments.kitchen.multi_stage.frying.searing_meat",
+    "SetupFrying": "robocasa.environments.kitchen.multi_stage.frying.setup_frying",
+    "BreadSelection": "robocasa.environments.kitchen.multi_stage.making_toast.bread_selection",
+    "CheesyBread": "robocasa.environments.kitchen.multi_stage.making_toast.cheesy_bread",
+    "PrepareToast": "robocasa.environments.kitchen.multi_stage.making_toast.prepare_toast",
+    "SweetSavoryToastSetup": "robocasa.environments.kitchen.multi_stage.making_toast.sweet_savory_toast_setup",
+    "PrepForTenderizing": "robocasa.environments.kitchen.multi_stage.meat_preparation.prep_for_tenderizing",
+    "PrepMarinatingMeat": "robocasa.environments.kitchen.multi_stage.meat_preparation.prep_marinating_meat",
+    "ColorfulSalsa": "robocasa.environments.kitchen.multi_stage.mixing_and_blending.colorful_salsa",
+    "SetupJuicing": "robocasa.environments.kitchen.multi_stage.mixing_and_blending.setup_juicing",
+    "SpicyMarinade": "robocasa.environments.kitchen.multi_stage.mixing_and_blending.spicy_marinade",
+    "HeatMug": "robocasa.environments.kitchen.multi_stage.reheating_food.heat_mug",
+    "MakeLoadedPotato": "robocasa.environments.kitchen.multi_stage.reheating_food.make_loaded_potato",
+    "SimmeringSauce": "robocasa.environments.kitchen.multi_stage.reheating_food.simmering_sauce",
+    "WaffleReheat": "robocasa.environments.kitchen.multi_stage.reheating_food.waffle_reheat",
+    "WarmCroissant": "robocasa.environments.kitchen.multi_stage.reheating_food.warm_croissant",
+    "BeverageSorting": "robocasa.environments.kitchen.multi_stage.restocking_supplies.beverage_sorting",
+    "RestockBowls": "robocasa.environments.kitchen.multi_stage.restocking_supplies.restock_bowls",
+    "RestockPantry": "robocasa.environments.kitchen.multi_stage.restocking_supplies.restock_pantry",
+    "StockingBreakfastFoods": "robocasa.environments.kitchen.multi_stage.restocking_supplies.stocking_breakfast_foods",
+    "CleanMicrowave": "robocasa.environments.kitchen.multi_stage.sanitize_surface.clean_microwave",
+    "CountertopCleanup": "robocasa.environments.kitchen.multi_stage.sanitize_surface.countertop_cleanup",
+    "PrepForSanitizing": "robocasa.environments.kitchen.multi_stage.sanitize_surface.prep_for_sanitizing",
+    "PushUtensilsToSink": "robocasa.environments.kitchen.multi_stage.sanitize_surface.push_utensils_to_sink",
+    "DessertUpgrade": "robocasa.environments.kitchen.multi_stage.serving_food.dessert_upgrade",
+    "PanTransfer": "robocasa.environments.kitchen.multi_stage.serving_food.pan_transfer",
+    "PlaceFoodInBowls": "robocasa.environments.kitchen.multi_stage.serving_food.place_food_in_bowls",
+    "PrepareSoupServing": "robocasa.environments.kitchen.multi_stage.serving_food.prepare_soup_serving",
+    "ServeSteak": "robocasa.environments.kitchen.multi_stage.serving_food.serve_steak",
+    "WineServingPrep": "robocasa.environments.kitchen.multi_stage.serving_food.wine_serving_prep",
+    "ArrangeBreadBasket": "robocasa.environments.kitchen.multi_stage.setting_the_table.arrange_bread_basket",
+    "BeverageOrganization": "robocasa.environments.kitchen.multi_stage.setting_the_table.beverage_organization",
+    "DateNight": "robocasa.environments.kitchen.multi_stage.setting_the_table.date_night",
+    "SeasoningSpiceSetup": "robocasa.environments.kitchen.multi_stage.setting_the_table.seasoning_spice_setup",
+    "SetBowlsForSoup": "robocasa.environments.kitchen.multi_stage.setting_the_table.set_bowls_for_soup",
+    "SizeSorting": "robocasa.environments.kitchen.multi_stage.setting_the_table.size_sorting",
+    "BreadAndCheese": "robocasa.environments.kitchen.multi_stage.snack_preparation.bread_and_cheese",
+    "CerealAndBowl": "robocasa.environments.kitchen.multi_stage.snack_preparation.cereal_and_bowl",
+    "MakeFruitBowl": "robocasa.environments.kitchen.multi_stage.snack_preparation.make_fruit_bowl",
+    "VeggieDipPrep": "robocasa.environments.kitchen.multi_stage.snack_preparation.veggie_dip_prep",
+    "YogurtDelightPrep": "robocasa.environments.kitchen.multi_stage.snack_preparation.yogurt_delight_prep",
+    "MultistepSteaming": "robocasa.environments.kitchen.multi_stage.steaming_food.multistep_steaming",
+    "SteamInMicrowave": "robocasa.environments.kitchen.multi_stage.steaming_food.steam_in_microwave",
+    "SteamVegetables": "robocasa.environments.kitchen.multi_stage.steaming_food.steam_vegetables",
+    "DrawerUtensilSort": "robocasa.environments.kitchen.multi_stage.tidying_cabinets_and_drawers.drawer_utensil_sort",
+    "OrganizeCleaningSupplies": "robocasa.environments.kitchen.multi_stage.tidying_cabinets_and_drawers.organize_cleaning_supplies",
+    "PantryMishap": "robocasa.environments.kitchen.multi_stage.tidying_cabinets_and_drawers.pantry_mishap",
+    "ShakerShuffle": "robocasa.environments.kitchen.multi_stage.tidying_cabinets_and_drawers.shaker_shuffle",
+    "SnackSorting": "robocasa.environments.kitchen.multi_stage.tidying_cabinets_and_drawers.snack_sorting",
+    "DryDishes": "robocasa.environments.kitchen.multi_stage.washing_dishes.dry_dishes",
+    "DryDrinkware": "robocasa.environments.kitchen.multi_stage.washing_dishes.dry_drinkware",
+    "PreSoakPan": "robocasa.environments.kitchen.multi_stage.washing_dishes.pre_soak_pan",
+    "SortingCleanup": "robocasa.environments.kitchen.multi_stage.washing_dishes.sorting_cleanup",
+    "StackBowlsInSink": "robocasa.environments.kitchen.multi_stage.washing_dishes.stack_bowls",
+    "AfterwashSorting": "robocasa.environments.kitchen.multi_stage.washing_fruits_and_vegetables.afterwash_sorting",
+    "ClearClutter": "robocasa.environments.kitchen.multi_stage.washing_fruits_and_vegetables.clear_clutter",
+    "DrainVeggies": "robocasa.environments.kitchen.multi_stage.washing_fruits_and_vegetables.drain_veggies",
+    "PrewashFoodAssembly": "robocasa.environments.kitchen.multi_stage.washing_fruits_and_vegetables.prewash_food_assembly",
+    "PnPCoffee": "robocasa.environments.kitchen.single_stage.kitchen_coffee",
+    "CoffeeSetupMug": "robocasa.environments.kitchen.single_stage.kitchen_coffee",
+    "CoffeeServeMug": "robocasa.environments.kitchen.single_stage.kitchen_coffee",
+    "CoffeePressButton": "robocasa.environments.kitchen.single_stage.kitchen_coffee",
+    "ManipulateDoor": "robocasa.environments.kitchen.single_stage.kitchen_doors",
+    "OpenDoor": "robocasa.environments.kitchen.single_stage.kitchen_doors",
+    "OpenSingleDoor": "robocasa.environments.kitchen.single_stage.kitchen_doors",
+    "OpenDoubleDoor": "robocasa.environments.kitchen.single_stage.kitchen_doors",
+    "CloseDoor": "robocasa.environments.kitchen.single_stage.kitchen_doors",
+    "CloseSingleDoor": "robocasa.environments.kitchen.single_stage.kitchen_doors",
+    "CloseDoubleDoor": "robocasa.environments.kitchen.single_stage.kitchen_doors",
+    "ManipulateDrawer": "robocasa.environments.kitchen.single_stage.kitchen_drawer",
+    "OpenDrawer": "robocasa.environments.kitchen.single_stage.kitchen_drawer",
+    "CloseDrawer": "robocasa.environments.kitchen.single_stage.kitchen_drawer",
+    "MicrowavePressButton": "robocasa.environments.kitchen.single_stage.kitchen_microwave",
+    "TurnOnMicrowave": "robocasa.environments.kitchen.single_stage.kitchen_microwave",
+    "TurnOffMicrowave": "robocasa.environments.kitchen.single_stage.kitchen_microwave",
+    "NavigateKitchen": "robocasa.environments.kitchen.single_stage.kitchen_navigate",
+    "PnP": "robocasa.environments.kitchen.single_stage.kitchen_pnp",
+    "PnPCounterToCab": "robocasa.environments.kitchen.single_stage.kitchen_pnp",
+    "PnPCabToCounter": "robocasa.environments.kitchen.single_stage.kitchen_pnp",
+    "PnPCounterToSink": "robocasa.environments.kitchen.single_stage.kitchen_pnp",
+    "PnPSinkToCounter": "robocasa.environments.kitchen.single_stage.kitchen_pnp",
+    "PnPCounterToMicrowave": "robocasa.environments.kitchen.single_stage.kitchen_pnp",
+    "PnPMicrowaveToCounter": "robocasa.environments.kitchen.single_stage.kitchen_pnp",
+    "PnPCounterToStove": "robocasa.environments.kitchen.single_stage.kitchen_pnp",
+    "PnPStoveToCounter": "robocasa.environments.kitchen.single_stage.kitchen_pnp",
+    "ManipulateSinkFaucet": "robocasa.environments.kitchen.single_stage.kitchen_sink",
+    "TurnOnSinkFaucet": "robocasa.environments.kitchen.single_stage.kitchen_sink",
+    "TurnOffSinkFaucet": "robocasa.environments.kitchen.single_stage.kitchen_sink",
+    "TurnSinkSpout": "robocasa.environments.kitchen.single_stage.kitchen_sink",
+    "ManipulateStoveKnob": "robocasa.environments.kitchen.single_stage.kitchen_stove",
+    "TurnOnStove": "robocasa.environments.kitchen.single_stage.kitchen_stove",
+    "TurnOffStove": "robocasa.environments.kitchen.single_stage.kitchen_stove",
+}
+
+# names of all kitchen environments. This is a live view, so it also includes environments
+# registered later on by other packages (e.g. mimicgen)
+ALL_KITCHEN_ENVIRONMENTS = KITCHEN_ENV_MODULES.keys()
+
+
+def load_kitchen_env(env_name):
+    """
+    Imports the module defining kitchen environment @env_name (if not imported yet) and returns the class
+
+    Args:
+        env_name (str): name of the kitchen environment
+
+    Returns:
+        class: the environment class
+    """
+    importlib.import_module(KITCHEN_ENV_MODULES[env_name])
+    from robocasa.environments.kitchen.kitchen import REGISTERED_KITCHEN_ENVS
+
+    return REGISTERED_KITCHEN_ENVS[env_name]
+
+
+class LazyKitchenEnv:
+    """
+    Placeholder registered with robosuite for kitchen environments whose module has not been imported yet.
+    When called (by robosuite.make), it imports the module, which registers the actual class in place of the
+    placeholder, and instantiates the environment.
+
+    Args:
+        env_name (str): name of the kitchen environment
+    """
+
+    def __init__(self, env_name):
+        self.env_name = env_name
+
+    def __call__(self, *args, **kwargs):
+        return load_kitchen_env(self.env_name)(*args, **kwargs)
+
+
+def register_lazy_kitchen_envs():
+    """
+    Registers placeholders for all kitchen environments that are not registered with robosuite yet
+    """
+    from robosuite.environments.base import REGISTERED_ENVS
+
+    for env_name in KITCHEN_ENV_MODULES:
+        if env_name not in REGISTERED_ENVS:
+            REGISTERED_ENVS[env_name] = LazyKitchenEnv(env_name)
+
+
+def __getattr__(name):
+    # backwards compatibility: REGISTERED_KITCHEN_ENVS used to be imported eagerly here
+    if name == "REGISTERED_KITCHEN_ENVS":
+        from robocasa.environments.kitchen.kitchen import REGISTERED_KITCHEN_ENVS
+
+        return REGISTERED_KITCHEN_ENVS
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
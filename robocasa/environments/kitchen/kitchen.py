@@ -4,6 +4,7 @@ import xml.etree.ElementTree as ET
 from copy import deepcopy
 
 import numpy as np
+import robosuite
 import robosuite.utils.transform_utils as T
 from robosuite.environments.manipulation.manipulation_env import ManipulationEnv
 from robosuite.models.tasks import ManipulationTask
@@ -19,24 +20,44 @@ from robosuite.environments.base import EnvMeta
 from scipy.spatial.transform import Rotation, Slerp
 import robocasa
 import robocasa.macros as macros
+from robocasa.environments import KITCHEN_ENV_MODULES
 import robocasa.utils.camera_utils as CamUtils
+from robocasa.utils.camera_randomization import (
+    apply_camera_noise,
+    get_randomized_cameras,
+    sample_camera_noise,
+    write_cameras_to_model,
+)
+from robocasa.utils.capture import AsyncFrameWriter, DirectorySink
+from robocasa.utils.contact_table import ContactTable
 import robocasa.utils.object_utils as OU
 import robocasa.models.scenes.scene_registry as SceneRegistry
 from robocasa.models.scenes import KitchenArena
 from robocasa.models.fixtures import *
 from robocasa.models.objects.kitchen_object_utils import sample_kitchen_object
+from robocasa.models.objects.kitchen_objects import OBJ_CATEGORIES
 from robocasa.models.objects.objects import MJCFObject
+from robocasa.utils.model_cache import compute_scene_signature, get_model_cache
+from robocasa.utils.nav_map import load_navigation_map
 from robocasa.utils.placement_samplers import (
     SequentialCompositeSampler,
     UniformRandomSampler,
 )
+from robocasa.utils.render_utils import MultiModalityRenderer
+from robocasa.utils.segmentation import (
+    FIXTURE_CLASSES,
+    SegmentationTable,
+    get_geom_ids,
+    get_semantic_classes,
+    segment_centroids,
+)
+from robocasa.utils.texture_randomizer import TextureRandomizer
 from robocasa.utils.texture_swap import (
+    apply_generative_textures,
     get_random_textures,
-    replace_cab_textures,
-    replace_counter_top_texture,
-    replace_floor_texture,
-    replace_wall_texture,
 )
+from robocasa.utils.transform_utils import quat_multiply_batch
+from robocasa.utils.xml_pipeline import XMLEditPipeline
 
 
 # jieun add========================================
@@ -45,7 +66,6 @@ import logging
 import yaml
 from robocasa.models.scenes.scene_registry import get_layout_path
 from scipy.spatial.transform import Rotation as R
-import matplotlib.pyplot as plt
 
 import robosuite.utils.camera_utils as CU
 from robosuite.utils.binding_utils import MjSim
@@ -54,8 +74,7 @@ from robosuite.utils.binding_utils import MjSim
 logging.basicConfig(
     level=logging.DEBUG, format="%(asctime)s - %(levelname)s - %(message)s"
 )
-import cv2
-from PIL import Image, ImageDraw, ImageFont
+# matplotlib, cv2 and PIL are only needed for saving images and are imported where used
 
 # =================================================
 REGISTERED_KITCHEN_ENVS = {}
@@ -63,6 +82,8 @@ REGISTERED_KITCHEN_ENVS = {}
 
 def register_kitchen_env(target_class):
     REGISTERED_KITCHEN_ENVS[target_class.__name__] = target_class
+    # make environments defined outside of robocasa (e.g. mimicgen) show up in ALL_KITCHEN_ENVIRONMENTS
+    KITCHEN_ENV_MODULES.setdefault(target_class.__name__, target_class.__module__)
 
 
 class KitchenEnvMeta(EnvMeta):
@@ -200,7 +221,66 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
         translucent_robot (bool): if True, will make the robot appear translucent during rendering
 
         randomize_cameras (bool): if True, will add gaussian noise to the position and rotation of the
-            wrist and agentview cameras
+            agentview cameras. The noise is applied to the compiled model on reset (so the model itself is
+            compiled with the nominal cameras and can be reused from the model cache) and is recorded in the
+            episode meta data as "cam_noise" for replay
+
+        camera_fovy_noise (float): if @randomize_cameras is True, standard deviation (in degrees) of the gaussian
+            noise added to the vertical field of view of the agentview cameras
+
+        model_cache (bool): if True, compiled MuJoCo models are cached by scene signature (layout, style,
+            fixture placements, robot base pose, objects, cameras and textures). Hard resets that produce a
+            scene that was already compiled skip xml processing and compilation. Note that
+            sim.model.get_xml() is not available for models restored from the cache, so keep this disabled
+            when recording demonstrations.
+
+        model_cache_dir (str): if set (and @model_cache is True), compiled models are also persisted to this
+            directory as MJB files so that they can be reused across processes
+
+        soft_reset (bool): if True, resets keep the current compiled model, fixtures and objects and only
+            re-sample the object placements, which are written to the sim directly. Much faster than a hard reset,
+            at the cost of less scene diversity per episode
+
+        soft_reset_fixture_states (bool): if True, soft resets also randomize the door, knob and faucet handle
+            states of fixtures that are not referenced by the task
+
+        soft_reset_camera_noise (bool): if True (and @randomize_cameras is True), soft resets also re-sample the
+            camera noise and apply it to the compiled model
+
+        soft_reset_textures (bool): if True (and @generative_textures is "100p"), soft resets also re-sample the
+            generative textures and write them into the texture buffers of the compiled model, without recompiling
+            (textures are resized to the resolution of the textures the model was compiled with). Note that
+            sim.model.get_xml() keeps referencing the textures the model was compiled with
+
+        scene_refresh_interval (int): if set, a full hard reset (new layout, style, fixtures and objects) is done
+            every @scene_refresh_interval episodes when @soft_reset is True
+
+        scene_bank (str or SceneBank): if set, hard resets draw a pre-generated scene (layout, style, fixtures,
+            objects, placements and settled sim state) from this scene bank instead of sampling one online.
+            See robocasa/scripts/generate_scene_bank.py
+
+        scene_bank_sequential (bool): if True, scenes are drawn from @scene_bank in order instead of at random
+
+        nav_map_dir (str): if set, precomputed navigation maps (see robocasa/scripts/generate_nav_maps.py) are
+            loaded from this directory. Robot base poses near static fixtures are looked up from the map of the
+            current layout and style, and layouts and styles whose map fails _check_nav_map are not sampled
+
+        batched_obj_obs (bool): if True, the poses of all objects (absolute and relative to the eef) are computed in
+            one vectorized sensor into a stacked (n_obj, 14) array (pos, quat, pos and quat relative to the eef).
+            The array is registered as the inactive "object_states" observable, since it can not be concatenated
+            with the flat object observations, and the per-object observations are read from it
+
+        capture_dir (str): directory that rgb-d / segmentation frames requested through set_save_image_flag are
+            written to. Defaults to macros.CAPTURE_DIR. If neither is set, frames are not captured
+
+        capture_camera (str): camera that frames are captured from
+
+        capture_workers (int): number of background threads encoding and writing captured frames
+
+        capture_buffer_size (int): maximum number of captured frames waiting to be written
+
+        capture_block (bool): if True, capturing a frame waits for a free buffer slot when @capture_buffer_size
+            frames are waiting to be written. Otherwise the frame is dropped (see capture_stats)
     """
 
     EXCLUDE_LAYOUTS = []
@@ -246,22 +326,40 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
         use_distractors=False,
         translucent_robot=False,
         randomize_cameras=False,
+        camera_fovy_noise=0.0,
+        model_cache=False,
+        model_cache_dir=None,
+        soft_reset=False,
+        soft_reset_fixture_states=False,
+        soft_reset_camera_noise=False,
+        soft_reset_textures=False,
+        scene_refresh_interval=None,
+        scene_bank=None,
+        scene_bank_sequential=False,
+        nav_map_dir=None,
+        batched_obj_obs=False,
+        capture_dir=None,
+        capture_camera="robot0_eye_in_hand",
+        capture_workers=2,
+        capture_buffer_size=8,
+        capture_block=False,
     ):
 
         # ADDITIONAL SETUP ========================================
 
-        # Set paths for saving images
-        self.base_path = "/home/libra/git/cotap_ws/dynamic_scene_graph/data_gen/robocasa/robocasa/rgb_d_gen"
-        self.rgb_path = os.path.join(self.base_path, "rgb")
-        self.depth_path = os.path.join(self.base_path, "depth")
-        self.seg_path = os.path.join(self.base_path, "seg")  # segmentation image
-        self.seg_label_path = os.path.join(
-            self.base_path, "seg_label"
-        )  # segmentation label
-        os.makedirs(self.seg_label_path, exist_ok=True)
-        os.makedirs(self.rgb_path, exist_ok=True)
-        os.makedirs(self.depth_path, exist_ok=True)
-        os.makedirs(self.seg_path, exist_ok=True)
+        # capture of rgb-d / segmentation frames, written in the background (see save_images_and_pose)
+        self.capture_dir = (
+            capture_dir if capture_dir is not None else macros.CAPTURE_DIR
+        )
+        self.capture_camera = capture_camera
+        self.capture_workers = capture_workers
+        self.capture_buffer_size = capture_buffer_size
+        self.capture_block = capture_block
+        self._capture_writer = None
+        self._capture_count = 0
+        self._multi_renderer = None
+        # geom id to segmentation label lookup table, built once per model
+        self._seg_table = None
 
         # Variable for detecting keyboard input
         self.save_image_flag = False
@@ -272,7 +370,7 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
         self.moving_camera = False
 
         # True will save rgb-depth image using keyboard press "5"
-        self.rgb_d_image = True
+        self.rgb_d_image = self.capture_dir is not None
 
         self.layout_objects = {}
         self.wall_info = {}
@@ -330,9 +428,54 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
         self.use_distractors = use_distractors
         self.translucent_robot = translucent_robot
         self.randomize_cameras = randomize_cameras
+        self.camera_fovy_noise = camera_fovy_noise
 
         # intialize cameras
         self._cam_configs = deepcopy(CamUtils.CAM_CONFIGS)
+        self._nominal_cam_configs = deepcopy(self._cam_configs)
+        self._cam_noise = None
+        self._cam_noise_enabled = True
+
+        # compiled model cache, shared across all environments in this process
+        self.model_cache = (
+            get_model_cache(cache_dir=model_cache_dir) if model_cache else None
+        )
+        self._scene_signature = None
+        self._pending_gen_fixtures = None
+
+        # soft reset settings
+        self.soft_reset = soft_reset
+        self.soft_reset_fixture_states = soft_reset_fixture_states
+        self.soft_reset_camera_noise = soft_reset_camera_noise
+        self.soft_reset_textures = soft_reset_textures
+        self._texture_randomizer = None
+        self.scene_refresh_interval = scene_refresh_interval
+        self._soft_resetting = False
+        self._episodes_in_scene = 0
+
+        # pre-generated scenes to draw episodes from
+        if isinstance(scene_bank, str):
+            from robocasa.utils.scene_bank import SceneBank
+
+            scene_bank = SceneBank(scene_bank)
+        self.scene_bank = scene_bank
+        self.scene_bank_sequential = scene_bank_sequential
+        self._scene_bank_index = 0
+        self._scene_bank_entry = None
+        self._pending_scene_state = None
+
+        self._fixture_index = None
+        # batched per-step fixture state updates, built in _setup_references
+        self._fixture_state_updaters = None
+        # contacts between objects, fixtures and grippers, built in _setup_references
+        self._contact_table = None
+
+        # precomputed navigation maps
+        self.nav_map_dir = nav_map_dir
+        self.nav_map = None
+        self._layout_feasible = {}
+
+        self.batched_obj_obs = batched_obj_obs
 
         initial_qpos = None
         if isinstance(robots, str):
@@ -385,21 +528,46 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
             seed=seed,
         )
 
+        # the initial reset done by the base class does not go through reset()
+        self._apply_scene_bank_state()
+
     def _load_model(self):
         """
         Loads an xml model, puts it in self.model
         """
         super()._load_model()
 
+        # draw a pre-generated scene from the scene bank
+        self._scene_bank_entry = None
+        self._pending_scene_state = None
+        if self.scene_bank is not None:
+            self._scene_bank_entry = self._sample_scene_bank_entry()
+            self._ep_meta = deepcopy(self._scene_bank_entry["ep_meta"])
+            self._pending_scene_state = np.array(self._scene_bank_entry["state"])
+
         # determine sample layout and style
         if "layout_id" in self._ep_meta and "style_id" in self._ep_meta:
             self.layout_id = self._ep_meta["layout_id"]
             self.style_id = self._ep_meta["style_id"]
         else:
-            layout_id, style_id = self.rng.choice(self.layout_and_style_ids)
+            layout_and_style_ids = self.layout_and_style_ids
+            if self.nav_map_dir is not None:
+                layout_and_style_ids = [
+                    (l, s)
+                    for (l, s) in layout_and_style_ids
+                    if self._is_layout_feasible(l, s)
+                ]
+                assert len(layout_and_style_ids) > 0, "no feasible layouts and styles"
+            layout_id, style_id = self.rng.choice(layout_and_style_ids)
             self.layout_id = int(layout_id)
             self.style_id = int(style_id)
 
+        self.nav_map = None
+        if self.nav_map_dir is not None:
+            self.nav_map = load_navigation_map(
+                self.nav_map_dir, self.layout_id, self.style_id
+            )
+
         if macros.VERBOSE:
             print("layout: {}, style: {}".format(self.layout_id, self.style_id))
 
@@ -426,6 +594,8 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
         # setup fixtures
         self.fixture_cfgs = self.mujoco_arena.get_fixture_cfgs()
         self.fixtures = {cfg["name"]: cfg["model"] for cfg in self.fixture_cfgs}
+        # the fixtures are not placed yet, the index is rebuilt once they are
+        self._fixture_index = None
 
         # setup scene, robots, objects
         self.model = ManipulationTask(
@@ -436,22 +606,38 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
 
         # if applicable: initialize the fixture locations
         fxtr_placement_initializer = self._get_placement_initializer(
-            self.fixture_cfgs, z_offset=0.0
+            self.fixture_cfgs,
+            z_offset=0.0,
+            max_backtracks=macros.PLACEMENT_MAX_BACKTRACKS,
         )
         fxtr_placements = None
-        for i in range(10):
-            try:
-                fxtr_placements = fxtr_placement_initializer.sample()
-            except RandomizationError as e:
+        if self._scene_bank_entry is not None:
+            fxtr_placements = self._get_scene_bank_placements(
+                "fixture_placements", self.fixtures
+            )
+        else:
+            for i in range(10):
+                try:
+                    fxtr_placements = fxtr_placement_initializer.sample()
+                except RandomizationError as e:
+                    if macros.VERBOSE:
+                        print(
+                            "Ranomization error in initial placement. Try #{}".format(i)
+                        )
+                    continue
+                break
+            if fxtr_placements is None:
                 if macros.VERBOSE:
-                    print("Ranomization error in initial placement. Try #{}".format(i))
-                continue
-            break
-        if fxtr_placements is None:
-            if macros.VERBOSE:
-                print("Could not place fixtures. Trying again with self._load_model()")
-            self._load_model()
-            return
+                    print(
+                        "Could not place fixtures. Trying again with self._load_model()"
+                    )
+                    for (
+                        name,
+                        reason,
+                    ) in fxtr_placement_initializer.failure_reasons.items():
+                        print("    {}: {}".format(name, reason))
+                self._load_model()
+                return
         self.fxtr_placements = fxtr_placements
         # Loop through all objects and reset their positions
         for obj_pos, obj_quat, obj in fxtr_placements.values():
@@ -462,40 +648,54 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
             # Hacky code to set orientation
             obj.set_euler(T.mat2euler(T.quat2mat(T.convert_quat(obj_quat, "xyzw"))))
 
+        # index the placed fixtures for fixture lookups
+        self._fixture_index = FixtureIndex(self.fixtures)
+        # fixtures are bound to the sim once it is built (see _setup_references)
+        self._fixture_state_updaters = None
+        # owners of the segmentation table may change even if a cached model is reused
+        self._seg_table = None
+
         # setup internal references related to fixtures
         self._setup_kitchen_references()
 
         # set robot position
-        if self.init_robot_base_pos is not None:
-            ref_fixture = self.get_fixture(self.init_robot_base_pos)
-        else:
-            fixtures = list(self.fixtures.values())
-            valid_src_fixture_classes = [
-                "CoffeeMachine",
-                "Toaster",
-                "Stove",
-                "Stovetop",
-                "SingleCabinet",
-                "HingeCabinet",
-                "OpenCabinet",
-                "Drawer",
-                "Microwave",
-                "Sink",
-                "Hood",
-                "Oven",
-                "Fridge",
-                "Dishwasher",
+        if self._scene_bank_entry is not None:
+            robot_base_pos, robot_base_ori = [
+                np.array(x) for x in self._ep_meta["robot_base"]
             ]
-            while True:
-                ref_fixture = self.rng.choice(fixtures)
-                fxtr_class = type(ref_fixture).__name__
-                if fxtr_class not in valid_src_fixture_classes:
-                    continue
-                break
+            self.robot_base_pose = robot_base_pos
+            self.robot_base_ori = robot_base_ori
+        else:
+            if self.init_robot_base_pos is not None:
+                ref_fixture = self.get_fixture(self.init_robot_base_pos)
+            else:
+                fixtures = list(self.fixtures.values())
+                valid_src_fixture_classes = [
+                    "CoffeeMachine",
+                    "Toaster",
+                    "Stove",
+                    "Stovetop",
+                    "SingleCabinet",
+                    "HingeCabinet",
+                    "OpenCabinet",
+                    "Drawer",
+                    "Microwave",
+                    "Sink",
+                    "Hood",
+                    "Oven",
+                    "Fridge",
+                    "Dishwasher",
+                ]
+                while True:
+                    ref_fixture = self.rng.choice(fixtures)
+                    fxtr_class = type(ref_fixture).__name__
+                    if fxtr_class not in valid_src_fixture_classes:
+                        continue
+                    break
 
-        robot_base_pos, robot_base_ori = self.compute_robot_base_placement_pose(
-            ref_fixture=ref_fixture
-        )
+            robot_base_pos, robot_base_ori = self.compute_robot_base_placement_pose(
+                ref_fixture=ref_fixture
+            )
         robot_model = self.robots[0].robot_model
         robot_model.set_base_xpos(robot_base_pos)
         robot_model.set_base_ori(robot_base_ori)
@@ -533,11 +733,13 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
             info = object_info
 
             object = MJCFObject(name=cfg["name"], **object_kwargs)
+            self._object_kwargs[cfg["name"]] = object_kwargs
 
             return object, info
 
         # add objects
         self.objects = {}
+        self._object_kwargs = {}
         if "object_cfgs" in self._ep_meta:
             self.object_cfgs = self._ep_meta["object_cfgs"]
             for obj_num, cfg in enumerate(self.object_cfgs):
@@ -597,28 +799,60 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
 
             # # remove objects that didn't get created
             # self.object_cfgs = [cfg for cfg in self.object_cfgs if "model" in cfg]
-        self.placement_initializer = self._get_placement_initializer(self.object_cfgs)
+        self.placement_initializer = self._get_placement_initializer(
+            self.object_cfgs, max_backtracks=macros.PLACEMENT_MAX_BACKTRACKS
+        )
 
         object_placements = None
-        for i in range(1):
-            try:
-                object_placements = self.placement_initializer.sample(
-                    placed_objects=self.fxtr_placements
-                )
-            except RandomizationError as e:
-                if macros.VERBOSE:
-                    print("Ranomization error in initial placement. Try #{}".format(i))
-                continue
+        if self._scene_bank_entry is not None:
+            object_placements = self._get_scene_bank_placements(
+                "object_placements", self.objects
+            )
+        else:
+            for i in range(1):
+                try:
+                    object_placements = self.placement_initializer.sample(
+                        placed_objects=self.fxtr_placements
+                    )
+                except RandomizationError as e:
+                    if macros.VERBOSE:
+                        print(
+                            "Ranomization error in initial placement. Try #{}".format(i)
+                        )
+                    continue
 
-            break
-        if object_placements is None:
-            if macros.VERBOSE:
-                print("Could not place objects. Trying again with self._load_model()")
-            self._load_model()
-            return
+                break
+            if object_placements is None:
+                if macros.VERBOSE:
+                    print(
+                        "Could not place objects. Trying again with self._load_model()"
+                    )
+                    for (
+                        name,
+                        reason,
+                    ) in self.placement_initializer.failure_reasons.items():
+                        print("    {}: {}".format(name, reason))
+                self._load_model()
+                return
         # object_placements 보니깐 object 이름이랑 위치, 방향이랑 같이 들어가 있음
         self.object_placements = object_placements
 
+        # sample generative textures here (consumed in edit_model_xml) so that the scene signature
+        # is fully known before the model is compiled
+        self._pending_gen_fixtures = None
+        if (self.generative_textures is not None) and (
+            self.generative_textures is not False
+        ):
+            assert self.generative_textures == "100p"
+            if self._scene_bank_entry is not None and self._ep_meta.get("gen_textures"):
+                self._pending_gen_fixtures = self._ep_meta["gen_textures"]
+            else:
+                self._pending_gen_fixtures = get_random_textures(self.rng)
+
+        self._scene_signature = None
+        if self.model_cache is not None:
+            self._scene_signature = self._get_scene_signature()
+
         # logging.info("self.layout_id: {}".format(self.layout_id))
         # logging.debug("self.style_id: {}".format(self.style_id))
         # logging.debug("self.layout_and_style_ids: {}".format(self.layout_and_style_ids))
@@ -629,6 +863,72 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
         # print(f"Number of object configurations: {len(self.object_cfgs)}")
         # print(f"Object configuration names: {[cfg['name'] for cfg in self.object_cfgs]}")
 
+    def _get_scene_signature(self):
+        """
+        Computes a signature of everything that is baked into the compiled model for the current scene.
+        Object poses are not part of the signature since they are applied through qpos in _reset_internal.
+
+        Returns:
+            str or None: signature of the scene, or None if the scene should not be cached
+        """
+        if macros.SHOW_SITES is True:
+            # reset region visualization sites depend on the sampled placements
+            return None
+
+        fixtures = {
+            name: [
+                type(fxtr).__name__,
+                fxtr._obj.get("pos"),
+                fxtr._obj.get("quat"),
+                fxtr._obj.get("euler"),
+            ]
+            for (name, fxtr) in self.fixtures.items()
+        }
+        return compute_scene_signature(
+            dict(
+                env=type(self).__name__,
+                layout_id=self.layout_id,
+                style_id=self.style_id,
+                robots=self.robot_configs,
+                robot_base=[self.robot_base_pose, self.robot_base_ori],
+                fixtures=fixtures,
+                objects=self._object_kwargs,
+                cameras=self._cam_configs,
+                gen_textures=self._pending_gen_fixtures,
+                xml_processors=[
+                    getattr(p, "__qualname__", str(p)) for p in self._xml_processors
+                ],
+            )
+        )
+
+    def _initialize_sim(self, xml_string=None):
+        """
+        Creates a MjSim object and stores it in self.sim. If the compiled model cache is enabled and the
+        current scene has been compiled before, the cached model is reused instead of processing and
+        compiling the xml.
+
+        Args:
+            xml_string (str): If specified, creates MjSim object from this xml string
+        """
+        key = self._scene_signature
+        if xml_string is not None or self.model_cache is None or key is None:
+            super()._initialize_sim(xml_string=xml_string)
+            return
+
+        mj_model = self.model_cache.get(key)
+        if mj_model is None:
+            super()._initialize_sim()
+            self.model_cache.put(key, self.sim.model._model)
+            return
+
+        # textures were already applied when the cached model was compiled
+        self._curr_gen_fixtures = self._pending_gen_fixtures
+        self._pending_gen_fixtures = None
+
+        self.sim = MjSim(mj_model)
+        self.sim.forward()
+        self.initialize_time(self.control_freq)
+
     # 추가 해서 self.object_info에 각 객체의 레이블과 3D 바운딩 박스 정보가 저장시킴
     def _get_object_info(self):
         object_info = {}
@@ -765,6 +1065,39 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
         if self.hard_reset:
             self._observables = self._setup_observables()
 
+    def _is_layout_feasible(self, layout_id, style_id):
+        """
+        Checks whether this task can be done in the given layout and style, based on the precomputed
+        navigation map. Layouts and styles without a map are assumed to be feasible.
+
+        Args:
+            layout_id (int): layout id
+
+            style_id (int): style id
+
+        Returns:
+            bool: True if the layout and style are feasible
+        """
+        key = (int(layout_id), int(style_id))
+        if key not in self._layout_feasible:
+            nav_map = load_navigation_map(self.nav_map_dir, *key)
+            self._layout_feasible[key] = nav_map is None or self._check_nav_map(nav_map)
+        return self._layout_feasible[key]
+
+    def _check_nav_map(self, nav_map):
+        """
+        Task-specific feasibility check of a navigation map, overridden by tasks with additional requirements.
+        By default, a layout and style are feasible if the robot base fits at the candidate base pose of at
+        least one static fixture.
+
+        Args:
+            nav_map (NavigationMap): navigation map of a layout and style
+
+        Returns:
+            bool: True if the task is feasible in this layout and style
+        """
+        return bool(np.any(nav_map.base_components > 0))
+
     def compute_robot_base_placement_pose(self, ref_fixture, offset=None):
         """
         steps:
@@ -772,15 +1105,45 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
         2. compute offset relative to this counter
         3. transform offset to global coordinates
 
+        If a navigation map is loaded for the current layout and style, the pose for static
+        reference fixtures is looked up instead.
+
         Args:
             ref_fixture (Fixture): reference fixture to place th robot near
 
             offset (list): offset to add to the base position
 
         """
-        # step 1: find vase fixture closest to robot
-        base_fixture = None
+        base_pose = None
+        if (
+            offset is None
+            and self.nav_map is not None
+            and self.nav_map.has_fixture(ref_fixture.name, pos=ref_fixture.pos)
+        ):
+            base_pose = self.nav_map.get_base_pose(ref_fixture.name)
+        if base_pose is None:
+            base_pose = self._compute_robot_base_placement_pose(
+                ref_fixture, offset=offset
+            )
+        robot_base_pos, robot_base_ori = base_pose
+
+        # 여기 로봇 위치 실시간 추정
+        self.robot_base_ori = robot_base_ori
+        self.robot_base_pose = robot_base_pos
 
+        return robot_base_pos, robot_base_ori
+
+    def _get_robot_base_fixture(self, ref_fixture):
+        """
+        Finds the fixture the robot base is placed in front of to reach @ref_fixture: the counter, stove, housing
+        cabinet or fridge below @ref_fixture, or @ref_fixture itself if there is none
+
+        Args:
+            ref_fixture (Fixture): reference fixture to place the robot near
+
+        Returns:
+            Fixture: base fixture
+        """
         # get all base fixtures in the environment
         base_fixtures = [
             fxtr
@@ -797,13 +1160,28 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
             point = ref_fixture.pos
             if not OU.point_in_fixture(point=point, fixture=fxtr, only_2d=True):
                 continue
-            base_fixture = fxtr
-            break
+            return fxtr
 
         # set the base fixture as the ref fixture itself if cannot find fixture containing ref
-        if base_fixture is None:
-            base_fixture = ref_fixture
-        # assert base_fixture is not None
+        return ref_fixture
+
+    def _compute_robot_base_placement_pose(self, ref_fixture, offset=None):
+        """
+        Computes the robot base pose near @ref_fixture (see compute_robot_base_placement_pose),
+        without setting it
+
+        Args:
+            ref_fixture (Fixture): reference fixture to place th robot near
+
+            offset (list): offset to add to the base position
+
+        Returns:
+            2-tuple:
+                - (np.array) robot base position
+                - (np.array) robot base orientation (euler)
+        """
+        # step 1: find vase fixture closest to robot
+        base_fixture = self._get_robot_base_fixture(ref_fixture)
 
         # step 2: compute offset relative to this counter
         base_to_ref, _ = OU.get_rel_transform(base_fixture, ref_fixture)
@@ -831,13 +1209,9 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
         ]
         robot_base_ori = np.array([0, 0, base_fixture.rot + np.pi / 2])
 
-        # 여기 로봇 위치 실시간 추정
-        self.robot_base_ori = robot_base_ori
-        self.robot_base_pose = robot_base_pos
-
         return robot_base_pos, robot_base_ori
 
-    def _get_placement_initializer(self, cfg_list, z_offset=0.01):
+    def _get_placement_initializer(self, cfg_list, z_offset=0.01, max_backtracks=0):
 
         """
         Creates a placement initializer for the objects/fixtures based on the specifications in the configurations list
@@ -847,190 +1221,216 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
 
             z_offset (float): offset in z direction
 
+            max_backtracks (int): number of local backtracking steps the placement initializer may take when an
+                object cannot be placed (see SequentialCompositeSampler)
+
         Returns:
             SequentialCompositeSampler: placement initializer
 
         """
 
         placement_initializer = SequentialCompositeSampler(
-            name="SceneSampler", rng=self.rng
+            name="SceneSampler", rng=self.rng, max_backtracks=max_backtracks
         )
 
         for (obj_i, cfg) in enumerate(cfg_list):
-            # determine which object is being placed
-            if cfg["type"] == "fixture":
-                mj_obj = self.fixtures[cfg["name"]]
-            elif cfg["type"] == "object":
-                mj_obj = self.objects[cfg["name"]]
-            else:
-                raise ValueError
-
-            placement = cfg.get("placement", None)
-            if placement is None:
+            sampler = self._get_placement_sampler(
+                cfg, z_offset=z_offset, site_postfix=str(obj_i)
+            )
+            if sampler is None:
                 continue
-            fixture_id = placement.get("fixture", None)
-            if fixture_id is not None:
-                # get fixture to place object on
-                fixture = self.get_fixture(
-                    id=fixture_id,
-                    ref=placement.get("ref", None),
-                )
+            placement_initializer.append_sampler(
+                sampler=sampler,
+                sample_args=cfg["placement"].get("sample_args", None),
+                # re-creating the sampler re-samples the reset region of the fixture
+                resampler=lambda cfg=cfg: self._get_placement_sampler(
+                    cfg, z_offset=z_offset
+                ),
+            )
 
-                # calculate the total available space where object could be placed
-                sample_region_kwargs = placement.get("sample_region_kwargs", {})
-                reset_region = fixture.sample_reset_region(
-                    env=self, **sample_region_kwargs
-                )
-                outer_size = reset_region["size"]
-                margin = placement.get("margin", 0.04)
-                outer_size = (outer_size[0] - margin, outer_size[1] - margin)
-
-                # calculate the size of the inner region where object will actually be placed
-                target_size = placement.get("size", None)
-                if target_size is not None:
-                    target_size = deepcopy(list(target_size))
-                    for size_dim in [0, 1]:
-                        if target_size[size_dim] == "obj":
-                            target_size[size_dim] = mj_obj.size[size_dim] + 0.005
-                        if target_size[size_dim] == "obj.x":
-                            target_size[size_dim] = mj_obj.size[0] + 0.005
-                        if target_size[size_dim] == "obj.y":
-                            target_size[size_dim] = mj_obj.size[1] + 0.005
-                    inner_size = np.min((outer_size, target_size), axis=0)
-                else:
-                    inner_size = outer_size
-
-                inner_xpos, inner_ypos = placement.get("pos", (None, None))
-                offset = placement.get("offset", (0.0, 0.0))
-
-                # center inner region within outer region
-                if inner_xpos == "ref":
-                    # compute optimal placement of inner region to match up with the reference fixture
-                    x_halfsize = outer_size[0] / 2 - inner_size[0] / 2
-                    if x_halfsize == 0.0:
-                        inner_xpos = 0.0
-                    else:
-                        ref_fixture = self.get_fixture(
-                            placement["sample_region_kwargs"]["ref"]
-                        )
-                        ref_pos = ref_fixture.pos
-                        fixture_to_ref = OU.get_rel_transform(fixture, ref_fixture)[0]
-                        outer_to_ref = fixture_to_ref - reset_region["offset"]
-                        inner_xpos = outer_to_ref[0] / x_halfsize
-                        inner_xpos = np.clip(inner_xpos, a_min=-1.0, a_max=1.0)
-                elif inner_xpos is None:
-                    inner_xpos = 0.0
+        return placement_initializer
 
-                if inner_ypos is None:
-                    inner_ypos = 0.0
-                # offset for inner region
-                intra_offset = (
-                    (outer_size[0] / 2 - inner_size[0] / 2) * inner_xpos + offset[0],
-                    (outer_size[1] / 2 - inner_size[1] / 2) * inner_ypos + offset[1],
-                )
+    def _get_placement_sampler(self, cfg, z_offset=0.01, site_postfix=None):
+        """
+        Creates the placement sampler for a single object/fixture configuration. The reset region is sampled from
+        the regions of the target fixture, so calling this again can give a sampler over a different region
+
+        Args:
+            cfg (dict): object / fixture configuration
 
-                # center surface point of entire region
-                ref_pos = fixture.pos + [0, 0, reset_region["offset"][2]]
-                ref_rot = fixture.rot
+            z_offset (float): offset in z direction
 
-                # x, y, and rotational ranges for randomization
-                x_range = (
-                    np.array([-inner_size[0] / 2, inner_size[0] / 2])
-                    + reset_region["offset"][0]
-                    + intra_offset[0]
-                )
-                y_range = (
-                    np.array([-inner_size[1] / 2, inner_size[1] / 2])
-                    + reset_region["offset"][1]
-                    + intra_offset[1]
-                )
-                rotation = placement.get("rotation", np.array([-np.pi / 4, np.pi / 4]))
+            site_postfix (str): if specified (and macros.SHOW_SITES is True), the reset regions are visualized with
+                sites named with this postfix
+
+        Returns:
+            UniformRandomSampler or None: placement sampler, or None if the configuration has no placement
+        """
+        # determine which object is being placed
+        if cfg["type"] == "fixture":
+            mj_obj = self.fixtures[cfg["name"]]
+        elif cfg["type"] == "object":
+            mj_obj = self.objects[cfg["name"]]
+        else:
+            raise ValueError
+
+        placement = cfg.get("placement", None)
+        if placement is None:
+            return None
+        fixture_id = placement.get("fixture", None)
+        if fixture_id is not None:
+            # get fixture to place object on
+            fixture = self.get_fixture(
+                id=fixture_id,
+                ref=placement.get("ref", None),
+            )
+
+            # calculate the total available space where object could be placed
+            sample_region_kwargs = placement.get("sample_region_kwargs", {})
+            reset_region = fixture.sample_reset_region(env=self, **sample_region_kwargs)
+            outer_size = reset_region["size"]
+            margin = placement.get("margin", 0.04)
+            outer_size = (outer_size[0] - margin, outer_size[1] - margin)
+
+            # calculate the size of the inner region where object will actually be placed
+            target_size = placement.get("size", None)
+            if target_size is not None:
+                target_size = deepcopy(list(target_size))
+                for size_dim in [0, 1]:
+                    if target_size[size_dim] == "obj":
+                        target_size[size_dim] = mj_obj.size[size_dim] + 0.005
+                    if target_size[size_dim] == "obj.x":
+                        target_size[size_dim] = mj_obj.size[0] + 0.005
+                    if target_size[size_dim] == "obj.y":
+                        target_size[size_dim] = mj_obj.size[1] + 0.005
+                inner_size = np.min((outer_size, target_size), axis=0)
             else:
-                target_size = placement.get("size", None)
-                x_range = np.array([-target_size[0] / 2, target_size[0] / 2])
-                y_range = np.array([-target_size[1] / 2, target_size[1] / 2])
-                rotation = placement.get("rotation", np.array([-np.pi / 4, np.pi / 4]))
-                ref_pos = [0, 0, 0]
-                ref_rot = 0.0
-
-            if macros.SHOW_SITES is True:
-                """
-                show outer reset region
-                """
-                pos_to_vis = deepcopy(ref_pos)
-                pos_to_vis[:2] += T.rotate_2d_point(
-                    [reset_region["offset"][0], reset_region["offset"][1]], rot=ref_rot
-                )
-                size_to_vis = np.concatenate(
-                    [
-                        np.abs(
-                            T.rotate_2d_point(
-                                [outer_size[0] / 2, outer_size[1] / 2], rot=ref_rot
-                            )
-                        ),
-                        [0.001],
-                    ]
-                )
-                site_str = """<site type="box" rgba="0 0 1 0.4" size="{size}" pos="{pos}" name="reset_region_outer_{postfix}"/>""".format(
-                    pos=array_to_string(pos_to_vis),
-                    size=array_to_string(size_to_vis),
-                    postfix=str(obj_i),
-                )
-                site_tree = ET.fromstring(site_str)
-                self.model.worldbody.append(site_tree)
+                inner_size = outer_size
 
-                """
-                show inner reset region
-                """
-                pos_to_vis = deepcopy(ref_pos)
-                pos_to_vis[:2] += T.rotate_2d_point(
-                    [np.mean(x_range), np.mean(y_range)], rot=ref_rot
-                )
-                size_to_vis = np.concatenate(
-                    [
-                        np.abs(
-                            T.rotate_2d_point(
-                                [
-                                    (x_range[1] - x_range[0]) / 2,
-                                    (y_range[1] - y_range[0]) / 2,
-                                ],
-                                rot=ref_rot,
-                            )
-                        ),
-                        [0.002],
-                    ]
-                )
-                site_str = """<site type="box" rgba="1 0 0 0.4" size="{size}" pos="{pos}" name="reset_region_inner_{postfix}"/>""".format(
-                    pos=array_to_string(pos_to_vis),
-                    size=array_to_string(size_to_vis),
-                    postfix=str(obj_i),
-                )
-                site_tree = ET.fromstring(site_str)
-                self.model.worldbody.append(site_tree)
+            inner_xpos, inner_ypos = placement.get("pos", (None, None))
+            offset = placement.get("offset", (0.0, 0.0))
 
-            placement_initializer.append_sampler(
-                sampler=UniformRandomSampler(
-                    name="{}_Sampler".format(cfg["name"]),
-                    mujoco_objects=mj_obj,
-                    x_range=x_range,
-                    y_range=y_range,
-                    rotation=rotation,
-                    ensure_object_boundary_in_range=placement.get(
-                        "ensure_object_boundary_in_range", True
+            # center inner region within outer region
+            if inner_xpos == "ref":
+                # compute optimal placement of inner region to match up with the reference fixture
+                x_halfsize = outer_size[0] / 2 - inner_size[0] / 2
+                if x_halfsize == 0.0:
+                    inner_xpos = 0.0
+                else:
+                    ref_fixture = self.get_fixture(
+                        placement["sample_region_kwargs"]["ref"]
+                    )
+                    ref_pos = ref_fixture.pos
+                    fixture_to_ref = OU.get_rel_transform(fixture, ref_fixture)[0]
+                    outer_to_ref = fixture_to_ref - reset_region["offset"]
+                    inner_xpos = outer_to_ref[0] / x_halfsize
+                    inner_xpos = np.clip(inner_xpos, a_min=-1.0, a_max=1.0)
+            elif inner_xpos is None:
+                inner_xpos = 0.0
+
+            if inner_ypos is None:
+                inner_ypos = 0.0
+            # offset for inner region
+            intra_offset = (
+                (outer_size[0] / 2 - inner_size[0] / 2) * inner_xpos + offset[0],
+                (outer_size[1] / 2 - inner_size[1] / 2) * inner_ypos + offset[1],
+            )
+
+            # center surface point of entire region
+            ref_pos = fixture.pos + [0, 0, reset_region["offset"][2]]
+            ref_rot = fixture.rot
+
+            # x, y, and rotational ranges for randomization
+            x_range = (
+                np.array([-inner_size[0] / 2, inner_size[0] / 2])
+                + reset_region["offset"][0]
+                + intra_offset[0]
+            )
+            y_range = (
+                np.array([-inner_size[1] / 2, inner_size[1] / 2])
+                + reset_region["offset"][1]
+                + intra_offset[1]
+            )
+            rotation = placement.get("rotation", np.array([-np.pi / 4, np.pi / 4]))
+        else:
+            target_size = placement.get("size", None)
+            x_range = np.array([-target_size[0] / 2, target_size[0] / 2])
+            y_range = np.array([-target_size[1] / 2, target_size[1] / 2])
+            rotation = placement.get("rotation", np.array([-np.pi / 4, np.pi / 4]))
+            ref_pos = [0, 0, 0]
+            ref_rot = 0.0
+
+        if macros.SHOW_SITES is True and site_postfix is not None:
+            """
+            show outer reset region
+            """
+            pos_to_vis = deepcopy(ref_pos)
+            pos_to_vis[:2] += T.rotate_2d_point(
+                [reset_region["offset"][0], reset_region["offset"][1]], rot=ref_rot
+            )
+            size_to_vis = np.concatenate(
+                [
+                    np.abs(
+                        T.rotate_2d_point(
+                            [outer_size[0] / 2, outer_size[1] / 2], rot=ref_rot
+                        )
                     ),
-                    ensure_valid_placement=placement.get(
-                        "ensure_valid_placement", True
+                    [0.001],
+                ]
+            )
+            site_str = """<site type="box" rgba="0 0 1 0.4" size="{size}" pos="{pos}" name="reset_region_outer_{postfix}"/>""".format(
+                pos=array_to_string(pos_to_vis),
+                size=array_to_string(size_to_vis),
+                postfix=site_postfix,
+            )
+            site_tree = ET.fromstring(site_str)
+            self.model.worldbody.append(site_tree)
+
+            """
+            show inner reset region
+            """
+            pos_to_vis = deepcopy(ref_pos)
+            pos_to_vis[:2] += T.rotate_2d_point(
+                [np.mean(x_range), np.mean(y_range)], rot=ref_rot
+            )
+            size_to_vis = np.concatenate(
+                [
+                    np.abs(
+                        T.rotate_2d_point(
+                            [
+                                (x_range[1] - x_range[0]) / 2,
+                                (y_range[1] - y_range[0]) / 2,
+                            ],
+                            rot=ref_rot,
+                        )
                     ),
-                    reference_pos=ref_pos,
-                    reference_rot=ref_rot,
-                    z_offset=z_offset,
-                    rng=self.rng,
-                    rotation_axis=placement.get("rotation_axis", "z"),
-                ),
-                sample_args=placement.get("sample_args", None),
+                    [0.002],
+                ]
             )
-
-        return placement_initializer
+            site_str = """<site type="box" rgba="1 0 0 0.4" size="{size}" pos="{pos}" name="reset_region_inner_{postfix}"/>""".format(
+                pos=array_to_string(pos_to_vis),
+                size=array_to_string(size_to_vis),
+                postfix=site_postfix,
+            )
+            site_tree = ET.fromstring(site_str)
+            self.model.worldbody.append(site_tree)
+
+        return UniformRandomSampler(
+            name="{}_Sampler".format(cfg["name"]),
+            mujoco_objects=mj_obj,
+            x_range=x_range,
+            y_range=y_range,
+            rotation=rotation,
+            ensure_object_boundary_in_range=placement.get(
+                "ensure_object_boundary_in_range", True
+            ),
+            ensure_valid_placement=placement.get("ensure_valid_placement", True),
+            reference_pos=ref_pos,
+            reference_rot=ref_rot,
+            z_offset=z_offset,
+            rng=self.rng,
+            rotation_axis=placement.get("rotation_axis", "z"),
+        )
 
     def _reset_internal(self):
         """
@@ -1040,6 +1440,9 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
 
         # Reset all object positions using initializer sampler if we're not directly loading from an xml
         if not self.deterministic_reset and self.placement_initializer is not None:
+            if self._soft_resetting:
+                self._resample_object_placements()
+
             # use pre-computed object placements
             object_placements = self.object_placements
 
@@ -1050,7 +1453,38 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
                     np.concatenate([np.array(obj_pos), np.array(obj_quat)]),
                 )
 
-        # step through a few timesteps to settle objects
+        if self._soft_resetting:
+            if self.soft_reset_fixture_states:
+                self._randomize_fixture_states()
+            if (
+                self.soft_reset_camera_noise
+                and self.randomize_cameras
+                and self._cam_noise_enabled
+            ):
+                self._sample_camera_noise(from_ep_meta=False)
+                self._apply_camera_noise()
+            if self.soft_reset_textures and self.generative_textures == "100p":
+                self._randomize_textures_in_sim()
+
+        elif self._cam_noise is not None:
+            # the model is compiled with the nominal cameras, the noise sampled in set_cameras is applied to the
+            # compiled model
+            self._apply_camera_noise()
+
+        # scenes from the scene bank are already settled, their state is applied after the reset
+        if self._pending_scene_state is None:
+            self._settle_objects()
+
+        # Add this at the end of the method
+
+        self.object_info = self._get_object_info()
+        self.fixture_info = self._get_fixture_info()  # fixture_info 설정
+        # logging.info(f"!!!!!!!!!!!!!!!!!!!!!! Object info: {self.object_info}")
+
+    def _settle_objects(self):
+        """
+        Steps through a few timesteps with an empty action to settle objects
+        """
         action = np.zeros(self.action_spec[0].shape)  # apply empty action
 
         # Since the env.step frequency is slower than the mjsim timestep frequency, the internal controller will output
@@ -1067,11 +1501,215 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
             self.sim.step2()
             policy_step = False
 
-        # Add this at the end of the method
+    def reset(self):
+        """
+        Resets the environment. If soft resets are enabled, the current model is kept and only the object
+        placements (and optionally fixture states and camera noise) are re-sampled. Otherwise (and every
+        @scene_refresh_interval episodes) a regular reset is done.
 
+        Returns:
+            OrderedDict: Environment observation space after reset occurs
+        """
+        if not self.soft_reset:
+            obs = super().reset()
+            if self._apply_scene_bank_state():
+                obs = self._get_observations(force_update=True)
+            return obs
+
+        self._soft_resetting = not self.deterministic_reset and (
+            self.scene_refresh_interval is None
+            or self._episodes_in_scene < self.scene_refresh_interval
+        )
+        self._episodes_in_scene = (
+            self._episodes_in_scene + 1 if self._soft_resetting else 1
+        )
+
+        hard_reset = self.hard_reset
+        self.hard_reset = not self._soft_resetting
+        try:
+            obs = super().reset()
+        finally:
+            self.hard_reset = hard_reset
+            self._soft_resetting = False
+        if self._apply_scene_bank_state():
+            obs = self._get_observations(force_update=True)
+        return obs
+
+    def _sample_scene_bank_entry(self):
+        """
+        Draws the next scene from the scene bank, either at random or in order if @scene_bank_sequential is set
+
+        Returns:
+            dict: scene bank entry with "ep_meta" and "state" keys
+        """
+        if self.scene_bank_sequential:
+            index = self._scene_bank_index % len(self.scene_bank)
+            self._scene_bank_index += 1
+        else:
+            index = int(self.rng.integers(len(self.scene_bank)))
+        return self.scene_bank[index]
+
+    def _get_scene_bank_placements(self, key, models):
+        """
+        Reads placements stored in the current scene bank entry
+
+        Args:
+            key (str): ep_meta key of the placements, either "fixture_placements" or "object_placements"
+
+            models (dict): maps names to the fixture / object models in the current scene
+
+        Returns:
+            dict: placements in the same format as the placement samplers: name -> (pos, quat, model)
+        """
+        return {
+            name: (np.array(pos), np.array(quat), models[name])
+            for (name, (pos, quat)) in self._ep_meta[key].items()
+        }
+
+    def _apply_scene_bank_state(self):
+        """
+        Restores the settled object and fixture joint states of the scene drawn from the scene bank, if they have
+        not been applied yet. The state is applied after the reset, so the robot joints and the sim time are kept:
+        the controllers and observables were reset with them
+
+        Returns:
+            bool: True if a state was applied
+        """
+        if self._pending_scene_state is None:
+            return False
+        state = self._pending_scene_state
+        self._pending_scene_state = None
+
+        model = self.sim.model
+        nq, nv = model.nq, model.nv
+        robot_qpos, robot_qvel = self._get_robot_state_mask()
+        # flattened states are [time, qpos, qvel, ...]
+        self.sim.data.qpos[~robot_qpos] = state[1 : 1 + nq][~robot_qpos]
+        self.sim.data.qvel[~robot_qvel] = state[1 + nq : 1 + nq + nv][~robot_qvel]
+        self.sim.forward()
+        if self._contact_table is not None:
+            self._contact_table.invalidate()
+        self.update_state()
         self.object_info = self._get_object_info()
-        self.fixture_info = self._get_fixture_info()  # fixture_info 설정
-        # logging.info(f"!!!!!!!!!!!!!!!!!!!!!! Object info: {self.object_info}")
+        self.fixture_info = self._get_fixture_info()
+        return True
+
+    def _get_robot_state_mask(self):
+        """
+        Returns:
+            2-tuple:
+                - (np.array) boolean mask over qpos, True for the joints of the robots
+                - (np.array) boolean mask over qvel, True for the joints of the robots
+        """
+        model = self.sim.model
+        body_rootid = np.asarray(model.body_rootid)
+        robot_roots = [
+            body_rootid[model.body_name2id(robot.robot_model.root_body)]
+            for robot in self.robots
+        ]
+        # qpos and qvel sizes of free, ball, slide and hinge joints
+        jnt_type = np.asarray(model.jnt_type)
+        qpos_sizes = np.array([7, 4, 1, 1])[jnt_type]
+        dof_sizes = np.array([6, 3, 1, 1])[jnt_type]
+
+        qpos_mask = np.zeros(model.nq, dtype=bool)
+        qvel_mask = np.zeros(model.nv, dtype=bool)
+        robot_joints = np.isin(body_rootid[np.asarray(model.jnt_bodyid)], robot_roots)
+        for j in np.nonzero(robot_joints)[0]:
+            qpos_adr = model.jnt_qposadr[j]
+            dof_adr = model.jnt_dofadr[j]
+            qpos_mask[qpos_adr : qpos_adr + qpos_sizes[j]] = True
+            qvel_mask[dof_adr : dof_adr + dof_sizes[j]] = True
+        return qpos_mask, qvel_mask
+
+    def get_scene_bank_entry(self):
+        """
+        Returns the current scene as a scene bank entry (see robocasa/utils/scene_bank.py): the episode meta data
+        extended with the fixture placements, object placements and robot base pose, and the flattened sim state.
+        Should be called right after a reset
+
+        Returns:
+            dict: scene bank entry with "ep_meta" and "state" keys
+        """
+
+        def serialize_placements(placements):
+            return {
+                name: [np.array(pos).tolist(), np.array(quat).tolist()]
+                for (name, (pos, quat, _)) in placements.items()
+            }
+
+        ep_meta = self.get_ep_meta()
+        ep_meta["fixture_placements"] = serialize_placements(self.fxtr_placements)
+        ep_meta["object_placements"] = serialize_placements(self.object_placements)
+        ep_meta["robot_base"] = [
+            np.array(self.robot_base_pose).tolist(),
+            np.array(self.robot_base_ori).tolist(),
+        ]
+        return dict(ep_meta=ep_meta, state=np.array(self.sim.get_state().flatten()))
+
+    def _resample_object_placements(self, max_tries=10):
+        """
+        Re-samples the object placements for the current scene, used for soft resets.
+        Keeps the previous placements if no valid placement is found.
+
+        Args:
+            max_tries (int): number of attempts to sample valid placements
+
+        Returns:
+            bool: True if new placements were sampled
+        """
+        for i in range(max_tries):
+            try:
+                self.object_placements = self.placement_initializer.sample(
+                    placed_objects=self.fxtr_placements
+                )
+            except RandomizationError:
+                if macros.VERBOSE:
+                    print("Randomization error in soft reset. Try #{}".format(i))
+                continue
+            return True
+        return False
+
+    def _randomize_fixture_states(self):
+        """
+        Randomizes the door, knob and faucet handle states of all fixtures that are not referenced by the task
+        (referenced fixtures are set by the task itself), used for soft resets.
+        """
+        ref_fixtures = [fxtr for fxtr in self.fixture_refs.values()]
+        for fxtr in self.fixtures.values():
+            if any([fxtr is ref for ref in ref_fixtures]):
+                continue
+            if isinstance(fxtr, Stove):
+                for (location, joint) in fxtr.knob_joints.items():
+                    if joint is None:
+                        continue
+                    fxtr.set_knob_state(
+                        env=self,
+                        rng=self.rng,
+                        knob=location,
+                        mode=self.rng.choice(["on", "off"]),
+                    )
+            elif isinstance(fxtr, Sink):
+                fxtr.set_handle_state(env=self, rng=self.rng, mode="random")
+            elif hasattr(fxtr, "set_door_state"):
+                fxtr.set_door_state(min=0.0, max=0.5, env=self, rng=self.rng)
+
+    def _apply_cam_configs_to_sim(self):
+        """
+        Writes the positions, orientations and fields of view in self._cam_configs to the cameras of the
+        compiled model
+        """
+        write_cameras_to_model(self.sim.model, self._cam_configs)
+
+    def _randomize_textures_in_sim(self):
+        """
+        Samples new generative textures and writes them into the texture buffers of the compiled model
+        """
+        if self._texture_randomizer is None:
+            self._texture_randomizer = TextureRandomizer()
+        textures = get_random_textures(self.rng)
+        self._texture_randomizer.apply(self.sim, textures)
+        self._curr_gen_fixtures = textures
 
     def _get_obj_cfgs(self):
         """
@@ -1114,6 +1752,8 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
             {k: v.name for (k, v) in self.fixture_refs.items()}
         )
         ep_meta["cam_configs"] = deepcopy(self._cam_configs)
+        if self._cam_noise is not None:
+            ep_meta["cam_noise"] = deepcopy(self._cam_noise)
 
         return ep_meta
 
@@ -1138,8 +1778,17 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
         """
 
         self._cam_configs = deepcopy(CamUtils.CAM_CONFIGS)
-        if self.randomize_cameras:
-            self._randomize_cameras()
+        self._cam_noise = None
+        self._cam_noise_enabled = True
+        if (
+            self._scene_bank_entry is not None
+            and "cam_configs" in self._ep_meta
+            and "cam_noise" not in self._ep_meta
+        ):
+            # scenes that only recorded the final camera configs are compiled with them as is
+            self._cam_configs = deepcopy(self._ep_meta["cam_configs"])
+            self._cam_noise_enabled = False
+        self._nominal_cam_configs = deepcopy(self._cam_configs)
 
         for (cam_name, cam_cfg) in self._cam_configs.items():
             if cam_cfg.get("parent_body", None) is not None:
@@ -1152,39 +1801,44 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
                 camera_attribs=cam_cfg.get("camera_attribs", None),
             )
 
-    def _randomize_cameras(self):
+        if self.randomize_cameras and self._cam_noise_enabled:
+            # the noise is sampled here to keep the order of random draws, but only applied after compilation
+            self._sample_camera_noise()
+
+    def _sample_camera_noise(self, from_ep_meta=True):
         """
-        Randomizes the position and rotation of the wrist and agentview cameras.
+        Samples noise for the position and rotation (and optionally the field of view) of the agentview cameras
+        and stores it in self._cam_noise. The noise is applied by _apply_camera_noise.
         Note: This function is called only if randomize_cameras is set to True.
-        """
-        for camera in self._cam_configs:
-            if "agentview" in camera:
-                pos_noise = self.rng.normal(loc=0, scale=0.05, size=(1, 3))[0]
-                euler_noise = self.rng.normal(loc=0, scale=3, size=(1, 3))[0]
-            elif "eye_in_hand" in camera:
-                pos_noise = np.zeros_like(pos_noise)
-                euler_noise = np.zeros_like(euler_noise)
-                # pos_noise = self.rng.normal(loc=0, scale=0.05, size=(1, 3))[0]
-                # euler_noise = self.rng.normal(loc=0, scale=3, size=(1, 3))[0]
-            else:
-                # skip randomization for cameras not implemented
-                continue
-
-            old_pos = self._cam_configs[camera]["pos"]
-            new_pos = [pos + n for pos, n in zip(old_pos, pos_noise)]
-            self._cam_configs[camera]["pos"] = list(new_pos)
 
-            old_euler = Rotation.from_quat(self._cam_configs[camera]["quat"]).as_euler(
-                "xyz", degrees=True
+        Args:
+            from_ep_meta (bool): if True and the episode meta data contains camera noise (e.g. when replaying
+                an episode), that noise is used instead of sampling new noise
+        """
+        if from_ep_meta and "cam_noise" in self._ep_meta:
+            self._cam_noise = deepcopy(self._ep_meta["cam_noise"])
+        else:
+            self._cam_noise = sample_camera_noise(
+                self.rng,
+                get_randomized_cameras(self._nominal_cam_configs),
+                fovy_scale=self.camera_fovy_noise,
             )
-            new_euler = [eul + n for eul, n in zip(old_euler, euler_noise)]
-            new_quat = Rotation.from_euler("xyz", new_euler, degrees=True).as_quat()
-            self._cam_configs[camera]["quat"] = list(new_quat)
+
+    def _apply_camera_noise(self):
+        """
+        Applies self._cam_noise to the nominal camera configs and writes the result to self._cam_configs and to
+        the cameras of the compiled model
+        """
+        self._cam_configs = apply_camera_noise(
+            self._nominal_cam_configs, self._cam_noise
+        )
+        self._apply_cam_configs_to_sim()
 
     def edit_model_xml(self, xml_str):
         """
         This function postprocesses the model.xml collected from a MuJoCo demonstration
-        for retrospective model changes.
+        for retrospective model changes. The xml is parsed once and all edit passes
+        (see _register_model_xml_passes) are applied to the same tree.
 
         Args:
             xml_str (str): Mujoco sim demonstration XML file as string
@@ -1192,26 +1846,44 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
         Returns:
             str: Post-processed xml file as string
         """
-        xml_str = super().edit_model_xml(xml_str)
+        pipeline = XMLEditPipeline()
+        self._register_model_xml_passes(pipeline)
+        return pipeline.run(xml_str)
 
-        tree = ET.fromstring(xml_str)
-        root = tree
-        worldbody = root.find("worldbody")
+    def _register_model_xml_passes(self, pipeline):
+        """
+        Registers the edit passes applied by edit_model_xml. Subclasses can extend this
+        to add their own passes.
+
+        Args:
+            pipeline (XMLEditPipeline): pipeline to register the passes with
+        """
+        pipeline.register(self._edit_model_xml_asset_paths)
+        pipeline.register(self._edit_model_xml_cameras)
+        if (self.generative_textures is not None) and (
+            self.generative_textures is not False
+        ):
+            pipeline.register(self._edit_model_xml_gen_textures)
+
+    def _edit_model_xml_asset_paths(self, root):
+        """
+        Replaces robosuite and robocasa asset paths with the paths of the local installations
+        """
         asset = root.find("asset")
         meshes = asset.findall("mesh")
         textures = asset.findall("texture")
         all_elements = meshes + textures
 
+        robosuite_path_split = os.path.split(robosuite.__file__)[0].split("/")
         robocasa_path_split = os.path.split(robocasa.__file__)[0].split("/")
 
-        # replace robocasa-specific asset paths
         for elem in all_elements:
             old_path = elem.get("file")
             if old_path is None:
                 continue
 
             old_path_split = old_path.split("/")
-            # maybe replace all paths to robosuite assets
+            # maybe replace all paths to robocasa assets
             if (
                 ("models/assets/fixtures" in old_path)
                 or ("models/assets/textures" in old_path)
@@ -1234,11 +1906,24 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
 
                 ind = max(check_lst)  # last occurrence index
                 new_path_split = robocasa_path_split + old_path_split[ind + 1 :]
+            # maybe replace all paths to robosuite assets
+            elif "robosuite" in old_path_split:
+                check_lst = [
+                    loc for loc, val in enumerate(old_path_split) if val == "robosuite"
+                ]
+                ind = max(check_lst)  # last occurrence index
+                new_path_split = robosuite_path_split + old_path_split[ind + 1 :]
+            else:
+                continue
 
-                new_path = "/".join(new_path_split)
-                elem.set("file", new_path)
+            new_path = "/".join(new_path_split)
+            elem.set("file", new_path)
 
-        # set cameras
+    def _edit_model_xml_cameras(self, root):
+        """
+        Sets the poses and attributes of the cameras in self._cam_configs, adding missing cameras
+        """
+        worldbody = root.find("worldbody")
         for cam_name, cam_config in self._cam_configs.items():
             parent_body = cam_config.get("parent_body", None)
 
@@ -1263,36 +1948,19 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
             for (k, v) in cam_config.get("camera_attribs", {}).items():
                 cam.set(k, v)
 
-        # result = ET.tostring(root, encoding="utf8").decode("utf8")
-        result = ET.tostring(root).decode("utf8")
-
-        # replace with generative textures
-        if (self.generative_textures is not None) and (
-            self.generative_textures is not False
-        ):
-            # sample textures
-            assert self.generative_textures == "100p"
+    def _edit_model_xml_gen_textures(self, root):
+        """
+        Replaces the cabinet, counter top, wall and floor textures with generative textures
+        """
+        # use textures sampled in _load_model if available
+        assert self.generative_textures == "100p"
+        if self._pending_gen_fixtures is not None:
+            self._curr_gen_fixtures = self._pending_gen_fixtures
+            self._pending_gen_fixtures = None
+        else:
             self._curr_gen_fixtures = get_random_textures(self.rng)
 
-            cab_tex = self._curr_gen_fixtures["cab_tex"]
-            counter_tex = self._curr_gen_fixtures["counter_tex"]
-            wall_tex = self._curr_gen_fixtures["wall_tex"]
-            floor_tex = self._curr_gen_fixtures["floor_tex"]
-
-            result = replace_cab_textures(
-                self.rng, result, new_cab_texture_file=cab_tex
-            )
-            result = replace_counter_top_texture(
-                self.rng, result, new_counter_top_texture_file=counter_tex
-            )
-            result = replace_wall_texture(
-                self.rng, result, new_wall_texture_file=wall_tex
-            )
-            result = replace_floor_texture(
-                self.rng, result, new_floor_texture_file=floor_tex
-            )
-
-        return result
+        apply_generative_textures(root, self._curr_gen_fixtures)
 
     def _setup_references(self):
         """
@@ -1306,6 +1974,74 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
         for (name, model) in self.objects.items():
             self.obj_body_id[name] = self.sim.model.body_name2id(model.root_body)
 
+        self._setup_fixture_state_updaters()
+        self._setup_contact_table()
+
+    def _setup_contact_table(self):
+        """
+        Indexes the contact geoms of all objects, fixtures, grippers and robots for check_contact
+        """
+        owners = list(self.objects.values())
+        owners.extend(
+            fxtr for fxtr in self.fixtures.values() if hasattr(fxtr, "contact_geoms")
+        )
+        for robot in self.robots:
+            grippers = robot.gripper
+            if isinstance(grippers, dict):
+                owners.extend(grippers.values())
+            else:
+                owners.append(grippers)
+            owners.append(robot.robot_model)
+        self._contact_table = ContactTable(self.sim, owners)
+
+    def check_contact(self, geoms_1, geoms_2=None):
+        """
+        Finds contact between two geom groups. Uses the contact table of the current step, which reads the
+        contact list of the sim once per step instead of once per query.
+
+        Args:
+            geoms_1 (str or list of str or MujocoModel): an individual geom name or list of geom names or a model.
+                If a MujocoModel is specified, the geoms checked will be its contact_geoms
+
+            geoms_2 (str or list of str or MujocoModel or None): another individual geom name or list of geom names.
+                If a MujocoModel is specified, the geoms checked will be its contact_geoms. If None, will check
+                any collision with @geoms_1 to any other geom in the environment
+
+        Returns:
+            bool: True if any geom in @geoms_1 is in contact with any geom in @geoms_2
+        """
+        if self._contact_table is None or self._contact_table.sim is not self.sim:
+            return super().check_contact(geoms_1, geoms_2)
+        return self._contact_table.check_contact(geoms_1, geoms_2)
+
+    def _setup_fixture_state_updaters(self):
+        """
+        Binds all fixtures to the current sim (see Fixture.bind) and groups them by class into batched
+        state updaters, which are run by update_state after every step
+        """
+        groups = {}
+        others = []
+        for fxtr in self.fixtures.values():
+            if not isinstance(fxtr, Fixture):
+                # walls, floors, windows and boxes
+                others.append(fxtr)
+                continue
+            fxtr.bind(self.sim)
+            groups.setdefault(type(fxtr).make_state_updater.__func__, []).append(fxtr)
+
+        self._fixture_state_updaters = []
+        for group in groups.values():
+            updater = type(group[0]).make_state_updater(group)
+            if updater is not None:
+                self._fixture_state_updaters.append(updater)
+        if len(others) > 0:
+
+            def update_others(env):
+                for fxtr in others:
+                    fxtr.update_state(env)
+
+            self._fixture_state_updaters.append(update_others)
+
     def _setup_observables(self):
         """
         Sets up observables to be used for this environment. Creates object-based observables if enabled
@@ -1337,10 +2073,20 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
         actives = [False]
 
         # add ground-truth poses (absolute and relative to eef) for all objects
-        for obj_name in self.obj_body_id:
-            obj_sensors, obj_sensor_names = self._create_obj_sensors(
-                obj_name=obj_name, modality=modality
-            )
+        if self.batched_obj_obs:
+            sensors.append(self._create_obj_states_sensor(modality=modality))
+            names.append("object_states")
+            # only used through the observation cache by the per-object views
+            actives.append(False)
+        for (obj_ind, obj_name) in enumerate(self.obj_body_id):
+            if self.batched_obj_obs:
+                obj_sensors, obj_sensor_names = self._create_obj_state_view_sensors(
+                    obj_ind=obj_ind, obj_name=obj_name, modality=modality
+                )
+            else:
+                obj_sensors, obj_sensor_names = self._create_obj_sensors(
+                    obj_name=obj_name, modality=modality
+                )
             sensors += obj_sensors
             names += obj_sensor_names
             actives += [True] * len(obj_sensors)
@@ -1427,37 +2173,174 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
         ]
         return sensors, names
 
+    def _create_obj_states_sensor(self, modality="object"):
+        """
+        Creates a sensor for the stacked states of all objects, in the order of obj_body_id. Each row holds the
+        position and (x,y,z,w) quaternion of the object and its position and quaternion relative to the eef. All
+        object bodies are read in one indexed read and the relative poses are computed with vectorized transforms
+
+        Args:
+            modality (str): Modality to assign to the sensor
+
+        Returns:
+            function: sensor returning an (n_obj, 14) array
+        """
+        body_ids_cache = [None, None]
+
+        def get_body_ids():
+            # obj_body_id is rebuilt whenever the references are set up
+            if body_ids_cache[0] is not self.obj_body_id:
+                body_ids_cache[0] = self.obj_body_id
+                body_ids_cache[1] = np.array(list(self.obj_body_id.values()), dtype=int)
+            return body_ids_cache[1]
+
+        @sensor(modality=modality)
+        def object_states(obs_cache):
+            body_ids = get_body_ids()
+            states = np.zeros((len(body_ids), 14))
+            pos = states[:, 0:3]
+            quat = states[:, 3:7]
+            pos[:] = self.sim.data.body_xpos[body_ids]
+            quat[:] = self.sim.data.body_xquat[body_ids][:, [1, 2, 3, 0]]
+            if "world_pose_in_gripper" in obs_cache:
+                world_pose_in_gripper = obs_cache["world_pose_in_gripper"]
+                rot = world_pose_in_gripper[:3, :3]
+                states[:, 7:10] = pos @ rot.T + world_pose_in_gripper[:3, 3]
+                rel_quat = quat_multiply_batch(T.mat2quat(rot), quat)
+                # same sign convention as T.mat2quat
+                rel_quat[rel_quat[:, 3] < 0] *= -1
+                states[:, 10:14] = rel_quat
+            return states
+
+        return object_states
+
+    def _create_obj_state_view_sensors(self, obj_ind, obj_name, modality="object"):
+        """
+        Same as _create_obj_sensors, but the sensors return views of the row of the object in the stacked
+        object_states observation (see _create_obj_states_sensor) instead of computing the poses themselves
+
+        Args:
+            obj_ind (int): row of the object in the object_states observation
+
+            obj_name (str): Name of object to create sensors for
+
+            modality (str): Modality to assign to all sensors
+
+        Returns:
+            2-tuple:
+                sensors (list): Array of sensors for the given obj
+                names (list): array of corresponding observable names
+        """
+        pf = self.robots[0].robot_model.naming_prefix
+
+        def make_sensor(start, end):
+            @sensor(modality=modality)
+            def obj_state(obs_cache):
+                if "object_states" not in obs_cache:
+                    return np.zeros(end - start)
+                return obs_cache["object_states"][obj_ind, start:end]
+
+            return obj_state
+
+        sensors = [make_sensor(0, 3), make_sensor(3, 7)]
+        sensors += [make_sensor(7, 10), make_sensor(10, 14)]
+        names = [
+            f"{obj_name}_pos",
+            f"{obj_name}_quat",
+            f"{obj_name}_to_{pf}eef_pos",
+            f"{obj_name}_to_{pf}eef_quat",
+        ]
+        return sensors, names
+
     # +++ custom start  ==============================
-    def get_segmentation_mapping(self):
+    def get_segmentation_table(self):
+        """
+        Returns:
+            SegmentationTable: lookup table from geom ids to segmentation labels, built once per model. Objects are
+                labeled with their category and fixtures with their class (see get_semantic_classes). Instance
+                ids follow the order of the objects and fixtures of the episode
         """
-        세그멘테이션 ID와 객체 이름 간의 매핑을 생성합니다.
-        """
-        mapping = {}
-        for i in range(self.sim.model.ngeom):
-            geom_id = i + 1  # MuJoCo에서 geom ID는 1부터 시작합니다
-            geom_name = self.sim.model.geom_id2name(i)
-            if geom_name:
-                mapping[geom_id] = geom_name
-        return mapping
-
-    def filter_segmentation(self, seg_map, seg_mapping):
-        # RGBA 이미지 생성 (알파 채널 포함)
-        height, width = seg_map.shape
-        rgba_seg_map = np.zeros((height, width, 4), dtype=np.uint8)
-
-        for id, name in seg_mapping.items():
-            mask = seg_map == int(id)
-            if not name.startswith(("base", "robot")) and id != -1:
-                # 유지하려는 객체에 대해 색상과 불투명도 설정
-                color = np.array(
-                    [id % 256, (id // 256) % 256, (id // 65536) % 256, 255],
-                    dtype=np.uint8,
+        if (
+            self._seg_table is None
+            or self._seg_table.model is not self.sim.model._model
+        ):
+            owners = []
+            for (name, obj) in self.objects.items():
+                cfg = next(
+                    (cfg for cfg in self.object_cfgs if cfg["name"] == name), None
+                )
+                info = cfg.get("info", {}) if cfg is not None else {}
+                cat = info.get("cat", None)
+                owners.append(
+                    (name, obj.root_body, cat if cat in OBJ_CATEGORIES else "object")
                 )
-                rgba_seg_map[mask] = color
+            for (name, fixture) in self.fixtures.items():
+                fixture_class = type(fixture).__name__
+                if fixture_class not in FIXTURE_CLASSES:
+                    fixture_class = "fixture"
+                owners.append((name, fixture.root_body, fixture_class))
+            robot_owners = []
+            for (i, robot) in enumerate(self.robots):
+                robot_name = "robot{}".format(i)
+                owners.append((robot_name, robot.robot_model.root_body, "robot"))
+                robot_owners.append(robot_name)
+            self._seg_table = SegmentationTable(
+                self.sim,
+                owners,
+                robot_owners=robot_owners,
+                classes=get_semantic_classes(),
+            )
+        return self._seg_table
+
+    def render_semantic_segmentation(self, camera_names=None, width=None, height=None):
+        """
+        Renders semantic class and instance segmentation maps. Class ids index get_semantic_classes() and are the
+        same for every scene, instance ids index the instance_names of get_segmentation_table() and are stable
+        within an episode
+
+        Args:
+            camera_names (list): cameras to render, defaults to the observation cameras (camera_names)
+
+            width (int): image width, defaults to the width of the first observation camera
+
+            height (int): image height, defaults to the height of the first observation camera
+
+        Returns:
+            2-tuple:
+
+                - (np.array) (n_cam, H, W) class id maps
+                - (np.array) (n_cam, H, W) instance id maps
+
+            Maps are bottom-up, as returned by render_multimodal
+        """
+        seg_table = self.get_segmentation_table()
+        rendered = self.render_multimodal(
+            camera_names, width=width, height=height, depth=False, segmentation=True
+        )
+        geom_ids = get_geom_ids(rendered.seg)
+        return seg_table.class_map(geom_ids), seg_table.instance_map(geom_ids)
+
+    def get_segmentation_mapping(self):
+        """
+        Returns:
+            dict: segmentation id (geom id) to geom name, for all named geoms
+        """
+        return self.get_segmentation_table().get_mapping()
 
-        return rgba_seg_map
+    def filter_segmentation(self, seg_map, seg_table=None):
+        """
+        Returns:
+            np.array: (H, W, 4) RGBA map of @seg_map with the geom ids encoded in the colors, robot and unnamed
+                geoms transparent
+        """
+        if seg_table is None:
+            seg_table = self.get_segmentation_table()
+        return seg_table.filter(seg_map)
 
     def add_labels_to_segmentation(self, seg_map, visible_mapping):
+        import cv2
+        from PIL import Image, ImageDraw, ImageFont
+
         # Convert seg_map to RGB image
         seg_rgb = cv2.cvtColor(seg_map.astype(np.uint8), cv2.COLOR_GRAY2RGB)
 
@@ -1468,12 +2351,11 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
         # Use a default font if you don't want to specify a font file
         font = ImageFont.load_default()
 
+        # center position of every visible id, from a single pass over the map
+        centroids = segment_centroids(seg_map, visible_mapping.keys())
         for id, name in visible_mapping.items():
-            # Find positions of this ID in the segmentation map
-            positions = np.where(seg_map == int(id))
-            if len(positions[0]) > 0:
-                # Get the center position of this object
-                y, x = int(np.mean(positions[0])), int(np.mean(positions[1]))
+            if id in centroids:
+                y, x = centroids[id]
 
                 # Draw the ID and truncated name
                 text = f"{id}: {name[:10]}..."  # Truncate name to first 10 chars
@@ -1481,7 +2363,10 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
 
         return np.array(pil_image)
 
-    def align_segmentation_with_rgb(self, rgb_image, seg_map, seg_mapping):
+    def align_segmentation_with_rgb(self, rgb_image, seg_map, seg_table=None):
+        if seg_table is None:
+            seg_table = self.get_segmentation_table()
+
         # RGB 이미지에서 완전히 투명한 픽셀(알파값이 0인 픽셀) 마스크 생성
         if rgb_image.shape[2] == 4:  # RGBA 이미지인 경우
             mask = rgb_image[:, :, 3] > 0
@@ -1492,206 +2377,206 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
         filtered_seg_map = seg_map.copy()
         filtered_seg_map[~mask] = 0  # 마스크에 해당하지 않는 부분은 0(배경)으로 설정
 
-        # 시각화를 위한 RGB 맵 생성
-        visual_seg_map = np.zeros(
-            (seg_map.shape[0], seg_map.shape[1], 3), dtype=np.uint8
-        )
-
-        for id in np.unique(filtered_seg_map):
-            if id != 0:  # 배경이 아닌 경우
-                # 시각화 맵에 컬러 할당 (예: ID를 RGB 값으로 변환)
-                color = np.array(
-                    [id % 256, (id // 256) % 256, (id // 65536) % 256], dtype=np.uint8
-                )
-                visual_seg_map[filtered_seg_map == id] = color
+        # 시각화를 위한 RGB 맵 생성 (ID를 RGB 값으로 변환, 배경은 검정)
+        visual_seg_map = seg_table.id_color[seg_table.index(filtered_seg_map)]
+        visual_seg_map[filtered_seg_map == 0] = 0
 
         # 보이는 객체들의 매핑 생성
-        visible_mapping = {
-            int(id): seg_mapping.get(int(id), "Unknown")
-            for id in np.unique(filtered_seg_map)
-            if id != 0
-            and not seg_mapping.get(int(id), "").startswith(("base", "robot"))
-            and id != -1
-        }
+        visible_mapping = seg_table.visible_mapping(
+            filtered_seg_map, include_unnamed=True
+        )
 
         return filtered_seg_map, visual_seg_map, visible_mapping
 
     def set_save_image_flag(self):
         self.save_image_flag = True
 
-    def save_images_and_pose(self):
-        if self.save_image_flag:
-            timestamp = time.strftime("%Y%m%d_%H%M%S")
-
-            # env setup
-            env = self
-            # obs_dict = env.reset()
-
-            camera_name = env.camera_names[0]
-            camera_height = env.camera_heights[0]
-            camera_width = env.camera_widths[0]
-            logging.info(
-                f"camera_name: {camera_name}, camera_height: {camera_height}, camera_width: {camera_width}"
-            )
-            # image = obs_dict["{}_image".format(camera_name)][::-1]
-
-            # RGB
-
-            image = self.sim.render(
-                camera_name="robot0_eye_in_hand",
-                width=camera_width,
-                height=camera_height,
-            )[::-1]
-            rgb_file = os.path.join(self.rgb_path, f"rgb_image_{timestamp}.png")
-            depth_file = os.path.join(self.depth_path, f"depth_map_{timestamp}.png")
-
-            plt.imsave(rgb_file, image)
-
-            # save Depth
-            depth_map = None
-
-            try:
-                depth_map_check = self.sim.render(
-                    camera_name="robot0_eye_in_hand",
-                    width=camera_width,
-                    height=camera_height,
-                    depth=True,
-                )
-                depth_map = depth_map_check[1]
-
-                depth_map = depth_map[::-1]
-
-                plt.imsave(depth_file, depth_map)
-
-            except Exception as e:
-                logging.error(f"Error saving depth map: {e}")
-
-            try:
-                seg_map = self.sim.render(
-                    camera_name="robot0_eye_in_hand",
-                    width=camera_width,
-                    height=camera_height,
-                    depth=False,
-                    segmentation=True,
-                )[::-1]
-                seg_map = seg_map[:, :, 1]  # 세그멘테이션 정보는 두 번째 채널에 있음
-
-                # 전체 매핑 가져오기
-                seg_mapping = self.get_segmentation_mapping()
-
-                # 세그멘테이션 맵 필터링
-                filtered_seg_map = self.filter_segmentation(seg_map, seg_mapping)
-
-                # 필터링된 세그멘테이션 맵 저장 (PNG 형식으로 저장하여 투명도 유지)
-                seg_file = os.path.join(
-                    self.seg_path, f"filtered_seg_map_{timestamp}.png"
-                )
-                Image.fromarray(filtered_seg_map, mode="RGBA").save(seg_file)
+    def render_multimodal(
+        self, camera_names=None, width=None, height=None, depth=True, segmentation=True
+    ):
+        """
+        Renders RGB and optionally depth and segmentation images for multiple cameras. Each camera is rendered
+        with a single scene update, reusing the offscreen render context of the sim and preallocated buffers
 
-                # 보이는 객체들의 고유한 ID 추출 (필터링 후, 투명한 부분 제외)
-                unique_ids = np.unique(filtered_seg_map[:, :, 3].nonzero()[0])
+        Args:
+            camera_names (list): cameras to render, defaults to the observation cameras (camera_names)
 
-                # 현재 보이는 객체들의 매핑만 추출
-                visible_mapping = {
-                    int(id): seg_mapping.get(int(id), "Unknown")
-                    for id in unique_ids
-                    if not seg_mapping.get(int(id), "").startswith(("base", "robot"))
-                    and id != -1
-                }
+            width (int): image width, defaults to the width of the first observation camera
 
-                # 라벨이 추가된 세그멘테이션 이미지 생성 (필요한 경우)
-                # labeled_seg_map = self.add_labels_to_segmentation(filtered_seg_map, visible_mapping)
+            height (int): image height, defaults to the height of the first observation camera
 
-                # # 라벨이 추가된 세그멘테이션 이미지 저장
-                # labeled_seg_file = os.path.join(self.seg_label_path, f"labeled_seg_map_{timestamp}.png")
-                # cv2.imwrite(labeled_seg_file, cv2.cvtColor(labeled_seg_map, cv2.COLOR_RGB2BGR))
+            depth (bool): whether to render depth
 
-            except Exception as e:
-                logging.error(f"세그멘테이션 맵 저장 중 오류 발생: {e}")
-                visible_mapping = {}
+            segmentation (bool): whether to render (object type, object id) segmentation
 
-            ### Convert camera pose to world coordinates
+        Returns:
+            RenderOutput: bottom-up images stacked over the cameras. The buffers are reused by the next call
+        """
+        if camera_names is None:
+            camera_names = self.camera_names
+        if width is None:
+            width = self.camera_widths[0]
+        if height is None:
+            height = self.camera_heights[0]
+        if self._multi_renderer is None or self._multi_renderer.sim is not self.sim:
+            self._multi_renderer = MultiModalityRenderer(self.sim)
+        return self._multi_renderer.render(
+            camera_names, width, height, depth=depth, segmentation=segmentation
+        )
 
-            # Get the position and orientation of the end effector (right_hand)
-            ee_body_id = self.sim.model.body_name2id("robot0_right_hand")
-            ee_pos = self.sim.data.body_xpos[ee_body_id]
-            ee_rot = R.from_matrix(self.sim.data.body_xmat[ee_body_id].reshape(3, 3))
+    def _get_capture_writer(self):
+        """
+        Returns:
+            AsyncFrameWriter: background writer for captured frames, created on first use. None if no capture
+                directory is set
+        """
+        if self._capture_writer is None and self.capture_dir is not None:
+            self._capture_writer = AsyncFrameWriter(
+                DirectorySink(self.capture_dir),
+                num_workers=self.capture_workers,
+                buffer_size=self.capture_buffer_size,
+                block=self.capture_block,
+            )
+        return self._capture_writer
 
-            # Local pose of the camera
-            camera_local_pos = np.array([0.05, 0, 0])
-            camera_local_rot = R.from_quat([0, 0.707107, 0.707107, 0])
+    @property
+    def capture_stats(self):
+        """
+        Returns:
+            dict: number of submitted, written, dropped and failed captured frames
+        """
+        if self._capture_writer is None:
+            return dict(submitted=0, written=0, dropped=0, failed=0)
+        return dict(self._capture_writer.stats)
 
-            # Calculate the camera position in world coordinates
-            camera_world_pos = ee_pos + ee_rot.apply(camera_local_pos)
+    def save_images_and_pose(self):
+        """
+        If requested through set_save_image_flag, captures an RGB image, depth map and segmentation map from the
+        capture camera along with the camera pose and scene info. The frame is copied into the buffer of the
+        background writer, which filters the segmentation, encodes the images and writes them to the capture
+        directory off the control loop
+        """
+        if not self.save_image_flag:
+            return
+        self.save_image_flag = False  # Reset the flag
 
-            # Calculate the camera orientation in world coordinates
-            camera_world_rot = ee_rot * camera_local_rot
-            camera_world_quat = camera_world_rot.as_quat()
+        writer = self._get_capture_writer()
+        if writer is None:
+            logging.warning("No capture directory set, frame is not saved")
+            return
 
-            # # 전체 !!! 세그멘테이션 매핑 정보 가져오기
-            # seg_mapping = self.get_segmentation_mapping()
+        timestamp = "{}_{:06d}".format(
+            time.strftime("%Y%m%d_%H%M%S"), self._capture_count
+        )
+        self._capture_count += 1
+
+        camera_name = self.capture_camera
+        camera_height = self.camera_heights[0]
+        camera_width = self.camera_widths[0]
+
+        rendered = self.render_multimodal(
+            [camera_name], width=camera_width, height=camera_height
+        )[camera_name]
+        images = dict(
+            rgb=rendered["rgb"][::-1],
+            depth=rendered["depth"][::-1],
+            seg=get_geom_ids(rendered["seg"][::-1]),
+        )
+        meta = self._get_capture_meta(camera_name, camera_height, camera_width)
 
-            # save camera pose (realworld)
+        seg_table = self.get_segmentation_table()
 
-            # get intrinsics
-            camera_intrinsics = CU.get_camera_intrinsic_matrix(
-                sim=env.sim,
-                camera_name=camera_name,
-                camera_height=camera_height,
-                camera_width=camera_width,
+        def process(images, meta):
+            images, visible_mapping = self._process_captured_segmentation(
+                images, seg_table
             )
+            meta["visible_segmentation_mapping"] = visible_mapping
+            return images, meta
 
-            # get extrinsics
-            camera_extrinsics = CU.get_camera_extrinsic_matrix(
-                sim=env.sim,
-                camera_name=camera_name,
-            )
+        if writer.submit(timestamp, images, meta, process_fn=process):
+            logging.info(f"Queued RGB image, depth map and camera pose for {timestamp}")
+        else:
+            logging.warning(f"Capture buffer full, dropped frame {timestamp}")
 
-            # get camera matrices
-            world_to_camera = CU.get_camera_transform_matrix(
-                sim=env.sim,
-                camera_name=camera_name,
-                camera_height=camera_height,
-                camera_width=camera_width,
-            )
+    def _get_capture_meta(self, camera_name, camera_height, camera_width):
+        """
+        Returns:
+            dict: pose and intrinsics of camera @camera_name and a snapshot of the object and fixture info
+        """
+        # Get the position and orientation of the end effector (right_hand)
+        ee_body_id = self.sim.model.body_name2id("robot0_right_hand")
+        ee_pos = self.sim.data.body_xpos[ee_body_id]
+        ee_rot = R.from_matrix(self.sim.data.body_xmat[ee_body_id].reshape(3, 3))
+
+        # Local pose of the camera
+        camera_local_pos = np.array([0.05, 0, 0])
+        camera_local_rot = R.from_quat([0, 0.707107, 0.707107, 0])
+
+        # camera pose in world coordinates
+        camera_world_pos = ee_pos + ee_rot.apply(camera_local_pos)
+        camera_world_quat = (ee_rot * camera_local_rot).as_quat()
+
+        camera_intrinsics = CU.get_camera_intrinsic_matrix(
+            sim=self.sim,
+            camera_name=camera_name,
+            camera_height=camera_height,
+            camera_width=camera_width,
+        )
+        camera_extrinsics = CU.get_camera_extrinsic_matrix(
+            sim=self.sim,
+            camera_name=camera_name,
+        )
+        world_to_camera = CU.get_camera_transform_matrix(
+            sim=self.sim,
+            camera_name=camera_name,
+            camera_height=camera_height,
+            camera_width=camera_width,
+        )
+        camera_to_world = np.linalg.inv(world_to_camera)
+
+        # object_info holds views of the sim data, copy them before the sim moves on
+        return {
+            "camera_name": camera_name,
+            "cam_height": camera_height,
+            "cam_width": camera_width,
+            "before: cam_pos": camera_world_pos,
+            "before: cam_quat": camera_world_quat,
+            "Position & Rotation (world)": camera_to_world,
+            "camera_intrinsics": camera_intrinsics,
+            "camera_extrinsics": camera_extrinsics,
+            "object_info": deepcopy(self.object_info),
+            "fixture_info": deepcopy(self.fixture_info),
+        }
 
-            # get camera pose in world coordinates
-            camera_to_world = np.linalg.inv(world_to_camera)
+    def _process_captured_segmentation(self, images, seg_table):
+        """
+        Replaces the raw segmentation map of a captured frame with the filtered RGBA segmentation map. Runs in the
+        capture writer threads
 
-            ##  rgb-d  using json
-            import json
-            from collections import Counter
+        Args:
+            images (dict): captured images
 
-            pose_file = os.path.join(self.base_path, f"camera_pose_{timestamp}.json")
-            if (
-                (depth_map is not None)
-                and (camera_intrinsics is not None)
-                and (camera_extrinsics is not None)
-            ):
-                data = {
-                    "camera_name": camera_name,
-                    "cam_height": camera_height,
-                    "cam_width": camera_width,
-                    "before: cam_pos": str(camera_world_pos),
-                    "before: cam_quat": str(camera_world_quat),
-                    "Position & Rotation (world)": str(camera_to_world),
-                    "camera_intrinsics": str(camera_intrinsics),
-                    "camera_extrinsics": str(camera_extrinsics),
-                    "object_info": str(self.object_info),  # self.object_info 추가
-                    "fixture_info": str(self.fixture_info),  # fixture_info 추가
-                    "visible_segmentation_mapping": str(
-                        visible_mapping
-                    ),  # 세그멘테이션 매핑 정보 추가
-                }
+            seg_table (SegmentationTable): segmentation table of the model the frame was captured from
 
-                with open(pose_file, "w") as f:
-                    json.dump(data, f, indent=4)
+        Returns:
+            2-tuple: images and mapping of the visible segmentation ids to geom names
+        """
+        seg_map = images.get("seg", None)
+        if seg_map is None:
+            return images, {}
 
-            print(
-                f"Saved RGB image, depth map, and camera pose (world coordinates) for timestamp: {timestamp}"
-            )
-            # breakpoint()
-            self.save_image_flag = False  # Reset the flag
+        images = dict(images, seg=seg_table.filter(seg_map))
+        # 현재 보이는 객체들의 매핑만 추출 (필터링 후 남는 객체)
+        return images, seg_table.visible_mapping(seg_map)
+
+    def close(self):
+        """
+        Writes all captured frames that are still queued before closing the environment
+        """
+        if self._capture_writer is not None:
+            self._capture_writer.close()
+            self._capture_writer = None
+        super().close()
 
     def log_positions(self):
         for camera in self._cam_configs:
@@ -2006,8 +2891,10 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
         """
         super().update_state()
 
-        for fixtr in self.fixtures.values():
-            fixtr.update_state(self)
+        if self._fixture_state_updaters is None:
+            self._setup_fixture_state_updaters()
+        for updater in self._fixture_state_updaters:
+            updater(self)
 
     def visualize(self, vis_settings):
         """
@@ -2134,6 +3021,22 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
             object_scale=object_scale,
         )
 
+    def _get_fixture_index(self):
+        """
+        Returns the query index of the fixtures of the current scene, building it if necessary
+
+        Returns:
+            FixtureIndex: fixture index
+        """
+        index = self._fixture_index
+        if (
+            index is None
+            or index.source is not self.fixtures
+            or len(index) != len(self.fixtures)
+        ):
+            self._fixture_index = FixtureIndex(self.fixtures)
+        return self._fixture_index
+
     def _is_fxtr_valid(self, fxtr, size):
         """
         checks if counter is valid for object placement by making sure it is large enough
@@ -2145,10 +3048,14 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
         Returns:
             bool: True if fixture is valid, False otherwise
         """
-        for region in fxtr.get_reset_regions(self).values():
-            if region["size"][0] >= size[0] and region["size"][1] >= size[1]:
-                return True
-        return False
+        index = self._get_fixture_index()
+        ind = index.index_of(fxtr)
+        if ind is None:
+            for region in fxtr.get_reset_regions(self).values():
+                if region["size"][0] >= size[0] and region["size"][1] >= size[1]:
+                    return True
+            return False
+        return index.has_valid_region(self, ind, size)
 
     def get_fixture(self, id, ref=None, size=(0.2, 0.2)):
         """
@@ -2171,53 +3078,53 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
         elif id in self.fixtures.keys():
             return self.fixtures[id]
 
+        index = self._get_fixture_index()
         if ref is None:
             # find all fixtures with names containing given name
             if isinstance(id, FixtureType) or isinstance(id, int):
-                matches = [
-                    name
-                    for (name, fxtr) in self.fixtures.items()
-                    if fixture_is_type(fxtr, id)
-                ]
+                inds = index.get_type_inds(id)
             else:
-                matches = [name for name in self.fixtures.keys() if id in name]
+                inds = index.get_name_inds(id)
             if id == FixtureType.COUNTER or id == FixtureType.COUNTER_NON_CORNER:
-                matches = [
-                    name
-                    for name in matches
-                    if self._is_fxtr_valid(self.fixtures[name], size)
-                ]
+                inds = [i for i in inds if index.has_valid_region(self, i, size)]
+            matches = [index.names[i] for i in inds]
             assert len(matches) > 0
             # sample random key
             key = self.rng.choice(matches)
             return self.fixtures[key]
         else:
             ref_fixture = self.get_fixture(ref)
+            ref_ind = index.index_of(ref_fixture)
 
             assert isinstance(id, FixtureType)
-            cand_fixtures = []
-            for fxtr in self.fixtures.values():
-                if not fixture_is_type(fxtr, id):
-                    continue
-                if fxtr is ref_fixture:
-                    continue
-                if id == FixtureType.COUNTER:
-                    fxtr_is_valid = self._is_fxtr_valid(fxtr, size)
-                    if not fxtr_is_valid:
-                        continue
-                cand_fixtures.append(fxtr)
+            cand_inds = [i for i in index.get_type_inds(id) if i != ref_ind]
+            if id == FixtureType.COUNTER:
+                cand_inds = [
+                    i for i in cand_inds if index.has_valid_region(self, i, size)
+                ]
+            cand_inds = np.array(cand_inds, dtype=int)
 
             # first, try to find fixture "containing" the reference fixture
-            for fxtr in cand_fixtures:
-                if OU.point_in_fixture(ref_fixture.pos, fxtr, only_2d=True):
-                    return fxtr
+            contains = index.contains_point(
+                ref_fixture.pos, inds=cand_inds, only_2d=True
+            )
+            if np.any(contains):
+                return index.fixtures[cand_inds[np.argmax(contains)]]
             # if no fixture contains reference fixture, sample all close fixtures
-            dists = [
-                OU.fixture_pairwise_dist(ref_fixture, fxtr) for fxtr in cand_fixtures
-            ]
+            if ref_ind is not None:
+                dists = index.pairwise_dists[ref_ind, cand_inds]
+            else:
+                dists = np.array(
+                    [
+                        OU.fixture_pairwise_dist(ref_fixture, index.fixtures[i])
+                        for i in cand_inds
+                    ]
+                )
             min_dist = np.min(dists)
             close_fixtures = [
-                fxtr for (fxtr, d) in zip(cand_fixtures, dists) if d - min_dist < 0.10
+                index.fixtures[i]
+                for (i, d) in zip(cand_inds, dists)
+                if d - min_dist < 0.10
             ]
             return self.rng.choice(close_fixtures)
 
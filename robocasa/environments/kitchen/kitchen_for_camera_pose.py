@@ -50,11 +50,8 @@ from robocasa.utils.placement_samplers import (
     UniformRandomSampler,
 )
 from robocasa.utils.texture_swap import (
+    apply_generative_textures,
     get_random_textures,
-    replace_cab_textures,
-    replace_counter_top_texture,
-    replace_floor_texture,
-    replace_wall_texture,
 )
 
 
@@ -1126,9 +1123,6 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
             for (k, v) in cam_config.get("camera_attribs", {}).items():
                 cam.set(k, v)
 
-        # result = ET.tostring(root, encoding="utf8").decode("utf8")
-        result = ET.tostring(root).decode("utf8")
-
         # replace with generative textures
         if (self.generative_textures is not None) and (
             self.generative_textures is not False
@@ -1136,24 +1130,10 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
             # sample textures
             assert self.generative_textures == "100p"
             self._curr_gen_fixtures = get_random_textures(self.rng)
+            apply_generative_textures(root, self._curr_gen_fixtures)
 
-            cab_tex = self._curr_gen_fixtures["cab_tex"]
-            counter_tex = self._curr_gen_fixtures["counter_tex"]
-            wall_tex = self._curr_gen_fixtures["wall_tex"]
-            floor_tex = self._curr_gen_fixtures["floor_tex"]
-
-            result = replace_cab_textures(
-                self.rng, result, new_cab_texture_file=cab_tex
-            )
-            result = replace_counter_top_texture(
-                self.rng, result, new_counter_top_texture_file=counter_tex
-            )
-            result = replace_wall_texture(
-                self.rng, result, new_wall_texture_file=wall_tex
-            )
-            result = replace_floor_texture(
-                self.rng, result, new_floor_texture_file=floor_tex
-            )
+        # result = ET.tostring(root, encoding="utf8").decode("utf8")
+        result = ET.tostring(root).decode("utf8")
 
         return result
 
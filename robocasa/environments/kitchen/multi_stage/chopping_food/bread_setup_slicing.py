@@ -72,11 +72,9 @@ class BreadSetupSlicing(Kitchen):
         return cfgs
 
     def _check_success(self):
-        bread_on_board = all(
-            [
-                OU.check_obj_in_receptacle(self, f"obj_{i}", "receptacle")
-                for i in range(self.num_bread)
-            ]
-        )
+        bread_names = [f"obj_{i}" for i in range(self.num_bread)]
+        bread_on_board = OU.check_objs_in_receptacles(
+            self, bread_names, "receptacle"
+        ).all()
 
         return bread_on_board and OU.gripper_obj_far(self, "obj_0")
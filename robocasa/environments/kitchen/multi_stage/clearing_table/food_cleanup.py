@@ -70,9 +70,8 @@ class FoodCleanup(Kitchen):
         return cfgs
 
     def _check_success(self):
-        food_inside_cab = all(
-            [OU.obj_inside_of(self, f"food{i}", self.cab) for i in range(self.num_food)]
-        )
+        food_names = [f"food{i}" for i in range(self.num_food)]
+        food_inside_cab = OU.objs_inside_of(self, food_names, self.cab).all()
         cab_closed = True
         door_state = self.cab.get_door_state(env=self)
 
@@ -199,10 +199,9 @@ class StockingBreakfastFoods(Kitchen):
         return cfgs
 
     def _check_success(self):
-        obj1_inside_cab1 = OU.obj_inside_of(self, "obj1", self.cab1)
-        obj2_inside_cab2 = OU.obj_inside_of(self, "obj2", self.cab2)
-        gripper_objs_far = OU.gripper_obj_far(self, "obj1") and OU.gripper_obj_far(
-            self, "obj2"
-        )
+        objs_inside_cabs = OU.objs_inside_of(
+            self, ["obj1", "obj2"], [self.cab1, self.cab2]
+        ).all()
+        gripper_objs_far = OU.gripper_objs_far(self, ["obj1", "obj2"]).all()
 
-        return obj1_inside_cab1 and obj2_inside_cab2 and gripper_objs_far
+        return objs_inside_cabs and gripper_objs_far
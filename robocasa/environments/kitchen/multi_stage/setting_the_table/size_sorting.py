@@ -63,10 +63,9 @@ class SizeSorting(Kitchen):
 
     def _check_success(self):
 
-        objs_stacked_inorder = all(
-            [
-                OU.check_obj_in_receptacle(self, f"obj_{i}", f"obj_{i-1}")
-                for i in range(1, self.objs)
-            ]
-        )
+        objs_stacked_inorder = OU.check_objs_in_receptacles(
+            self,
+            [f"obj_{i}" for i in range(1, self.objs)],
+            [f"obj_{i-1}" for i in range(1, self.objs)],
+        ).all()
         return objs_stacked_inorder and OU.gripper_obj_far(self, "obj_0")
@@ -81,9 +81,7 @@ class YogurtDelightPrep(Kitchen):
             self, "yogurt", self.counter
         )
 
-        objs_far = all(
-            [OU.gripper_obj_far(self, f"fruit_{i}") for i in range(self.num_fruits)]
-        )
-        objs_far = objs_far and OU.gripper_obj_far(self, "yogurt")
+        obj_names = [f"fruit_{i}" for i in range(self.num_fruits)] + ["yogurt"]
+        objs_far = OU.gripper_objs_far(self, obj_names).all()
 
         return items_on_counter and objs_far
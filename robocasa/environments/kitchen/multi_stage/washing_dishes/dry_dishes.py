@@ -93,7 +93,5 @@ class DryDishes(Kitchen):
         objs_on_counter = self.check_contact(
             self.objects["obj1"], self.counter
         ) and self.check_contact(self.objects["obj2"], self.counter)
-        gripper_objs_far = OU.gripper_obj_far(self, "obj1") and OU.gripper_obj_far(
-            self, "obj2"
-        )
+        gripper_objs_far = OU.gripper_objs_far(self, ["obj1", "obj2"]).all()
         return objs_on_counter and gripper_objs_far
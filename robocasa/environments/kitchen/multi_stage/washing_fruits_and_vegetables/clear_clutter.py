@@ -104,18 +104,12 @@ class ClearClutter(Kitchen):
         return cfgs
 
     def _check_success(self):
-        food_in_sink = all(
-            [
-                OU.obj_inside_of(self, f"obj_{i}", self.sink)
-                for i in range(self.num_food)
-            ]
-        )
-        unwashables_not_in_sink = all(
-            [
-                not OU.obj_inside_of(self, f"unwashable_obj_{i}", self.sink)
-                for i in range(self.num_unwashable)
-            ]
-        )
+        food_names = [f"obj_{i}" for i in range(self.num_food)]
+        unwashable_names = [f"unwashable_obj_{i}" for i in range(self.num_unwashable)]
+        food_in_sink = OU.objs_inside_of(self, food_names, self.sink).all()
+        unwashables_not_in_sink = not OU.objs_inside_of(
+            self, unwashable_names, self.sink
+        ).any()
         water_on = self.sink.get_handle_state(env=self)["water_on"]
         # make sure the food has been washed for suffient time (10 steps)
         if food_in_sink and unwashables_not_in_sink and water_on:
@@ -124,20 +118,12 @@ class ClearClutter(Kitchen):
         else:
             self.washed_time = 0
 
-        food_in_tray = all(
-            [
-                OU.check_obj_in_receptacle(self, f"obj_{i}", "receptacle")
-                for i in range(self.num_food)
-            ]
-        )
-        unwashables_not_in_tray = all(
-            [
-                not OU.check_obj_in_receptacle(
-                    self, f"unwashable_obj_{i}", "receptacle"
-                )
-                for i in range(self.num_unwashable)
-            ]
-        )
+        food_in_tray = OU.check_objs_in_receptacles(
+            self, food_names, "receptacle"
+        ).all()
+        unwashables_not_in_tray = not OU.check_objs_in_receptacles(
+            self, unwashable_names, "receptacle"
+        ).any()
 
         return (
             self.food_washed
@@ -38,12 +38,25 @@ class NavigateKitchen(Kitchen):
                 "Fridge",
                 "Dishwasher",
             ]
+            # the navigation map checks are dropped after too many rejected fixtures
+            nav_rejects = 0
             # keep choosing src fixture until it is a valid fixture
             while True:
                 self.src_fixture = self.rng.choice(fixtures)
                 fxtr_class = type(self.src_fixture).__name__
                 if fxtr_class not in valid_src_fixture_classes:
                     continue
+                # don't start where the robot base does not fit
+                if (
+                    nav_rejects < 100
+                    and self.nav_map is not None
+                    and self.nav_map.has_fixture(
+                        self.src_fixture.name, pos=self.src_fixture.pos
+                    )
+                    and not self.nav_map.base_pose_feasible(self.src_fixture.name)
+                ):
+                    nav_rejects += 1
+                    continue
                 break
 
             fxtr_classes = [type(fxtr).__name__ for fxtr in fixtures]
@@ -83,6 +96,12 @@ class NavigateKitchen(Kitchen):
                     <= 1.0
                 ):
                     continue
+                # don't sample fixtures the robot can not drive between
+                if nav_rejects < 100 and not self._can_navigate(
+                    self.src_fixture, self.target_fixture
+                ):
+                    nav_rejects += 1
+                    continue
                 break
 
             self.fixture_refs["src_fixture"] = self.src_fixture
@@ -94,6 +113,43 @@ class NavigateKitchen(Kitchen):
 
         self.init_robot_base_pos = self.src_fixture
 
+    def _can_navigate(self, src_fixture, target_fixture):
+        """
+        Checks with the navigation map (if loaded) whether the robot can drive from the base pose of
+        @src_fixture to the base pose of @target_fixture. Fixtures that are not part of the map are assumed
+        to be reachable.
+
+        Returns:
+            bool: True if the robot can drive between the two fixtures
+        """
+        if self.nav_map is None:
+            return True
+        if not (
+            self.nav_map.has_fixture(src_fixture.name, pos=src_fixture.pos)
+            and self.nav_map.has_fixture(target_fixture.name, pos=target_fixture.pos)
+        ):
+            return True
+        return self.nav_map.can_navigate(src_fixture.name, target_fixture.name)
+
+    def _check_nav_map(self, nav_map):
+        """
+        The navigate task needs two fixtures more than 1m apart whose base poses are connected
+
+        Args:
+            nav_map (NavigationMap): navigation map of a layout and style
+
+        Returns:
+            bool: True if the task is feasible in this layout and style
+        """
+        components = nav_map.base_components
+        dists = np.linalg.norm(
+            nav_map.fixture_pos[:, None, :2] - nav_map.fixture_pos[None, :, :2], axis=-1
+        )
+        connected = (components[:, None] > 0) & (
+            components[:, None] == components[None]
+        )
+        return bool(np.any(connected & (dists > 1.0)))
+
     def get_ep_meta(self):
         """
         Get the episode metadata for the navigate kitchen tasks.
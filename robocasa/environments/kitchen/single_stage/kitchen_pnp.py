@@ -1,9 +1,6 @@
 from robocasa.environments.kitchen.kitchen import *
 
-from loguru import logger
-
-# 로거 설정
-logger.add("debug.log", rotation="500 MB")
+logger = logging.getLogger(__name__)
 
 
 class PnP(Kitchen):
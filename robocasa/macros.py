@@ -12,12 +12,19 @@ SHOW_SITES = False
 # whether to print debugging information
 VERBOSE = False
 
+# number of times object placement may backtrack (undo and re-sample individual placements) before the whole
+# scene is rebuilt
+PLACEMENT_MAX_BACKTRACKS = 20
+
 # Spacemouse settings. Used by SpaceMouse class in robosuite/devices/spacemouse.py
 SPACEMOUSE_VENDOR_ID = 9583
 SPACEMOUSE_PRODUCT_ID = 50741
 
 DATASET_BASE_PATH = None
 
+# default directory for rgb-d / segmentation frames captured by kitchen environments (see Kitchen.save_images_and_pose)
+CAPTURE_DIR = None
+
 try:
     from robocasa.macros_private import *
 except ImportError:
@@ -17,3 +17,4 @@ from robocasa.models.fixtures.fixture_stack import FixtureStack
 from robocasa.models.fixtures.windows import Window, FramedWindow
 
 from robocasa.models.fixtures.fixture_utils import fixture_is_type
+from robocasa.models.fixtures.fixture_index import FixtureIndex
@@ -50,6 +50,7 @@ class CoffeeMachine(Accessory):
             site = self.worldbody.find("./body/body/site[@name='{}']".format(name))
             if site is not None:
                 self._coffee_liquid_site_names.append(name)
+        self._coffee_liquid_site_ids = None
 
     def get_reset_regions(self, *args, **kwargs):
         """
@@ -71,6 +72,18 @@ class CoffeeMachine(Accessory):
         )
         return state
 
+    def bind(self, sim):
+        """
+        Resolves the ids of the coffee liquid sites
+
+        Args:
+            sim (MjSim): simulation the coffee machine is part of
+        """
+        self._coffee_liquid_site_ids = np.array(
+            [sim.model.site_name2id(name) for name in self._coffee_liquid_site_names],
+            dtype=int,
+        )
+
     def update_state(self, env):
         """
         Checks if the gripper is pressing the start button. If this is the first time the gripper pressed the button,
@@ -86,12 +99,11 @@ class CoffeeMachine(Accessory):
         if self._turned_on is False and start_button_pressed:
             self._turned_on = True
 
-        for site_name in self._coffee_liquid_site_names:
-            site_id = env.sim.model.site_name2id(site_name)
-            if self._turned_on:
-                env.sim.model.site_rgba[site_id][3] = 1.0
-            else:
-                env.sim.model.site_rgba[site_id][3] = 0.0
+        if self._coffee_liquid_site_ids is None:
+            self.bind(env.sim)
+        env.sim.model.site_rgba[self._coffee_liquid_site_ids, 3] = (
+            1.0 if self._turned_on else 0.0
+        )
 
     def check_receptacle_placement_for_pouring(self, env, obj_name, xy_thresh=0.04):
         """
@@ -5,13 +5,13 @@ from robosuite.utils.mjcf_utils import array_to_string as a2s
 from robosuite.utils.mjcf_utils import find_elements, xml_path_completion
 
 import robocasa
-from robocasa.models.objects import MujocoXMLObject
+from robocasa.models.objects.objects import CachedMujocoXMLObject
 from robocasa.models.fixtures.fixture import get_texture_name_from_file
 from robocasa.models.fixtures.handles import *
 from robocasa.utils.object_utils import set_geom_dimensions
 
 
-class CabinetPanel(MujocoXMLObject):
+class CabinetPanel(CachedMujocoXMLObject):
     """
     Base class for cabinet panels which are attached to the cabinet body.
 
@@ -456,7 +456,7 @@ class FullWindowedCabinetPanel(CabinetPanel):
         transparent_mat.set("rgba", f"1 1 1 {self.opacity}")
 
 
-class CabinetShelf(MujocoXMLObject):
+class CabinetShelf(CachedMujocoXMLObject):
     """
     Initialize a cabinet shelf, which is a simple flat panel but rotated 90 degrees.
 
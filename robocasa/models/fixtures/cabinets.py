@@ -694,6 +694,8 @@ class Drawer(Cabinet):
         **kwargs,
     ):
         self.cabinet_type = "drawer"
+        # mujoco ids of the interior bounding box sites, resolved in bind
+        self._int_site_ids = None
 
         xml = "fixtures/cabinets/drawer.xml"
 
@@ -819,13 +821,27 @@ class Drawer(Cabinet):
         Args:
             env (MujocoEnv): environment
         """
+        if self._int_site_ids is None:
+            self.bind(env.sim)
         int_sites = {}
-        for site in ["int_p0", "int_px", "int_py", "int_pz"]:
+        for (site, site_id) in self._int_site_ids.items():
             int_sites[site] = get_fixture_to_point_rel_offset(
-                self, np.array(env.sim.data.get_site_xpos(self.naming_prefix + site))
+                self, np.array(env.sim.data.site_xpos[site_id])
             )
         self.set_bounds_sites(int_sites)
 
+    def bind(self, sim):
+        """
+        Resolves the ids of the interior bounding box sites
+
+        Args:
+            sim (MjSim): simulation the drawer is part of
+        """
+        self._int_site_ids = {
+            site: sim.model.site_name2id(self.naming_prefix + site)
+            for site in ["int_p0", "int_px", "int_py", "int_pz"]
+        }
+
     def set_door_state(self, min, max, env, rng):
         """
         Sets how open the drawer is. Chooses a random amount between min and max.
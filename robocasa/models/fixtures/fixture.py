@@ -17,7 +17,7 @@ from robosuite.utils.mjcf_utils import (
 
 import robocasa
 import robocasa.macros as macros
-from robocasa.models.objects import MujocoXMLObject
+from robocasa.models.objects.objects import CachedMujocoXMLObject
 from robocasa.utils.object_utils import get_pos_after_rel_offset
 
 
@@ -69,7 +69,7 @@ class FixtureType(IntEnum):
     # HOOD = 25
 
 
-class Fixture(MujocoXMLObject):
+class Fixture(CachedMujocoXMLObject):
     """
     Base class for fixtures in robosuite kitchen environments.
 
@@ -253,6 +253,43 @@ class Fixture(MujocoXMLObject):
         """
         return
 
+    def bind(self, sim):
+        """
+        Resolves the MuJoCo ids used by update_state, so that per-step updates do not look up names.
+        Called by the environment whenever a new sim is built
+
+        Args:
+            sim (MjSim): simulation the fixture is part of
+        """
+        return
+
+    @classmethod
+    def make_state_updater(cls, fixtures):
+        """
+        Returns a function that updates the state of @fixtures, which are all instances of this class, at once.
+        Used by the environment after every step instead of calling update_state on each fixture. The fixtures
+        must be bound to the current sim (see bind)
+
+        Args:
+            fixtures (list): fixtures to update
+
+        Returns:
+            function: function of the environment, or None if the fixtures have no state to update
+        """
+        fixtures = [
+            fxtr
+            for fxtr in fixtures
+            if type(fxtr).update_state is not Fixture.update_state
+        ]
+        if len(fixtures) == 0:
+            return None
+
+        def update(env):
+            for fxtr in fixtures:
+                fxtr.update_state(env)
+
+        return update
+
     @property
     def pos(self):
         return string_to_array(self._obj.get("pos"))
@@ -278,15 +315,29 @@ class Fixture(MujocoXMLObject):
         """
         override the default behavior of only looking at first dimension for radius
         """
-        horizontal_radius_site = self.worldbody.find(
-            "./body/site[@name='{}horizontal_radius_site']".format(self.naming_prefix)
+
+        def compute():
+            horizontal_radius_site = self.worldbody.find(
+                "./body/site[@name='{}horizontal_radius_site']".format(
+                    self.naming_prefix
+                )
+            )
+            site_values = string_to_array(horizontal_radius_site.get("pos"))
+            return np.linalg.norm(site_values[0:2])
+
+        return self._get_cached_geometry("horizontal_radius", compute)
+
+    def _bounds_site_pos(self, postfix):
+        """
+        Returns the (cached) position of the bounding box site with the given postfix (e.g. "ext_p0")
+        """
+        return self._get_cached_geometry(
+            postfix, lambda: site_pos(self._bounds_sites[postfix])
         )
-        site_values = string_to_array(horizontal_radius_site.get("pos"))
-        return np.linalg.norm(site_values[0:2])
 
     @property
     def bottom_offset(self):
-        return site_pos(self._bounds_sites["ext_p0"])
+        return np.array(self._bounds_site_pos("ext_p0"))
 
     @property
     def width(self):
@@ -295,8 +346,8 @@ class Fixture(MujocoXMLObject):
         takes scaling into account
         """
         if "ext_px" in self._bounds_sites:
-            ext_p0 = site_pos(self._bounds_sites["ext_p0"])
-            ext_px = site_pos(self._bounds_sites["ext_px"])
+            ext_p0 = self._bounds_site_pos("ext_p0")
+            ext_px = self._bounds_site_pos("ext_px")
             w = ext_px[0] - ext_p0[0]
             return w
         else:
@@ -309,8 +360,8 @@ class Fixture(MujocoXMLObject):
         takes scaling into account
         """
         if "ext_py" in self._bounds_sites:
-            ext_p0 = site_pos(self._bounds_sites["ext_p0"])
-            ext_py = site_pos(self._bounds_sites["ext_py"])
+            ext_p0 = self._bounds_site_pos("ext_p0")
+            ext_py = self._bounds_site_pos("ext_py")
             d = ext_py[1] - ext_p0[1]
             return d
         else:
@@ -323,8 +374,8 @@ class Fixture(MujocoXMLObject):
         takes scaling into account
         """
         if "ext_pz" in self._bounds_sites:
-            ext_p0 = site_pos(self._bounds_sites["ext_p0"])
-            ext_pz = site_pos(self._bounds_sites["ext_pz"])
+            ext_p0 = self._bounds_site_pos("ext_p0")
+            ext_pz = self._bounds_site_pos("ext_pz")
             h = ext_pz[2] - ext_p0[2]
             return h
         else:
@@ -339,6 +390,7 @@ class Fixture(MujocoXMLObject):
         """
         for (name, pos) in pos_dict.items():
             self._bounds_sites[name].set("pos", array_to_string(pos))
+        self._invalidate_geometry()
 
     def get_ext_sites(self, all_points=False, relative=True):
         """
@@ -353,10 +405,10 @@ class Fixture(MujocoXMLObject):
             list: 4 or 8 points
         """
         sites = [
-            site_pos(self._bounds_sites["ext_p0"]),
-            site_pos(self._bounds_sites["ext_px"]),
-            site_pos(self._bounds_sites["ext_py"]),
-            site_pos(self._bounds_sites["ext_pz"]),
+            np.array(self._bounds_site_pos("ext_p0")),
+            np.array(self._bounds_site_pos("ext_px")),
+            np.array(self._bounds_site_pos("ext_py")),
+            np.array(self._bounds_site_pos("ext_pz")),
         ]
 
         if all_points:
@@ -386,10 +438,10 @@ class Fixture(MujocoXMLObject):
             list: 4 or 8 points
         """
         sites = [
-            site_pos(self._bounds_sites["int_p0"]),
-            site_pos(self._bounds_sites["int_px"]),
-            site_pos(self._bounds_sites["int_py"]),
-            site_pos(self._bounds_sites["int_pz"]),
+            np.array(self._bounds_site_pos("int_p0")),
+            np.array(self._bounds_site_pos("int_px")),
+            np.array(self._bounds_site_pos("int_py")),
+            np.array(self._bounds_site_pos("int_pz")),
         ]
 
         if all_points:
@@ -406,13 +458,40 @@ class Fixture(MujocoXMLObject):
 
         return sites
 
+    def get_box_frame(self, box="int"):
+        """
+        Get the interior or exterior bounding box of the object in the world frame, in the form used by batched
+        containment checks (see object_utils.objs_inside_of). Cached until the object is moved or its bounding box
+        sites change
+
+        Args:
+            box (str): "int" for the interior bounding box, "ext" for the exterior bounding box
+
+        Returns:
+            2-tuple: (3, 3) array of the box edge vectors u, v, w (one per row) and (2, 3) array of the lower and
+                upper bounds of the projections of the box onto them
+        """
+        assert box in ["int", "ext"]
+        key = (self._obj.get("pos"), self._obj.get("quat"), self._obj.get("euler"))
+        cached = self._geometry_cache.get(box + "_frame", None)
+        if cached is None or cached[0] != key:
+            if box == "int":
+                p0, px, py, pz = self.get_int_sites(relative=False)
+            else:
+                p0, px, py, pz = self.get_ext_sites(relative=False)
+            axes = np.array([px - p0, py - p0, pz - p0])
+            bounds = np.array(
+                [axes @ p0, np.einsum("ij,ij->i", axes, np.array([px, py, pz]))]
+            )
+            cached = (key, (axes, bounds))
+            self._geometry_cache[box + "_frame"] = cached
+        return cached[1]
+
     def get_bbox_points(self, trans=None, rot=None):
         """
         Get the full set of bounding box points of the object
         rot: a rotation matrix
         """
-        bbox_offsets = self.get_ext_sites(all_points=True, relative=True)
-
         if trans is None:
             trans = self.pos
         if rot is not None:
@@ -421,8 +500,10 @@ class Fixture(MujocoXMLObject):
             rot = np.array([0, 0, self.rot])
             rot = T.euler2mat(rot)
 
-        points = [(np.matmul(rot, p) + trans) for p in bbox_offsets]
-        return points
+        return list(np.matmul(self.bbox_offsets, rot.T) + trans)
+
+    def _get_bbox_offsets(self):
+        return self.get_ext_sites(all_points=True, relative=True)
 
     def _remove_element(self, elem):
         # # This method not currently working
@@ -0,0 +1,142 @@
+import numpy as np
+
+import robocasa.utils.object_utils as OU
+from robocasa.models.fixtures.fixture_utils import fixture_is_type
+
+
+class FixtureIndex:
+    """
+    Query index over the fixtures of a kitchen scene, built once the fixtures have been placed. Caches
+    the fixtures of each type, the world-space exterior bounding boxes of all fixtures, the pairwise
+    minimum distances between them and the sizes of their reset regions, so that fixture lookups
+    (see Kitchen.get_fixture) become array queries.
+
+    Args:
+        fixtures (dict): placed fixtures of the scene, by name
+    """
+
+    def __init__(self, fixtures):
+        # fixture dict the index was built from, used to detect a rebuilt scene
+        self.source = fixtures
+        self.names = list(fixtures.keys())
+        self.fixtures = list(fixtures.values())
+
+        # world-space exterior bounding box corners, (n, 8, 3). the first 4 points are p0, px, py, pz.
+        # entries without exterior sites (walls, floors) are nan and never match any query
+        self.corners = np.full((len(self.fixtures), 8, 3), np.nan)
+        for (i, fxtr) in enumerate(self.fixtures):
+            try:
+                sites = fxtr.get_ext_sites(all_points=True, relative=False)
+            except (AttributeError, KeyError):
+                continue
+            self.corners[i] = np.array(sites)
+        self.has_corners = ~np.any(np.isnan(self.corners), axis=(1, 2))
+        self._ids = {
+            id(fxtr): i for (i, fxtr) in enumerate(self.fixtures) if self.has_corners[i]
+        }
+
+        self._type_inds = {}
+        self._dists = None
+        self._region_sizes = {}
+
+    def __len__(self):
+        return len(self.fixtures)
+
+    def index_of(self, fxtr):
+        """
+        Returns:
+            int: index of fixture @fxtr, or None if it is not indexed or has no exterior sites
+        """
+        return self._ids.get(id(fxtr), None)
+
+    def get_type_inds(self, fixture_type):
+        """
+        Returns:
+            np.array: indices of the fixtures of type @fixture_type, in scene order
+        """
+        key = int(fixture_type)
+        inds = self._type_inds.get(key, None)
+        if inds is None:
+            inds = np.array(
+                [
+                    i
+                    for (i, fxtr) in enumerate(self.fixtures)
+                    if fixture_is_type(fxtr, fixture_type)
+                ],
+                dtype=int,
+            )
+            self._type_inds[key] = inds
+        return inds
+
+    def get_name_inds(self, substring):
+        """
+        Returns:
+            np.array: indices of the fixtures whose name contains @substring, in scene order
+        """
+        return np.array(
+            [i for (i, name) in enumerate(self.names) if substring in name], dtype=int
+        )
+
+    @property
+    def pairwise_dists(self):
+        """
+        Returns:
+            np.array: (n, n) minimum distances between the exterior bounding box corners of all fixtures
+        """
+        if self._dists is None:
+            n = len(self.fixtures)
+            points = self.corners.reshape(n * 8, 3)
+            sq_norms = np.sum(points**2, axis=1)
+            sq_dists = (
+                sq_norms[:, None] + sq_norms[None, :] - 2 * np.matmul(points, points.T)
+            )
+            sq_dists = np.maximum(sq_dists, 0.0).reshape(n, 8, n, 8)
+            self._dists = np.sqrt(np.min(sq_dists, axis=(1, 3)))
+        return self._dists
+
+    def contains_point(self, point, inds=None, only_2d=False):
+        """
+        Version of OU.point_in_fixture over multiple fixtures
+
+        Args:
+            point (np.array): point to check
+
+            inds (np.array): indices of the fixtures to check, defaults to all fixtures
+
+            only_2d (bool): whether to check only in 2D
+
+        Returns:
+            np.array: boolean mask over @inds, True for fixtures whose exterior bounding box contains @point
+        """
+        inds = np.arange(len(self.fixtures)) if inds is None else np.asarray(inds)
+        points = np.asarray(point, dtype=float).reshape(1, 3)
+        return np.array(
+            [
+                self.has_corners[i]
+                and OU.points_in_fixture(points, self.fixtures[i], only_2d=only_2d)[0]
+                for i in inds.astype(int)
+            ],
+            dtype=bool,
+        )
+
+    def get_region_sizes(self, env, ind):
+        """
+        Returns:
+            np.array: (r, 2) sizes of the reset regions of fixture @ind
+        """
+        sizes = self._region_sizes.get(ind, None)
+        if sizes is None:
+            regions = self.fixtures[ind].get_reset_regions(env)
+            sizes = np.array(
+                [region["size"][:2] for region in regions.values()], dtype=float
+            ).reshape(-1, 2)
+            self._region_sizes[ind] = sizes
+        return sizes
+
+    def has_valid_region(self, env, ind, size):
+        """
+        Returns:
+            bool: True if fixture @ind has a reset region of at least @size (x, y)
+        """
+        sizes = self.get_region_sizes(env, ind)
+        return bool(np.any(np.all(sizes >= np.asarray(size)[:2], axis=1)))
@@ -7,11 +7,11 @@ from robosuite.utils.mjcf_utils import array_to_string as a2s
 from robosuite.utils.mjcf_utils import find_elements, xml_path_completion
 
 import robocasa
-from robocasa.models.objects import MujocoXMLObject
+from robocasa.models.objects.objects import CachedMujocoXMLObject
 from robocasa.models.fixtures.fixture import get_texture_name_from_file
 
 
-class Handle(MujocoXMLObject):
+class Handle(CachedMujocoXMLObject):
     """
     Base class for all handles attached to cabinet/drawer panels
 
@@ -25,6 +25,17 @@ class Microwave(Fixture):
             xml=xml, name=name, duplicate_collision_geoms=False, *args, **kwargs
         )
         self._turned_on = False
+        # mujoco id of the door joint, resolved in bind
+        self._door_joint_id = None
+
+    def bind(self, sim):
+        """
+        Resolves the id of the door joint
+
+        Args:
+            sim (MjSim): simulation the microwave is part of
+        """
+        self._door_joint_id = sim.model.joint_name2id(f"{self.name}_microjoint")
 
     def set_door_state(self, min, max, env, rng):
         """
@@ -64,8 +75,9 @@ class Microwave(Fixture):
         Returns:
             dict: maps door name to a percentage of how open the door is
         """
-        sim = env.sim
-        hinge_qpos = sim.data.qpos[sim.model.joint_name2id(f"{self.name}_microjoint")]
+        if self._door_joint_id is None:
+            self.bind(env.sim)
+        hinge_qpos = env.sim.data.qpos[self._door_joint_id]
         hinge_qpos = -hinge_qpos  # negate as micro joints are left door hinges
 
         # convert to percentages
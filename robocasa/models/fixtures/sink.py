@@ -18,11 +18,48 @@ class Sink(Fixture):
     def __init__(self, xml="fixtures/sink.xml", name="sink", *args, **kwargs):
         self._handle_joint = None
         self._water_site = None
+        # mujoco ids, resolved in bind
+        self._water_site_id = None
+        self._handle_joint_id = None
+        self._spout_joint_id = None
 
         super().__init__(
             xml=xml, name=name, duplicate_collision_geoms=False, *args, **kwargs
         )
 
+    def bind(self, sim):
+        """
+        Resolves the ids of the water site and the handle and spout joints
+
+        Args:
+            sim (MjSim): simulation the sink is part of
+        """
+        self._water_site_id = -1
+        self._handle_joint_id = -1
+        self._spout_joint_id = -1
+        try:
+            self._water_site_id = sim.model.site_name2id(
+                "{}water".format(self.naming_prefix)
+            )
+        except ValueError:
+            pass
+        if self.handle_joint is not None:
+            self._handle_joint_id = sim.model.joint_name2id(
+                "{}handle_joint".format(self.naming_prefix)
+            )
+            self._spout_joint_id = sim.model.joint_name2id(
+                "{}spout_joint".format(self.naming_prefix)
+            )
+
+    @staticmethod
+    def _update_water(sim, site_ids, joint_ids):
+        """
+        Turns the water sites @site_ids on or off based on the positions of the handle joints @joint_ids
+        """
+        handle_qpos = sim.data.qpos[joint_ids] % (2 * np.pi)
+        water_on = (0.40 < handle_qpos) & (handle_qpos < np.pi)
+        sim.model.site_rgba[site_ids, 3] = np.where(water_on, 0.5, 0.0)
+
     def update_state(self, env):
         """
         Updates the water flowing of the sink based on the handle_joint position
@@ -30,15 +67,33 @@ class Sink(Fixture):
         Args:
             env (MujocoEnv): environment
         """
-        state = self.get_handle_state(env)
-        water_on = state["water_on"]
+        if self._water_site_id is None:
+            self.bind(env.sim)
+        if self._water_site_id < 0 or self._handle_joint_id < 0:
+            return
+        self._update_water(
+            env.sim, np.array([self._water_site_id]), np.array([self._handle_joint_id])
+        )
 
-        site_id = env.sim.model.site_name2id("{}water".format(self.naming_prefix))
+    @classmethod
+    def make_state_updater(cls, fixtures):
+        """
+        Returns a function that updates the water flowing of all sinks in @fixtures at once
+        """
+        fixtures = [
+            fxtr
+            for fxtr in fixtures
+            if fxtr._water_site_id >= 0 and fxtr._handle_joint_id >= 0
+        ]
+        if len(fixtures) == 0:
+            return None
+        site_ids = np.array([fxtr._water_site_id for fxtr in fixtures], dtype=int)
+        joint_ids = np.array([fxtr._handle_joint_id for fxtr in fixtures], dtype=int)
 
-        if water_on:
-            env.sim.model.site_rgba[site_id][3] = 0.5
-        else:
-            env.sim.model.site_rgba[site_id][3] = 0.0
+        def update(env):
+            cls._update_water(env.sim, site_ids, joint_ids)
+
+        return update
 
     def set_handle_state(self, env, rng, mode="on"):
         """
@@ -78,21 +133,17 @@ class Sink(Fixture):
         handle_state = {}
         if self.handle_joint is None:
             return handle_state
+        if self._handle_joint_id is None:
+            self.bind(env.sim)
 
-        handle_joint_id = env.sim.model.joint_name2id(
-            "{}handle_joint".format(self.naming_prefix)
-        )
-        handle_joint_qpos = deepcopy(env.sim.data.qpos[handle_joint_id])
+        handle_joint_qpos = deepcopy(env.sim.data.qpos[self._handle_joint_id])
         handle_joint_qpos = handle_joint_qpos % (2 * np.pi)
         if handle_joint_qpos < 0:
             handle_joint_qpos += 2 * np.pi
         handle_state["handle_joint"] = handle_joint_qpos
         handle_state["water_on"] = 0.40 < handle_joint_qpos < np.pi
 
-        spout_joint_id = env.sim.model.joint_name2id(
-            "{}spout_joint".format(self.naming_prefix)
-        )
-        spout_joint_qpos = deepcopy(env.sim.data.qpos[spout_joint_id])
+        spout_joint_qpos = deepcopy(env.sim.data.qpos[self._spout_joint_id])
         spout_joint_qpos = spout_joint_qpos % (2 * np.pi)
         if spout_joint_qpos < 0:
             spout_joint_qpos += 2 * np.pi
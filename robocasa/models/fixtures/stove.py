@@ -29,6 +29,10 @@ class Stove(Fixture):
 
         self._knob_joints = None
         self._burner_sites = None
+        # mujoco ids, resolved in bind
+        self._burner_site_ids = None
+        self._burner_joint_ids = None
+        self._knob_joint_ids = None
 
         super().__init__(
             xml=xml, name=name, duplicate_collision_geoms=False, *args, **kwargs
@@ -73,38 +77,70 @@ class Stove(Fixture):
 
         return regions
 
-    def update_state(self, env):
+    def bind(self, sim):
         """
-        Updates the burner flames of the stove based on the knob joint positions
+        Resolves the ids of the burner sites and knob joints
 
         Args:
-            env (MujocoEnv): environment
+            sim (MjSim): simulation the stove is part of
         """
+        site_ids, joint_ids = [], []
+        self._knob_joint_ids = {}
         for location in STOVE_LOCATIONS:
-            site = self.burner_sites[location]
-            if site is None:
+            if self.burner_sites[location] is None:
                 continue
-            site_id = env.sim.model.site_name2id(
-                "{}burner_on_{}".format(self.naming_prefix, location)
+            joint_id = -1
+            if self.knob_joints[location] is not None:
+                joint_id = sim.model.joint_name2id(
+                    "{}knob_{}_joint".format(self.naming_prefix, location)
+                )
+                self._knob_joint_ids[location] = joint_id
+            site_ids.append(
+                sim.model.site_name2id(
+                    "{}burner_on_{}".format(self.naming_prefix, location)
+                )
             )
+            joint_ids.append(joint_id)
+        self._burner_site_ids = np.array(site_ids, dtype=int)
+        self._burner_joint_ids = np.array(joint_ids, dtype=int)
 
-            joint = self.knob_joints[location]
-            if joint is None:
-                env.sim.model.site_rgba[site_id][3] = 0.0
-                continue
-            joint_id = env.sim.model.joint_name2id(
-                "{}knob_{}_joint".format(self.naming_prefix, location)
-            )
+    @staticmethod
+    def _update_burners(sim, site_ids, joint_ids):
+        """
+        Turns the burner flame sites @site_ids on or off based on the positions of their knob joints
+        @joint_ids (-1 for burners without a knob, which are always off)
+        """
+        has_knob = joint_ids >= 0
+        joint_qpos = sim.data.qpos[joint_ids[has_knob]] % (2 * np.pi)
+        flame_on = np.zeros(len(site_ids), dtype=bool)
+        flame_on[has_knob] = (0.35 <= joint_qpos) & (joint_qpos <= 2 * np.pi - 0.35)
+        sim.model.site_rgba[site_ids, 3] = np.where(flame_on, 0.5, 0.0)
 
-            joint_qpos = deepcopy(env.sim.data.qpos[joint_id])
-            joint_qpos = joint_qpos % (2 * np.pi)
-            if joint_qpos < 0:
-                joint_qpos += 2 * np.pi
+    def update_state(self, env):
+        """
+        Updates the burner flames of the stove based on the knob joint positions
 
-            if 0.35 <= np.abs(joint_qpos) <= 2 * np.pi - 0.35:
-                env.sim.model.site_rgba[site_id][3] = 0.5
-            else:
-                env.sim.model.site_rgba[site_id][3] = 0.0
+        Args:
+            env (MujocoEnv): environment
+        """
+        if self._burner_site_ids is None:
+            self.bind(env.sim)
+        self._update_burners(env.sim, self._burner_site_ids, self._burner_joint_ids)
+
+    @classmethod
+    def make_state_updater(cls, fixtures):
+        """
+        Returns a function that updates the burner flames of all stoves in @fixtures at once
+        """
+        if len(fixtures) == 0:
+            return None
+        site_ids = np.concatenate([fxtr._burner_site_ids for fxtr in fixtures])
+        joint_ids = np.concatenate([fxtr._burner_joint_ids for fxtr in fixtures])
+
+        def update(env):
+            cls._update_burners(env.sim, site_ids, joint_ids)
+
+        return update
 
     def set_knob_state(self, env, rng, knob, mode="on"):
         """
@@ -142,19 +178,11 @@ class Stove(Fixture):
         Returns:
             dict: maps location of knob to the angle of the knob joint
         """
-        knobs_state = {}
-        for location in STOVE_LOCATIONS:
-            joint = self.knob_joints[location]
-            if joint is None:
-                continue
-            site = self.burner_sites[location]
-            if site is None:
-                continue
-
-            joint_id = env.sim.model.joint_name2id(
-                "{}knob_{}_joint".format(self.naming_prefix, location)
-            )
+        if self._knob_joint_ids is None:
+            self.bind(env.sim)
 
+        knobs_state = {}
+        for (location, joint_id) in self._knob_joint_ids.items():
             joint_qpos = deepcopy(env.sim.data.qpos[joint_id])
             joint_qpos = joint_qpos % (2 * np.pi)
             if joint_qpos < 0:
@@ -1,9 +1,11 @@
+import json
 import math
 import os
 import xml.etree.ElementTree as ET
 from copy import deepcopy
 
 import numpy as np
+from robosuite.utils.log_utils import ROBOSUITE_DEFAULT_LOGGER
 from robosuite.utils.mjcf_utils import find_elements, string_to_array
 
 import robocasa
@@ -11,6 +13,68 @@ from robocasa.models.objects.kitchen_objects import OBJ_CATEGORIES, OBJ_GROUPS
 
 BASE_ASSET_ZOO_PATH = os.path.join(robocasa.models.assets_root, "objects")
 
+# manifest of all object models and their sizes, see build_object_manifest. Can be overridden
+# with the ROBOCASA_OBJECT_MANIFEST environment variable
+OBJECT_MANIFEST_PATH = os.environ.get(
+    "ROBOCASA_OBJECT_MANIFEST",
+    os.path.join(BASE_ASSET_ZOO_PATH, "object_manifest.json"),
+)
+
+# contents of the manifest at OBJECT_MANIFEST_PATH, loaded on first use
+_OBJECT_MANIFEST = None
+_OBJECT_MANIFEST_LOADED = False
+# manifest paths grouped by folder, see get_object_manifest_folders
+_OBJECT_MANIFEST_FOLDERS = None
+
+
+def get_object_manifest():
+    """
+    Returns the (process-wide cached) contents of the object manifest at OBJECT_MANIFEST_PATH,
+    or None if there is no manifest
+    """
+    global _OBJECT_MANIFEST, _OBJECT_MANIFEST_LOADED
+    if not _OBJECT_MANIFEST_LOADED:
+        _OBJECT_MANIFEST = load_object_manifest(OBJECT_MANIFEST_PATH)
+        _OBJECT_MANIFEST_LOADED = True
+    return _OBJECT_MANIFEST
+
+
+def get_object_manifest_folders():
+    """
+    Groups the paths of the object manifest by folder, so that the models of a category folder are looked up
+    without scanning the whole manifest
+
+    Returns:
+        dict or None: maps every folder containing models (relative to the object asset root) to the paths of
+            the model.xml files below it, or None if there is no manifest
+    """
+    global _OBJECT_MANIFEST_FOLDERS
+    manifest = get_object_manifest()
+    if manifest is None:
+        return None
+    if _OBJECT_MANIFEST_FOLDERS is None:
+        folders = {}
+        for rel_path in manifest:
+            folder = os.path.dirname(rel_path)
+            while folder:
+                folders.setdefault(folder, []).append(rel_path)
+                folder = os.path.dirname(folder)
+        _OBJECT_MANIFEST_FOLDERS = folders
+    return _OBJECT_MANIFEST_FOLDERS
+
+
+def _walk_model_folder(folder):
+    """
+    Returns:
+        list: paths (relative to the object asset root) of the model.xml files below @folder
+    """
+    cat_path = os.path.join(BASE_ASSET_ZOO_PATH, folder)
+    return [
+        os.path.relpath(os.path.join(root, "model.xml"), BASE_ASSET_ZOO_PATH)
+        for root, _, files in os.walk(cat_path)
+        if "model.xml" in files
+    ]
+
 
 class ObjCat:
     """
@@ -93,16 +157,43 @@ class ObjCat:
         if model_folders is None:
             subf = "aigen_objs" if self.aigen_cat else "objaverse"
             model_folders = ["{}/{}".format(subf, name)]
-        cat_mjcf_paths = []
-        for folder in model_folders:
-            cat_path = os.path.join(BASE_ASSET_ZOO_PATH, folder)
-            for root, _, files in os.walk(cat_path):
-                if "model.xml" in files:
-                    model_name = os.path.basename(root)
+        self.model_folders = model_folders
+
+        # resolved lazily, see mjcf_paths
+        self._mjcf_paths = None
+
+    @property
+    def mjcf_paths(self):
+        """
+        Sorted list of paths to the MJCF models in this category. Resolved on first access, from the object
+        manifest if one exists, else by walking the model folders.
+        """
+        if self._mjcf_paths is None:
+            manifest_folders = get_object_manifest_folders()
+            cat_mjcf_paths = []
+            for folder in self.model_folders:
+                folder = os.path.normpath(folder)
+                if manifest_folders is None:
+                    rel_paths = _walk_model_folder(folder)
+                elif folder in manifest_folders:
+                    rel_paths = manifest_folders[folder]
+                else:
+                    # the manifest predates this folder, fall back to walking it
+                    rel_paths = _walk_model_folder(folder)
+                    if len(rel_paths) > 0:
+                        ROBOSUITE_DEFAULT_LOGGER.warning(
+                            "Object folder {} is missing from the object manifest {}, rebuild it with "
+                            "robocasa/scripts/build_object_manifest.py".format(
+                                folder, OBJECT_MANIFEST_PATH
+                            )
+                        )
+                for rel_path in rel_paths:
+                    model_name = os.path.basename(os.path.dirname(rel_path))
                     if model_name in self.exclude:
                         continue
-                    cat_mjcf_paths.append(os.path.join(root, "model.xml"))
-        self.mjcf_paths = sorted(cat_mjcf_paths)
+                    cat_mjcf_paths.append(os.path.join(BASE_ASSET_ZOO_PATH, rel_path))
+            self._mjcf_paths = sorted(cat_mjcf_paths)
+        return self._mjcf_paths
 
     def get_mjcf_kwargs(self):
         """
@@ -153,6 +244,174 @@ for (name, kwargs) in OBJ_CATEGORIES.items():
         )
 
 
+def get_object_size(mjcf_path):
+    """
+    Reads the (unscaled) bounding box size of an object from the bottom, top, and horizontal radius
+    sites of its MJCF model
+
+    Args:
+        mjcf_path (str): path to the model.xml of the object
+
+    Returns:
+        np.array: (x, y, z) size of the object
+    """
+    root = ET.parse(mjcf_path).getroot()
+    bottom = string_to_array(
+        find_elements(root=root, tags="site", attribs={"name": "bottom_site"}).get(
+            "pos"
+        )
+    )
+    top = string_to_array(
+        find_elements(root=root, tags="site", attribs={"name": "top_site"}).get("pos")
+    )
+    horizontal_radius = string_to_array(
+        find_elements(
+            root=root, tags="site", attribs={"name": "horizontal_radius_site"}
+        ).get("pos")
+    )
+    return np.array(
+        [horizontal_radius[0] * 2, horizontal_radius[1] * 2, top[2] - bottom[2]]
+    )
+
+
+def load_object_manifest(manifest_path=OBJECT_MANIFEST_PATH):
+    """
+    Loads the object asset manifest
+
+    Args:
+        manifest_path (str): path to the manifest file
+
+    Returns:
+        dict or None: maps the path of each model.xml (relative to the object asset root) to its metadata,
+            or None if there is no manifest
+    """
+    if manifest_path is None or not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path, "r") as f:
+        manifest = json.load(f)
+    return manifest["objects"]
+
+
+def build_object_manifest(manifest_path=OBJECT_MANIFEST_PATH):
+    """
+    Walks the object asset root once and writes a manifest containing every model.xml along with its
+    (unscaled) size, so that later processes neither need to walk the asset folders nor parse the models
+
+    Args:
+        manifest_path (str): path to write the manifest to
+
+    Returns:
+        dict: the manifest entries that were written
+    """
+    objects = {}
+    for root, _, files in os.walk(BASE_ASSET_ZOO_PATH):
+        if "model.xml" not in files:
+            continue
+        mjcf_path = os.path.join(root, "model.xml")
+        rel_path = os.path.relpath(mjcf_path, BASE_ASSET_ZOO_PATH)
+        objects[rel_path] = dict(size=get_object_size(mjcf_path).tolist())
+
+    objects = dict(sorted(objects.items()))
+    tmp_path = "{}.{}.tmp".format(manifest_path, os.getpid())
+    with open(tmp_path, "w") as f:
+        json.dump(dict(version=1, objects=objects), f, indent=1)
+    os.replace(tmp_path, manifest_path)
+    return objects
+
+
+class ObjectGeometryIndex:
+    """
+    In-memory table of the (unscaled) size, category, and registry of the object models in OBJ_CATEGORIES.
+    The rows of a category are added the first time one of its models is looked up, so that only the model
+    folders of the sampled categories are resolved. Sizes are read from the object manifest when available.
+    Models that are missing from the manifest are parsed once on first use.
+
+    Args:
+        manifest_path (str): path to the object manifest
+    """
+
+    def __init__(self, manifest_path=OBJECT_MANIFEST_PATH):
+        if manifest_path == OBJECT_MANIFEST_PATH:
+            self._manifest = get_object_manifest() or {}
+        else:
+            self._manifest = load_object_manifest(manifest_path) or {}
+
+        self.mjcf_paths = []
+        self.cats = []
+        self.registries = []
+        self.sizes = np.zeros((0, 3))
+        self._rows = {}
+        self._indexed_cats = set()
+
+    def _add_rows(self, mjcf_paths, cat, reg):
+        """
+        Appends rows for the given models, with their sizes from the manifest (nan if missing)
+        """
+        mjcf_paths = [p for p in dict.fromkeys(mjcf_paths) if p not in self._rows]
+        sizes = np.full((len(mjcf_paths), 3), np.nan)
+        for (i, mjcf_path) in enumerate(mjcf_paths):
+            self._rows[mjcf_path] = len(self.mjcf_paths)
+            self.mjcf_paths.append(mjcf_path)
+            self.cats.append(cat)
+            self.registries.append(reg)
+            entry = self._manifest.get(os.path.relpath(mjcf_path, BASE_ASSET_ZOO_PATH))
+            if entry is not None:
+                sizes[i] = entry["size"]
+        self.sizes = np.concatenate([self.sizes, sizes])
+
+    def _index_category(self, cat):
+        """
+        Adds the rows of all models of category @cat, if not done yet
+        """
+        if cat in self._indexed_cats:
+            return
+        self._indexed_cats.add(cat)
+        for (reg, obj_cat) in OBJ_CATEGORIES[cat].items():
+            self._add_rows(obj_cat.mjcf_paths, cat, reg)
+
+    def get_sizes(self, mjcf_paths, cats=None):
+        """
+        Returns the (unscaled) sizes of the given models
+
+        Args:
+            mjcf_paths (list of str): paths to the model.xml files
+
+            cats (list of str): category of each model. If given, the rows of these categories are added to the
+                index as a whole, otherwise each unknown model gets its own row
+
+        Returns:
+            np.array: (n, 3) array of sizes
+        """
+        if cats is not None:
+            for cat in set(cats):
+                self._index_category(cat)
+        unknown = [p for p in mjcf_paths if p not in self._rows]
+        if len(unknown) > 0:
+            self._add_rows(unknown, cat=None, reg=None)
+
+        rows = np.array([self._rows[p] for p in mjcf_paths], dtype=int)
+        sizes = self.sizes[rows]
+        missing = np.isnan(sizes[:, 0])
+        for i in np.nonzero(missing)[0]:
+            self.sizes[rows[i]] = get_object_size(self.mjcf_paths[rows[i]])
+        if np.any(missing):
+            sizes = self.sizes[rows]
+        return sizes
+
+
+_OBJECT_GEOMETRY_INDEX = None
+
+
+def get_object_geometry_index():
+    """
+    Returns the process-wide object geometry index, building it on first use
+    """
+    global _OBJECT_GEOMETRY_INDEX
+    if _OBJECT_GEOMETRY_INDEX is None:
+        _OBJECT_GEOMETRY_INDEX = ObjectGeometryIndex()
+    return _OBJECT_GEOMETRY_INDEX
+
+
 def sample_kitchen_object(
     groups,
     exclude_groups=None,
@@ -192,7 +451,7 @@ def sample_kitchen_object(
         split (str): split to sample from. Split "A" specifies all but the last 3 object instances
                     (or the first half - whichever is larger), "B" specifies the  rest, and None specifies all.
 
-        max_size (tuple): max size of the object. If the sampled object is not within bounds of max size, function will resample
+        max_size (tuple): max size of the object. Objects that exceed max size are masked out before sampling
 
         object_scale (float): scale of the object. If set will multiply the scale of the sampled object by this value
 
@@ -203,56 +462,205 @@ def sample_kitchen_object(
         dict: info about the sampled object - the path of the mjcf, groups which the object's category belongs to, the category of the object
               the sampling split the object came from, and the groups the object was sampled from
     """
-    valid_object_sampled = False
-    while valid_object_sampled is False:
-        mjcf_kwargs, info = sample_kitchen_object_helper(
-            groups=groups,
-            exclude_groups=exclude_groups,
-            graspable=graspable,
-            washable=washable,
-            microwavable=microwavable,
-            cookable=cookable,
-            freezable=freezable,
-            rng=rng,
-            obj_registries=obj_registries,
-            split=split,
-            object_scale=object_scale,
-        )
+    helper_kwargs = dict(
+        groups=groups,
+        exclude_groups=exclude_groups,
+        graspable=graspable,
+        washable=washable,
+        microwavable=microwavable,
+        cookable=cookable,
+        freezable=freezable,
+        rng=rng,
+        obj_registries=obj_registries,
+        split=split,
+        object_scale=object_scale,
+    )
+    # nothing to filter: sample directly. Explicit xml paths are spawned as-is
+    if all([s is None for s in max_size]) or (
+        isinstance(groups, str) and groups.endswith(".xml")
+    ):
+        return sample_kitchen_object_helper(**helper_kwargs)
 
-        # check if object size is within bounds
-        mjcf_path = info["mjcf_path"]
-        tree = ET.parse(mjcf_path)
-        root = tree.getroot()
-        bottom = string_to_array(
-            find_elements(root=root, tags="site", attribs={"name": "bottom_site"}).get(
-                "pos"
-            )
-        )
-        top = string_to_array(
-            find_elements(root=root, tags="site", attribs={"name": "top_site"}).get(
-                "pos"
-            )
-        )
-        horizontal_radius = string_to_array(
-            find_elements(
-                root=root, tags="site", attribs={"name": "horizontal_radius_site"}
-            ).get("pos")
-        )
-        scale = mjcf_kwargs["scale"]
-        obj_size = (
-            np.array(
-                [horizontal_radius[0] * 2, horizontal_radius[1] * 2, top[2] - bottom[2]]
+    if rng is None:
+        rng = np.random.default_rng()
+
+    valid_categories = get_valid_categories(
+        groups,
+        exclude_groups=exclude_groups,
+        graspable=graspable,
+        washable=washable,
+        microwavable=microwavable,
+        cookable=cookable,
+        freezable=freezable,
+        obj_registries=obj_registries,
+    )
+
+    # enumerate all candidates, weighted with the probability that sample_kitchen_object_helper
+    # would pick them: uniform over categories, then registries weighted by number of models, then uniform
+    # over models
+    cand_paths, cand_cats, cand_regs, cand_probs, cand_scales = [], [], [], [], []
+    for cat in valid_categories:
+        choices = get_registry_choices(cat, obj_registries=obj_registries, split=split)
+        num_cat_models = sum(len(choices[reg]) for reg in obj_registries)
+        for reg in obj_registries:
+            if len(choices[reg]) == 0:
+                continue
+            # category scales are either scalars or per-axis lists
+            scale = np.broadcast_to(
+                np.asarray(OBJ_CATEGORIES[cat][reg].scale, dtype=float)
+                * (object_scale or 1.0),
+                3,
             )
-            * scale
+            for mjcf_path in choices[reg]:
+                cand_paths.append(mjcf_path)
+                cand_cats.append(cat)
+                cand_regs.append(reg)
+                cand_probs.append(1.0 / (len(valid_categories) * num_cat_models))
+                cand_scales.append(scale)
+
+    # vectorized size check over all candidates
+    sizes = get_object_geometry_index().get_sizes(cand_paths, cats=cand_cats)
+    obj_sizes = sizes * np.array(cand_scales)
+    size_bounds = np.array([np.inf if s is None else s for s in max_size])
+    valid = np.all(obj_sizes <= size_bounds, axis=1)
+    if not np.any(valid):
+        raise ValueError(
+            "No objects in groups {} are within max size {}".format(groups, max_size)
         )
-        valid_object_sampled = True
-        for i in range(3):
-            if max_size[i] is not None and obj_size[i] > max_size[i]:
-                valid_object_sampled = False
+
+    probs = np.array(cand_probs) * valid
+    ind = rng.choice(len(cand_paths), p=probs / np.sum(probs))
+
+    cat, reg, mjcf_path = cand_cats[ind], cand_regs[ind], cand_paths[ind]
+    mjcf_kwargs = OBJ_CATEGORIES[cat][reg].get_mjcf_kwargs()
+    mjcf_kwargs["mjcf_path"] = mjcf_path
+    if object_scale is not None:
+        mjcf_kwargs["scale"] *= object_scale
+
+    if not isinstance(groups, tuple) and not isinstance(groups, list):
+        groups = [groups]
+    info = get_sample_info(cat, groups=groups, split=split, mjcf_path=mjcf_path)
 
     return mjcf_kwargs, info
 
 
+def get_valid_categories(
+    groups,
+    exclude_groups=None,
+    graspable=None,
+    washable=None,
+    microwavable=None,
+    cookable=None,
+    freezable=None,
+    obj_registries=("objaverse",),
+):
+    """
+    Returns the object categories in @groups (but not in @exclude_groups) that are represented in
+    @obj_registries and satisfy the given properties. See sample_kitchen_object_helper for args.
+
+    Returns:
+        list: valid object categories
+    """
+    if not isinstance(groups, tuple) and not isinstance(groups, list):
+        groups = [groups]
+
+    if exclude_groups is None:
+        exclude_groups = []
+    if not isinstance(exclude_groups, tuple) and not isinstance(exclude_groups, list):
+        exclude_groups = [exclude_groups]
+
+    invalid_categories = []
+    for g in exclude_groups:
+        for cat in OBJ_GROUPS[g]:
+            invalid_categories.append(cat)
+
+    valid_categories = []
+    for g in groups:
+        for cat in OBJ_GROUPS[g]:
+            # don't repeat if already added
+            if cat in valid_categories:
+                continue
+            if cat in invalid_categories:
+                continue
+
+            # don't include if category not represented in any registry
+            cat_in_any_reg = np.any(
+                [reg in OBJ_CATEGORIES[cat] for reg in obj_registries]
+            )
+            if not cat_in_any_reg:
+                continue
+
+            invalid = False
+            for reg in obj_registries:
+                if reg not in OBJ_CATEGORIES[cat]:
+                    continue
+                cat_meta = OBJ_CATEGORIES[cat][reg]
+                if graspable is True and cat_meta.graspable is not True:
+                    invalid = True
+                if washable is True and cat_meta.washable is not True:
+                    invalid = True
+                if microwavable is True and cat_meta.microwavable is not True:
+                    invalid = True
+                if cookable is True and cat_meta.cookable is not True:
+                    invalid = True
+                if freezable is True and cat_meta.freezable is not True:
+                    invalid = True
+
+            if invalid:
+                continue
+
+            valid_categories.append(cat)
+
+    return valid_categories
+
+
+def get_registry_choices(cat, obj_registries=("objaverse",), split=None):
+    """
+    Returns the candidate models of category @cat for each registry, after applying @split
+
+    Returns:
+        dict: maps each registry to a list of mjcf paths
+    """
+    choices = {reg: [] for reg in obj_registries}
+
+    for reg in obj_registries:
+        if reg not in OBJ_CATEGORIES[cat]:
+            choices[reg] = []
+            continue
+        reg_choices = deepcopy(OBJ_CATEGORIES[cat][reg].mjcf_paths)
+
+        # exclude out objects based on split
+        if split is not None:
+            split_th = max(len(choices) - 3, int(math.ceil(len(reg_choices) / 2)))
+            if split == "A":
+                reg_choices = reg_choices[:split_th]
+            elif split == "B":
+                reg_choices = reg_choices[split_th:]
+            else:
+                raise ValueError
+        choices[reg] = reg_choices
+
+    return choices
+
+
+def get_sample_info(cat, groups, split, mjcf_path):
+    """
+    Returns the info dictionary describing a sampled object
+    """
+    groups_containing_sampled_obj = []
+    for group, group_cats in OBJ_GROUPS.items():
+        if cat in group_cats:
+            groups_containing_sampled_obj.append(group)
+
+    return {
+        "groups_containing_sampled_obj": groups_containing_sampled_obj,
+        "groups": groups,
+        "cat": cat,
+        "split": split,
+        "mjcf_path": mjcf_path,
+    }
+
+
 def sample_kitchen_object_helper(
     groups,
     exclude_groups=None,
@@ -329,75 +737,20 @@ def sample_kitchen_object_helper(
         if not isinstance(groups, tuple) and not isinstance(groups, list):
             groups = [groups]
 
-        if exclude_groups is None:
-            exclude_groups = []
-        if not isinstance(exclude_groups, tuple) and not isinstance(
-            exclude_groups, list
-        ):
-            exclude_groups = [exclude_groups]
-
-        invalid_categories = []
-        for g in exclude_groups:
-            for cat in OBJ_GROUPS[g]:
-                invalid_categories.append(cat)
-
-        valid_categories = []
-        for g in groups:
-            for cat in OBJ_GROUPS[g]:
-                # don't repeat if already added
-                if cat in valid_categories:
-                    continue
-                if cat in invalid_categories:
-                    continue
-
-                # don't include if category not represented in any registry
-                cat_in_any_reg = np.any(
-                    [reg in OBJ_CATEGORIES[cat] for reg in obj_registries]
-                )
-                if not cat_in_any_reg:
-                    continue
-
-                invalid = False
-                for reg in obj_registries:
-                    if reg not in OBJ_CATEGORIES[cat]:
-                        continue
-                    cat_meta = OBJ_CATEGORIES[cat][reg]
-                    if graspable is True and cat_meta.graspable is not True:
-                        invalid = True
-                    if washable is True and cat_meta.washable is not True:
-                        invalid = True
-                    if microwavable is True and cat_meta.microwavable is not True:
-                        invalid = True
-                    if cookable is True and cat_meta.cookable is not True:
-                        invalid = True
-                    if freezable is True and cat_meta.freezable is not True:
-                        invalid = True
-
-                if invalid:
-                    continue
-
-                valid_categories.append(cat)
+        valid_categories = get_valid_categories(
+            groups,
+            exclude_groups=exclude_groups,
+            graspable=graspable,
+            washable=washable,
+            microwavable=microwavable,
+            cookable=cookable,
+            freezable=freezable,
+            obj_registries=obj_registries,
+        )
 
         cat = rng.choice(valid_categories)
 
-        choices = {reg: [] for reg in obj_registries}
-
-        for reg in obj_registries:
-            if reg not in OBJ_CATEGORIES[cat]:
-                choices[reg] = []
-                continue
-            reg_choices = deepcopy(OBJ_CATEGORIES[cat][reg].mjcf_paths)
-
-            # exclude out objects based on split
-            if split is not None:
-                split_th = max(len(choices) - 3, int(math.ceil(len(reg_choices) / 2)))
-                if split == "A":
-                    reg_choices = reg_choices[:split_th]
-                elif split == "B":
-                    reg_choices = reg_choices[split_th:]
-                else:
-                    raise ValueError
-            choices[reg] = reg_choices
+        choices = get_registry_choices(cat, obj_registries=obj_registries, split=split)
 
         chosen_reg = rng.choice(
             obj_registries,
@@ -412,17 +765,6 @@ def sample_kitchen_object_helper(
     if object_scale is not None:
         mjcf_kwargs["scale"] *= object_scale
 
-    groups_containing_sampled_obj = []
-    for group, group_cats in OBJ_GROUPS.items():
-        if cat in group_cats:
-            groups_containing_sampled_obj.append(group)
-
-    info = {
-        "groups_containing_sampled_obj": groups_containing_sampled_obj,
-        "groups": groups,
-        "cat": cat,
-        "split": split,
-        "mjcf_path": mjcf_path,
-    }
+    info = get_sample_info(cat, groups=groups, split=split, mjcf_path=mjcf_path)
 
     return mjcf_kwargs, info
@@ -1,15 +1,208 @@
 import os
-import time
 import xml.etree.ElementTree as ET
+from copy import deepcopy
 
 import numpy as np
 import robosuite
 import robosuite.utils.transform_utils as T
 from robosuite.models.objects import MujocoXMLObject
+from robosuite.models.objects.objects import GEOM_GROUPS
 from robosuite.utils.mjcf_utils import array_to_string, string_to_array
 
+from robocasa.utils.template_cache import load_xml_template
+from robocasa.utils.transform_utils import quat2mat_batch
 
-class MJCFObject(MujocoXMLObject):
+
+class CachedMujocoXMLObject(MujocoXMLObject):
+    """
+    MujocoXMLObject that is built from an in-memory element tree instead of parsing @fname from disk.
+    By default the tree is a copy of the process-wide cached template for @fname (see
+    robocasa.utils.template_cache), so each xml file is only parsed once per process.
+
+    Geometry derived from the model's sites (e.g. the bounding box) is cached in the object frame and invalidated
+    whenever the model is rescaled (see _invalidate_geometry).
+
+    Args:
+        fname (str): XML File path. Used as the cache key and to resolve relative asset paths
+
+        name (str): Name of this object
+
+        joints (None or str or list of dict): joints to create for this object (see MujocoXMLObject)
+
+        obj_type (str): Geom elements to generate / extract for this object (see MujocoXMLObject)
+
+        duplicate_collision_geoms (bool): If set, will guarantee that each collision geom has a
+            visual geom copy
+
+        scale (float or list of floats): 3D scale factor
+
+        root (ET.Element): if specified, the object is built from this element tree (which is modified in place)
+            instead of the cached template for @fname
+    """
+
+    def __init__(
+        self,
+        fname,
+        name,
+        joints="default",
+        obj_type="all",
+        duplicate_collision_geoms=True,
+        scale=None,
+        root=None,
+    ):
+        self._geometry_cache = {}
+
+        # mirrors MujocoXML.__init__, with the parsed tree coming from memory
+        if root is None:
+            root = load_xml_template(fname)
+        self.file = fname
+        self.folder = os.path.dirname(fname)
+        self.tree = ET.ElementTree(root)
+        self.root = root
+        self.worldbody = self.create_default_element("worldbody")
+        self.actuator = self.create_default_element("actuator")
+        self.sensor = self.create_default_element("sensor")
+        self.asset = self.create_default_element("asset")
+        self.tendon = self.create_default_element("tendon")
+        self.equality = self.create_default_element("equality")
+        self.contact = self.create_default_element("contact")
+
+        # parse any default classes and replace them inline
+        default = self.create_default_element("default")
+        default_classes = self._get_default_classes(default)
+        self._replace_defaults_inline(default_dic=default_classes)
+        self.root.remove(default)
+
+        self.resolve_asset_dependency()
+
+        # mirrors MujocoXMLObject.__init__
+        assert (
+            obj_type in GEOM_GROUPS
+        ), "object type must be one in {}, got: {} instead.".format(
+            GEOM_GROUPS, obj_type
+        )
+        self.obj_type = obj_type
+        self.duplicate_collision_geoms = duplicate_collision_geoms
+        self._name = name
+        self._scale = scale
+
+        if joints == "default":
+            self.joint_specs = [self.get_joint_attrib_template()]
+        elif joints is None:
+            self.joint_specs = []
+        else:
+            self.joint_specs = joints
+
+        # make sure all joints have names
+        for i, joint_spec in enumerate(self.joint_specs):
+            if "name" not in joint_spec:
+                joint_spec["name"] = "joint{}".format(i)
+
+        self._obj = self._get_object_subtree()
+
+        if self._scale is not None:
+            self.set_scale(self._scale)
+
+        self._get_object_properties()
+
+    def set_scale(self, scale, obj=None):
+        """
+        Scales each geom, mesh, site, and body, and invalidates the cached geometry
+
+        Args:
+            scale (float or list of floats): Scale factor (1 or 3 dims)
+            obj (ET.Element) Root object to apply. Defaults to root object of model
+        """
+        super().set_scale(scale, obj=obj)
+        self._invalidate_geometry()
+
+    def _invalidate_geometry(self):
+        """
+        Clears the cached geometry. Must be called whenever sites that the geometry is derived from are modified
+        """
+        self._geometry_cache = {}
+
+    def _get_cached_geometry(self, key, fn):
+        """
+        Returns the cached geometry value for @key, computing it with @fn if it is not cached yet
+        """
+        if key not in self._geometry_cache:
+            self._geometry_cache[key] = fn()
+        return self._geometry_cache[key]
+
+    @property
+    def bbox_offsets(self):
+        """
+        Returns:
+            np.array: (8, 3) bounding box points in the object frame, ordered as in get_bbox_points. Read-only
+        """
+
+        def compute():
+            offsets = np.array(self._get_bbox_offsets(), dtype=float)
+            offsets.flags.writeable = False
+            return offsets
+
+        return self._get_cached_geometry("bbox_offsets", compute)
+
+    def _get_site_pos(self, site_name):
+        """
+        Returns the (cached) position of the site with name @site_name (without naming prefix)
+        """
+
+        def compute():
+            site = self.worldbody.find(
+                "./body/site[@name='{}{}']".format(self.naming_prefix, site_name)
+            )
+            return string_to_array(site.get("pos"))
+
+        return self._get_cached_geometry("site_" + site_name, compute)
+
+    def _get_bbox_offsets(self):
+        """
+        Computes the 8 bounding box points in the object frame from the bottom, top, and horizontal radius sites
+        of the object
+        """
+        bottom_offset = self._get_site_pos("bottom_site")
+        top_offset = self._get_site_pos("top_site")
+        horiz_radius = self._get_site_pos("horizontal_radius_site")[:2]
+
+        center = np.mean([bottom_offset, top_offset], axis=0)
+        half_size = [horiz_radius[0], horiz_radius[1], top_offset[2] - center[2]]
+
+        bbox_offsets = [
+            center + half_size * np.array([-1, -1, -1]),  # p0
+            center + half_size * np.array([1, -1, -1]),  # px
+            center + half_size * np.array([-1, 1, -1]),  # py
+            center + half_size * np.array([-1, -1, 1]),  # pz
+            center + half_size * np.array([1, 1, 1]),
+            center + half_size * np.array([-1, 1, 1]),
+            center + half_size * np.array([1, -1, 1]),
+            center + half_size * np.array([1, 1, -1]),
+        ]
+        return bbox_offsets
+
+    def transform_bbox_points(self, pos, quat):
+        """
+        Vectorized version of get_bbox_points that computes the bounding box points for many poses at once
+
+        Args:
+            pos (np.array): (N, 3) positions
+
+            quat (np.array): (N, 4) orientations in (x,y,z,w) form
+
+        Returns:
+            np.array: (N, 8, 3) bounding box points
+        """
+        pos = np.asarray(pos, dtype=float).reshape(-1, 3)
+        mats = quat2mat_batch(np.asarray(quat, dtype=float).reshape(-1, 4))
+        return np.einsum("nij,pj->npi", mats, self.bbox_offsets) + pos[:, None]
+
+
+# post-processed MJCFObject xml trees, keyed by absolute mjcf path
+_PROCESSED_MJCF_TREES = {}
+
+
+class MJCFObject(CachedMujocoXMLObject):
     """
     Blender object with support for changing the scaling
     """
@@ -47,47 +240,45 @@ class MJCFObject(MujocoXMLObject):
 
         self.rgba = rgba
 
-        # read default xml
-        xml_path = mjcf_path
-        folder = os.path.dirname(xml_path)
-        tree = ET.parse(xml_path)
-        root = tree.getroot()
-
-        # write modified xml (and make sure to postprocess any paths just in case)
-        xml_str = ET.tostring(root, encoding="utf8").decode("utf8")
-        xml_str = self.postprocess_model_xml(xml_str)
-        time_str = str(time.time()).replace(".", "_")
-        new_xml_path = os.path.join(folder, "{}_{}.xml".format(time_str, os.getpid()))
-        f = open(new_xml_path, "w")
-        f.write(xml_str)
-        f.close()
-
-        # initialize object with new xml we wrote
+        # initialize object directly from the (cached) post-processed xml tree
         super().__init__(
-            fname=new_xml_path,
+            fname=mjcf_path,
             name=name,
             joints=[dict(type="free", damping="0.0005")],
             obj_type="all",
             duplicate_collision_geoms=False,
             scale=scale,
+            root=self._load_processed_tree(mjcf_path),
         )
 
-        # clean up xml - we don't need it anymore
-        if os.path.exists(new_xml_path):
-            os.remove(new_xml_path)
+    def _load_processed_tree(self, mjcf_path):
+        """
+        Returns a copy of the post-processed xml tree of @mjcf_path. The file is parsed and post-processed
+        only once per process.
+        """
+        key = os.path.abspath(mjcf_path)
+        if key not in _PROCESSED_MJCF_TREES:
+            _PROCESSED_MJCF_TREES[key] = self.postprocess_model_tree(
+                ET.parse(key).getroot()
+            )
+        return deepcopy(_PROCESSED_MJCF_TREES[key])
 
     def postprocess_model_xml(self, xml_str):
         """
         New version of postprocess model xml that only replaces robosuite file paths if necessary (otherwise
         there is an error with the "max" operation)
         """
+        root = self.postprocess_model_tree(ET.fromstring(xml_str))
+        return ET.tostring(root, encoding="utf8").decode("utf8")
 
+    def postprocess_model_tree(self, root):
+        """
+        Same as postprocess_model_xml, but modifies and returns the element tree @root in place
+        """
         path = os.path.split(robosuite.__file__)[0]
         path_split = path.split("/")
 
         # replace mesh and texture file paths
-        tree = ET.fromstring(xml_str)
-        root = tree
         asset = root.find("asset")
         meshes = asset.findall("mesh")
         textures = asset.findall("texture")
@@ -109,7 +300,7 @@ class MJCFObject(MujocoXMLObject):
                 new_path = "/".join(new_path_split)
                 elem.set("file", new_path)
 
-        return ET.tostring(root, encoding="utf8").decode("utf8")
+        return root
 
     def _get_geoms(self, root, _parent=None):
         """
@@ -145,12 +336,17 @@ class MJCFObject(MujocoXMLObject):
 
         return geom_pairs
 
+    @property
+    def bottom_offset(self):
+        return np.array(self._get_site_pos("bottom_site"))
+
+    @property
+    def top_offset(self):
+        return np.array(self._get_site_pos("top_site"))
+
     @property
     def horizontal_radius(self):
-        horizontal_radius_site = self.worldbody.find(
-            "./body/site[@name='{}horizontal_radius_site']".format(self.naming_prefix)
-        )
-        site_values = string_to_array(horizontal_radius_site.get("pos"))
+        site_values = self._get_site_pos("horizontal_radius_site")
         return np.linalg.norm(site_values[0:2])
 
     def get_bbox_points(self, trans=None, rot=None):
@@ -158,29 +354,6 @@ class MJCFObject(MujocoXMLObject):
         Get the full 8 bounding box points of the object
         rot: a rotation matrix
         """
-        bbox_offsets = []
-
-        bottom_offset = self.bottom_offset
-        top_offset = self.top_offset
-        horizontal_radius_site = self.worldbody.find(
-            "./body/site[@name='{}horizontal_radius_site']".format(self.naming_prefix)
-        )
-        horiz_radius = string_to_array(horizontal_radius_site.get("pos"))[:2]
-
-        center = np.mean([bottom_offset, top_offset], axis=0)
-        half_size = [horiz_radius[0], horiz_radius[1], top_offset[2] - center[2]]
-
-        bbox_offsets = [
-            center + half_size * np.array([-1, -1, -1]),  # p0
-            center + half_size * np.array([1, -1, -1]),  # px
-            center + half_size * np.array([-1, 1, -1]),  # py
-            center + half_size * np.array([-1, -1, 1]),  # pz
-            center + half_size * np.array([1, 1, 1]),
-            center + half_size * np.array([-1, 1, 1]),
-            center + half_size * np.array([1, -1, 1]),
-            center + half_size * np.array([1, 1, -1]),
-        ]
-
         if trans is None:
             trans = np.array([0, 0, 0])
         if rot is not None:
@@ -188,5 +361,4 @@ class MJCFObject(MujocoXMLObject):
         else:
             rot = np.eye(3)
 
-        points = [(np.matmul(rot, p) + trans) for p in bbox_offsets]
-        return points
+        return list(np.matmul(self.bbox_offsets, rot.T) + trans)
@@ -6,6 +6,7 @@ from robosuite.utils.mjcf_utils import string_to_array as s2a
 from robocasa.models.scenes.scene_registry import get_layout_path, get_style_path
 from robocasa.models.scenes.scene_utils import *
 from robocasa.models.fixtures import *
+from robocasa.utils.template_cache import load_yaml_template
 
 # fixture string to class
 FIXTURES = dict(
@@ -113,12 +114,10 @@ def create_fixtures(layout_id, style_id, rng=None):
     style_path = get_style_path(style_id=style_id)
 
     # load style
-    with open(style_path, "r") as f:
-        style = yaml.safe_load(f)
+    style = load_yaml_template(style_path)
 
     # load arena
-    with open(layout_path, "r") as f:
-        arena_config = yaml.safe_load(f)
+    arena_config = load_yaml_template(layout_path)
 
     # contains all fixtures with updated configs
     arena = list()
@@ -4,6 +4,7 @@ import yaml
 from robosuite.utils.mjcf_utils import xml_path_completion
 
 import robocasa
+from robocasa.utils.template_cache import load_yaml_template
 
 # second keyword corresponds to positive end of axis
 AXES_KEYWORDS = {0: ["left", "right"], 1: ["front", "back"], 2: ["bottom", "top"]}
@@ -98,8 +99,7 @@ def load_style_config(style, fixture_config):
         f"fixtures/fixture_registry/{fixture_type}.yaml",
         root=robocasa.models.assets_root,
     )
-    with open(yaml_path, "r") as f:
-        default_configs = yaml.safe_load(f)
+    default_configs = load_yaml_template(yaml_path)
 
     # find which configuration to use
     if type(fixture_style) == dict and "config_name" not in fixture_config:
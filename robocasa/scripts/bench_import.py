@@ -0,0 +1,96 @@
+"""
+A script to benchmark the startup cost of robocasa.
+Measures the time of `import robocasa` (and optionally of importing a single environment) in fresh
+interpreters, and reports which heavy optional dependencies were pulled in along the way.
+
+Example:
+    python robocasa/scripts/bench_import.py --n 5 --env PnPCounterToCab
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+import numpy as np
+from termcolor import colored
+
+# optional dependencies that should not be imported by `import robocasa`
+HEAVY_MODULES = ["matplotlib", "cv2", "PIL", "scipy", "yaml", "loguru"]
+
+BENCH_CODE = """
+import json, sys, time
+t_start = time.perf_counter()
+import robocasa
+import_time = time.perf_counter() - t_start
+heavy_modules = [m for m in {heavy_modules} if m in sys.modules]
+env_time = None
+if {env!r} is not None:
+    t_start = time.perf_counter()
+    robocasa.load_kitchen_env({env!r})
+    env_time = time.perf_counter() - t_start
+print(json.dumps(dict(import_time=import_time, env_time=env_time, heavy_modules=heavy_modules)))
+"""
+
+
+def run_trial(env=None):
+    """
+    Imports robocasa in a fresh interpreter and returns the measured times
+
+    Args:
+        env (str): if specified, also measures the time to import this environment
+
+    Returns:
+        dict: import time, environment import time, and heavy modules that were imported by `import robocasa`
+    """
+    code = BENCH_CODE.format(heavy_modules=HEAVY_MODULES, env=env)
+    out = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+    # the result is the last line, anything before that is printed by the imports themselves
+    return json.loads(out.strip().split("\n")[-1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=5, help="number of trials")
+    parser.add_argument(
+        "--env",
+        type=str,
+        default=None,
+        help="(optional) also time the first import of this environment",
+    )
+    args = parser.parse_args()
+
+    results = [run_trial(env=args.env) for _ in range(args.n)]
+
+    import_times = np.array([r["import_time"] for r in results])
+    print(
+        colored(
+            "import robocasa: {:.3f}s mean, {:.3f}s min over {} trials".format(
+                np.mean(import_times), np.min(import_times), args.n
+            ),
+            "green",
+        )
+    )
+    if args.env is not None:
+        env_times = np.array([r["env_time"] for r in results])
+        print(
+            colored(
+                "import {}: {:.3f}s mean, {:.3f}s min".format(
+                    args.env, np.mean(env_times), np.min(env_times)
+                ),
+                "green",
+            )
+        )
+
+    heavy_modules = results[0]["heavy_modules"]
+    if len(heavy_modules) > 0:
+        print(
+            colored(
+                "heavy modules imported by robocasa: {}".format(
+                    ", ".join(heavy_modules)
+                ),
+                "yellow",
+            )
+        )
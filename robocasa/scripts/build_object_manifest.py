@@ -0,0 +1,41 @@
+"""
+Regenerates the object asset manifest. The manifest lists every object model.xml along with its size, so that
+object categories can be resolved and objects can be sampled without walking the asset folders or parsing the
+models at runtime. Re-run this script whenever object assets are added, removed, or modified.
+
+Example:
+    python robocasa/scripts/build_object_manifest.py
+    python robocasa/scripts/build_object_manifest.py --output /path/to/object_manifest.json
+"""
+
+import argparse
+import time
+
+from termcolor import colored
+
+from robocasa.models.objects.kitchen_object_utils import (
+    BASE_ASSET_ZOO_PATH,
+    OBJECT_MANIFEST_PATH,
+    build_object_manifest,
+)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=OBJECT_MANIFEST_PATH,
+        help="path to write the manifest to. Point ROBOCASA_OBJECT_MANIFEST to it if not using the default location",
+    )
+    args = parser.parse_args()
+
+    t_start = time.time()
+    objects = build_object_manifest(manifest_path=args.output)
+    print(
+        colored(
+            "Wrote {} objects from {} to {} in {:.2f}s".format(
+                len(objects), BASE_ASSET_ZOO_PATH, args.output, time.time() - t_start
+            ),
+            "green",
+        )
+    )
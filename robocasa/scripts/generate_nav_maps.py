@@ -0,0 +1,127 @@
+"""
+A script to precompute navigation maps (floor occupancy grid, candidate robot base poses and reachable
+fixtures) for every (layout, style) of the kitchen scenes. Environments created with nav_map_dir=<dir>
+look up robot base poses in these maps and skip layouts and styles that are infeasible for their task.
+
+Example:
+    python robocasa/scripts/generate_nav_maps.py --output /tmp/nav_maps --layout 0 1 2
+"""
+
+import argparse
+import os
+import time
+
+from termcolor import colored
+
+
+def generate_nav_maps(
+    env_name, robots, output_dir, layout_ids, style_ids, resolution, robot_radius, reach
+):
+    """
+    Builds and saves the navigation map of every (layout, style) pair
+
+    Args:
+        env_name (str): name of the environment used to build the scenes
+
+        robots (str or list of str): robot(s) to use in the environment
+
+        output_dir (str): directory to save the maps to
+
+        layout_ids (list of int): layouts to build maps for
+
+        style_ids (list of int): styles to build maps for
+
+        resolution (float): size of a grid cell, in meters
+
+        robot_radius (float): radius of the robot base footprint, in meters
+
+        reach (float): maximum distance from the robot base to a reachable fixture, in meters
+
+    Returns:
+        list: paths of the saved maps
+    """
+    import robosuite
+
+    import robocasa
+    from robocasa.utils.nav_map import build_navigation_map, get_nav_map_path
+
+    env = robosuite.make(
+        env_name=env_name,
+        robots=robots,
+        has_renderer=False,
+        has_offscreen_renderer=False,
+        use_camera_obs=False,
+        ignore_done=True,
+        layout_ids=layout_ids,
+        style_ids=style_ids,
+    )
+    os.makedirs(output_dir, exist_ok=True)
+
+    paths = []
+    layout_and_style_ids = list(env.layout_and_style_ids)
+    for (layout_id, style_id) in layout_and_style_ids:
+        # restrict sampling to the current layout and style
+        env.layout_and_style_ids = [(layout_id, style_id)]
+        env.reset()
+        nav_map = build_navigation_map(
+            env, resolution=resolution, robot_radius=robot_radius, reach=reach
+        )
+        path = get_nav_map_path(output_dir, layout_id, style_id)
+        nav_map.save(path)
+        paths.append(path)
+        print(
+            "layout {}, style {}: {} static fixtures, {} with a feasible base pose".format(
+                layout_id,
+                style_id,
+                len(nav_map.fixture_names),
+                int(nav_map.base_feasible.sum()),
+            )
+        )
+    env.close()
+    return paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--env",
+        type=str,
+        default="PnPCounterToCab",
+        help="environment used to build the scenes",
+    )
+    parser.add_argument(
+        "--robots",
+        nargs="+",
+        type=str,
+        default="PandaMobile",
+        help="Which robot(s) to use in the env",
+    )
+    parser.add_argument("--layout", type=int, nargs="+", default=None)
+    parser.add_argument("--style", type=int, nargs="+", default=None)
+    parser.add_argument("--resolution", type=float, default=0.05)
+    parser.add_argument("--robot_radius", type=float, default=0.4)
+    parser.add_argument("--reach", type=float, default=1.0)
+    parser.add_argument(
+        "--output", type=str, required=True, help="directory to save the maps to"
+    )
+    args = parser.parse_args()
+
+    t_start = time.time()
+    paths = generate_nav_maps(
+        env_name=args.env,
+        robots=args.robots,
+        output_dir=args.output,
+        layout_ids=args.layout,
+        style_ids=args.style,
+        resolution=args.resolution,
+        robot_radius=args.robot_radius,
+        reach=args.reach,
+    )
+    print(
+        colored(
+            "Wrote {} navigation maps to {} in {:.2f}s".format(
+                len(paths), args.output, time.time() - t_start
+            ),
+            "green",
+        )
+    )
@@ -0,0 +1,119 @@
+"""
+A script to generate a scene bank: a set of valid, settled kitchen scenes that environments can draw episodes from
+(by passing scene_bank=<path> to the environment) instead of sampling fixtures, objects and placements online.
+Scenes are generated in parallel worker processes, each with its own seed.
+
+Example:
+    python robocasa/scripts/generate_scene_bank.py --env PnPCounterToCab --n 1000 --num_workers 8 \
+        --output /tmp/PnPCounterToCab_scenes.hdf5
+"""
+
+import argparse
+import multiprocessing
+import time
+
+from termcolor import colored
+
+
+def generate_scenes(env_name, robots, n, seed, layout_ids=None, style_ids=None):
+    """
+    Generates @n scene bank entries by repeatedly hard resetting a freshly created environment
+
+    Args:
+        env_name (str): name of the environment
+
+        robots (str or list of str): robot(s) to use in the environment
+
+        n (int): number of scenes to generate
+
+        seed (int): seed of the environment
+
+        layout_ids (int or list of int): if specified, only use these layouts
+
+        style_ids (int or list of int): if specified, only use these styles
+
+    Returns:
+        list: scene bank entries (see Kitchen.get_scene_bank_entry)
+    """
+    import robosuite
+
+    import robocasa
+
+    env = robosuite.make(
+        env_name=env_name,
+        robots=robots,
+        has_renderer=False,
+        has_offscreen_renderer=False,
+        use_camera_obs=False,
+        ignore_done=True,
+        layout_ids=layout_ids,
+        style_ids=style_ids,
+        seed=seed,
+    )
+    entries = []
+    for _ in range(n):
+        env.reset()
+        entries.append(env.get_scene_bank_entry())
+    env.close()
+    return entries
+
+
+def _generate_scenes_worker(kwargs):
+    return generate_scenes(**kwargs)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--env", type=str, required=True, help="environment name")
+    parser.add_argument(
+        "--robots",
+        nargs="+",
+        type=str,
+        default="PandaMobile",
+        help="Which robot(s) to use in the env",
+    )
+    parser.add_argument("--n", type=int, default=100, help="number of scenes")
+    parser.add_argument(
+        "--num_workers", type=int, default=1, help="number of worker processes"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="base seed")
+    parser.add_argument("--layout", type=int, nargs="+", default=None)
+    parser.add_argument("--style", type=int, nargs="+", default=None)
+    parser.add_argument(
+        "--output", type=str, required=True, help="path to the output hdf5 file"
+    )
+    args = parser.parse_args()
+
+    from robocasa.utils.scene_bank import save_scene_bank
+
+    # split scenes evenly across workers, each worker gets a different seed
+    num_workers = max(1, min(args.num_workers, args.n))
+    worker_kwargs = [
+        dict(
+            env_name=args.env,
+            robots=args.robots,
+            n=args.n // num_workers + int(i < args.n % num_workers),
+            seed=args.seed + i,
+            layout_ids=args.layout,
+            style_ids=args.style,
+        )
+        for i in range(num_workers)
+    ]
+
+    t_start = time.time()
+    if num_workers == 1:
+        results = [_generate_scenes_worker(worker_kwargs[0])]
+    else:
+        with multiprocessing.get_context("spawn").Pool(num_workers) as pool:
+            results = pool.map(_generate_scenes_worker, worker_kwargs)
+    entries = [entry for worker_entries in results for entry in worker_entries]
+
+    save_scene_bank(args.output, entries, env_name=args.env)
+    print(
+        colored(
+            "Wrote {} scenes of {} to {} in {:.2f}s".format(
+                len(entries), args.env, args.output, time.time() - t_start
+            ),
+            "green",
+        )
+    )
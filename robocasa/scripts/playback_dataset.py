@@ -106,12 +106,22 @@ def playback_trajectory_with_env(
         # video render
         if write_video:
             if video_count % video_skip == 0:
-                video_img = []
-                for cam_name in camera_names:
-                    im = env.sim.render(height=512, width=512, camera_name=cam_name)[
-                        ::-1
-                    ]
-                    video_img.append(im)
+                if hasattr(env, "render_multimodal"):
+                    rendered = env.render_multimodal(
+                        camera_names,
+                        width=512,
+                        height=512,
+                        depth=False,
+                        segmentation=False,
+                    )
+                    video_img = [im[::-1] for im in rendered.rgb]
+                else:
+                    video_img = []
+                    for cam_name in camera_names:
+                        im = env.sim.render(
+                            height=512, width=512, camera_name=cam_name
+                        )[::-1]
+                        video_img.append(im)
                 video_img = np.concatenate(
                     video_img, axis=1
                 )  # concatenate horizontally
@@ -0,0 +1,111 @@
+"""
+Vectorized camera pose randomization. Noise is sampled for all randomized cameras at once, applied to
+camera configs (see camera_utils.CAM_CONFIGS) and written directly to the cameras of a compiled model,
+so that randomizing cameras never requires rebuilding or recompiling the model.
+"""
+from copy import deepcopy
+
+import numpy as np
+from scipy.spatial.transform import Rotation
+
+
+def get_randomized_cameras(cam_configs):
+    """
+    Returns:
+        list: names of the cameras in @cam_configs that are randomized (agentview cameras)
+    """
+    return [cam_name for cam_name in cam_configs if "agentview" in cam_name]
+
+
+def sample_camera_noise(
+    rng, cam_names, pos_scale=0.05, euler_scale=3.0, fovy_scale=0.0
+):
+    """
+    Samples gaussian pose (and optionally field of view) noise for a set of cameras in a single draw
+
+    Args:
+        rng (np.random.Generator): random number generator
+
+        cam_names (list): names of the cameras to sample noise for
+
+        pos_scale (float): standard deviation of the position noise, in meters
+
+        euler_scale (float): standard deviation of the rotation noise, in degrees per euler angle
+
+        fovy_scale (float): standard deviation of the vertical field of view noise, in degrees.
+            No fovy noise is sampled if 0
+
+    Returns:
+        dict: per camera dict with pos, euler and fovy noise
+    """
+    n = len(cam_names)
+    # pos and euler noise are interleaved per camera
+    noise = rng.normal(size=(n, 2, 3)) * np.array([[pos_scale], [euler_scale]])
+    fovy_noise = rng.normal(scale=fovy_scale, size=n) if fovy_scale > 0 else np.zeros(n)
+    return {
+        cam_name: dict(
+            pos=noise[i, 0].tolist(),
+            euler=noise[i, 1].tolist(),
+            fovy=float(fovy_noise[i]),
+        )
+        for (i, cam_name) in enumerate(cam_names)
+    }
+
+
+def apply_camera_noise(cam_configs, cam_noise):
+    """
+    Applies camera noise to camera configs
+
+    Args:
+        cam_configs (dict): camera configs to perturb
+
+        cam_noise (dict): per camera noise (see sample_camera_noise)
+
+    Returns:
+        dict: new camera configs with the noise applied
+    """
+    cam_configs = deepcopy(cam_configs)
+    cam_names = [cam_name for cam_name in cam_noise if cam_name in cam_configs]
+    if len(cam_names) == 0:
+        return cam_configs
+
+    pos = np.array([cam_configs[c]["pos"] for c in cam_names], dtype=float)
+    quat = np.array([cam_configs[c]["quat"] for c in cam_names], dtype=float)
+    pos_noise = np.array([cam_noise[c]["pos"] for c in cam_names])
+    euler_noise = np.array([cam_noise[c]["euler"] for c in cam_names])
+
+    new_pos = pos + pos_noise
+    euler = Rotation.from_quat(quat).as_euler("xyz", degrees=True)
+    new_quat = Rotation.from_euler("xyz", euler + euler_noise, degrees=True).as_quat()
+
+    for (i, cam_name) in enumerate(cam_names):
+        cam_cfg = cam_configs[cam_name]
+        cam_cfg["pos"] = new_pos[i].tolist()
+        cam_cfg["quat"] = new_quat[i].tolist()
+        fovy_noise = cam_noise[cam_name].get("fovy", 0.0)
+        fovy = cam_cfg.get("camera_attribs", {}).get("fovy", None)
+        if fovy_noise != 0.0 and fovy is not None:
+            cam_cfg["camera_attribs"]["fovy"] = str(float(fovy) + fovy_noise)
+    return cam_configs
+
+
+def write_cameras_to_model(model, cam_configs):
+    """
+    Writes the positions, orientations and fields of view in @cam_configs to the cameras of a compiled model
+
+    Args:
+        model (MjModel): compiled model, modified in place
+
+        cam_configs (dict): camera configs
+    """
+    cam_names = list(cam_configs.keys())
+    cam_ids = np.array([model.camera_name2id(c) for c in cam_names], dtype=int)
+    pos = np.array([cam_configs[c]["pos"] for c in cam_names], dtype=float)
+    quat = np.array([cam_configs[c]["quat"] for c in cam_names], dtype=float)
+    model.cam_pos[cam_ids] = pos
+    model.cam_quat[cam_ids] = quat / np.linalg.norm(quat, axis=1, keepdims=True)
+
+    for (cam_id, cam_name) in zip(cam_ids, cam_names):
+        fovy = cam_configs[cam_name].get("camera_attribs", {}).get("fovy", None)
+        if fovy is not None:
+            model.cam_fovy[cam_id] = float(fovy)
@@ -0,0 +1,240 @@
+"""
+Asynchronous capture of RGB-D / segmentation frames.
+
+Frames are copied into a fixed-size ring buffer on the simulation thread. Post-processing, image encoding
+and disk I/O then run in a small pool of background writer threads, so the control loop never waits on
+disk. When all slots of the ring buffer are in use, new frames are either dropped (and counted) or the
+caller blocks until a slot is freed, depending on the backpressure policy.
+"""
+import json
+import logging
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+def _to_serializable(value):
+    """
+    json fallback for capture metadata: numpy values become lists, everything else its string
+    """
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+class DirectorySink:
+    """
+    Writes captured frames to a directory. Images are stored in the rgb/, depth/ and seg/ subdirectories
+    and the metadata of each frame (camera pose, intrinsics, scene info) as camera_pose_<name>.json
+
+    Args:
+        root (str): directory to write to
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.rgb_path = os.path.join(root, "rgb")
+        self.depth_path = os.path.join(root, "depth")
+        self.seg_path = os.path.join(root, "seg")
+        for path in [self.rgb_path, self.depth_path, self.seg_path]:
+            os.makedirs(path, exist_ok=True)
+
+    def write(self, name, images, meta):
+        """
+        Encodes and writes one frame. Called from the writer threads
+
+        Args:
+            name (str): name of the frame, used in the file names
+
+            images (dict): rgb (H, W, 3) uint8, depth (H, W) float and seg (H, W, 4) uint8 RGBA images. Missing
+                images are skipped
+
+            meta (dict): json-serializable frame metadata (numpy arrays are stored as lists)
+        """
+        import matplotlib.image as mpimg
+        from PIL import Image
+
+        if images.get("rgb") is not None:
+            mpimg.imsave(
+                os.path.join(self.rgb_path, f"rgb_image_{name}.png"), images["rgb"]
+            )
+        if images.get("depth") is not None:
+            mpimg.imsave(
+                os.path.join(self.depth_path, f"depth_map_{name}.png"), images["depth"]
+            )
+        if images.get("seg") is not None:
+            Image.fromarray(images["seg"], mode="RGBA").save(
+                os.path.join(self.seg_path, f"filtered_seg_map_{name}.png")
+            )
+        if meta is not None:
+            with open(os.path.join(self.root, f"camera_pose_{name}.json"), "w") as f:
+                json.dump(meta, f, indent=4, default=_to_serializable)
+
+
+class FrameRingBuffer:
+    """
+    Fixed number of preallocated frame slots. Arrays are copied into free slots, so the simulation can keep
+    writing to its own buffers while frames wait to be written
+
+    Args:
+        size (int): number of slots
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._slots = [dict() for _ in range(size)]
+        self._free = queue.Queue()
+        for i in range(size):
+            self._free.put(i)
+
+    def acquire(self, block=False, timeout=None):
+        """
+        Returns:
+            int: index of a free slot, or None if there is none (and @block is False or @timeout expired)
+        """
+        try:
+            return self._free.get(block=block, timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def store(self, slot, arrays):
+        """
+        Copies @arrays (dict of name to array, None entries are skipped) into slot @slot
+
+        Returns:
+            dict: views of the copied arrays in the slot
+        """
+        buffers = self._slots[slot]
+        stored = {}
+        for (key, arr) in arrays.items():
+            if arr is None:
+                continue
+            arr = np.asarray(arr)
+            buf = buffers.get(key, None)
+            # buffers are only reallocated when the shape or type of the frames change
+            if buf is None or buf.shape != arr.shape or buf.dtype != arr.dtype:
+                buf = np.empty_like(arr)
+                buffers[key] = buf
+            np.copyto(buf, arr)
+            stored[key] = buf
+        return stored
+
+    def release(self, slot):
+        self._free.put(slot)
+
+    @property
+    def num_free(self):
+        return self._free.qsize()
+
+
+class AsyncFrameWriter:
+    """
+    Bounded background writer for captured frames
+
+    Args:
+        sink (DirectorySink): sink the frames are written to. Must have a write(name, images, meta) method
+
+        num_workers (int): number of writer threads
+
+        buffer_size (int): number of frames that can be in flight (copied but not written yet)
+
+        block (bool): backpressure policy when all slots are in use. If True, submit waits for a free slot,
+            otherwise the frame is dropped
+
+        process_fn (function): optional post-processing applied in the writer threads before writing. Takes
+            and returns (images, meta)
+    """
+
+    def __init__(
+        self, sink, num_workers=2, buffer_size=8, block=False, process_fn=None
+    ):
+        self.sink = sink
+        self.block = block
+        self.process_fn = process_fn
+        self._buffer = FrameRingBuffer(buffer_size)
+        self._executor = ThreadPoolExecutor(
+            max_workers=num_workers, thread_name_prefix="frame_writer"
+        )
+        self._lock = threading.Lock()
+        self._pending = set()
+        self.stats = dict(submitted=0, written=0, dropped=0, failed=0)
+
+    def submit(self, name, images, meta=None, process_fn=None):
+        """
+        Copies a frame into the ring buffer and queues it for writing
+
+        Args:
+            name (str): name of the frame
+
+            images (dict): images of the frame, copied before this function returns
+
+            meta (dict): frame metadata. Must not be modified by the caller afterwards
+
+            process_fn (function): post-processing for this frame, defaults to the writer's process_fn
+
+        Returns:
+            bool: True if the frame was queued, False if it was dropped
+        """
+        with self._lock:
+            self.stats["submitted"] += 1
+        slot = self._buffer.acquire(block=self.block)
+        if slot is None:
+            with self._lock:
+                self.stats["dropped"] += 1
+            return False
+
+        stored = self._buffer.store(slot, images)
+        if process_fn is None:
+            process_fn = self.process_fn
+        future = self._executor.submit(
+            self._write, slot, name, stored, meta, process_fn
+        )
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._on_done)
+        return True
+
+    def _write(self, slot, name, images, meta, process_fn):
+        try:
+            if process_fn is not None:
+                images, meta = process_fn(images, meta)
+            self.sink.write(name, images, meta)
+        except Exception as e:
+            logging.error(f"Error writing frame {name}: {e}")
+            with self._lock:
+                self.stats["failed"] += 1
+        else:
+            with self._lock:
+                self.stats["written"] += 1
+        finally:
+            self._buffer.release(slot)
+
+    def _on_done(self, future):
+        with self._lock:
+            self._pending.discard(future)
+
+    @property
+    def num_pending(self):
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self):
+        """
+        Waits until all queued frames have been written
+        """
+        with self._lock:
+            pending = list(self._pending)
+        for future in pending:
+            future.result()
+
+    def close(self):
+        """
+        Writes all queued frames and stops the writer threads
+        """
+        self.flush()
+        self._executor.shutdown(wait=True)
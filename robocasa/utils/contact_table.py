@@ -0,0 +1,177 @@
+"""
+Per-step contact table. The contact list of the sim is read once per step and reduced to the set of
+contacting owner (object, fixture or gripper) pairs, so that contact checks do not rescan the contact list
+and look up geom names for every query.
+"""
+import numpy as np
+
+
+class ContactTable:
+    """
+    Contact table of a sim. Refreshed lazily: the contacting geom pairs of the sim are compared with the ones
+    the table was built from, and the table is only rebuilt when they changed (or after invalidate is called).
+    States set without stepping (e.g. set_state followed by forward) are therefore picked up as well.
+
+    Args:
+        sim (MjSim): simulation
+
+        owners (list): models (objects, fixtures, grippers, robots) whose contacts are indexed. Each of them
+            must have a contact_geoms attribute
+    """
+
+    def __init__(self, sim, owners):
+        self.sim = sim
+        self.ngeom = sim.model.ngeom
+
+        # owner id of every geom, -1 for geoms that do not belong to any owner
+        self.geom_owner = np.full(self.ngeom, -1, dtype=int)
+        self._owners = []
+        self._owner_ids = {}
+        # owners sharing geoms with other owners can not be resolved from geom_owner
+        self._exclusive = []
+        for model in owners:
+            self._add_owner(model)
+
+        self._geom_masks = {}
+        self.invalidate()
+
+    def _add_owner(self, model):
+        if id(model) in self._owner_ids:
+            return
+        owner = len(self._owners)
+        geom_ids = self._get_geom_ids(model.contact_geoms)
+        claimed = self.geom_owner[geom_ids]
+        exclusive = True
+        for other in np.unique(claimed[claimed >= 0]):
+            self._exclusive[other] = False
+            exclusive = False
+        self.geom_owner[geom_ids[claimed < 0]] = owner
+
+        self._owners.append(model)
+        self._owner_ids[id(model)] = owner
+        self._exclusive.append(exclusive)
+
+    def _get_geom_ids(self, geom_names):
+        geom_ids = []
+        for name in geom_names:
+            try:
+                geom_ids.append(self.sim.model.geom_name2id(name))
+            except ValueError:
+                # geoms that are not part of the model are never in contact
+                continue
+        return np.array(geom_ids, dtype=int)
+
+    def _get_owner(self, geoms):
+        """
+        Returns:
+            int: owner id of @geoms if it is an indexed model that can be resolved from geom_owner, else None
+        """
+        owner = self._owner_ids.get(id(geoms), None)
+        if owner is None or not self._exclusive[owner]:
+            return None
+        return owner
+
+    def _get_geom_mask(self, geoms):
+        """
+        Returns:
+            np.array: boolean mask over all geoms of the model, True for the geoms in @geoms
+        """
+        if isinstance(geoms, str):
+            key = geoms
+        elif hasattr(geoms, "contact_geoms"):
+            key = id(geoms)
+        else:
+            key = tuple(geoms)
+
+        cached = self._geom_masks.get(key, None)
+        # models are cached by id, make sure the id was not reused by another model
+        if cached is not None and (not isinstance(key, int) or cached[0] is geoms):
+            return cached[1]
+
+        if isinstance(geoms, str):
+            geom_names = [geoms]
+        elif hasattr(geoms, "contact_geoms"):
+            geom_names = geoms.contact_geoms
+        else:
+            geom_names = geoms
+        mask = np.zeros(self.ngeom, dtype=bool)
+        mask[self._get_geom_ids(geom_names)] = True
+        self._geom_masks[key] = (geoms, mask)
+        return mask
+
+    def invalidate(self):
+        """
+        Forces the table to be rebuilt on the next query
+        """
+        self.geom1 = None
+        self.geom2 = None
+
+    def update(self):
+        """
+        Reads the contact list of the sim and rebuilds the table if the contacting geom pairs changed since the
+        last update
+        """
+        data = self.sim.data
+        ncon = data.ncon
+        contact = data.contact
+        geom1 = contact.geom1[:ncon]
+        geom2 = contact.geom2[:ncon]
+        if (
+            self.geom1 is not None
+            and np.array_equal(geom1, self.geom1)
+            and np.array_equal(geom2, self.geom2)
+        ):
+            return
+
+        self.geom1 = np.array(geom1, dtype=int)
+        self.geom2 = np.array(geom2, dtype=int)
+
+        # unowned geoms map to an extra owner id
+        n = len(self._owners)
+        owner1 = self.geom_owner[self.geom1]
+        owner2 = self.geom_owner[self.geom2]
+        owner1[owner1 < 0] = n
+        owner2[owner2 < 0] = n
+        self._pairs = set(
+            np.concatenate(
+                [owner1 * (n + 1) + owner2, owner2 * (n + 1) + owner1]
+            ).tolist()
+        )
+        self._touching = set(np.concatenate([owner1, owner2]).tolist())
+
+    def check_contact(self, geoms_1, geoms_2=None):
+        """
+        Same as MujocoEnv.check_contact: finds contact between two geom groups
+
+        Args:
+            geoms_1 (str or list of str or MujocoModel): an individual geom name or list of geom names or a model.
+                If a MujocoModel is specified, the geoms checked will be its contact_geoms
+
+            geoms_2 (str or list of str or MujocoModel or None): another individual geom name or list of geom names.
+                If a MujocoModel is specified, the geoms checked will be its contact_geoms. If None, will check
+                any collision with @geoms_1 to any other geom in the environment
+
+        Returns:
+            bool: True if any geom in @geoms_1 is in contact with any geom in @geoms_2
+        """
+        self.update()
+
+        owner_1 = self._get_owner(geoms_1)
+        if geoms_2 is None:
+            if owner_1 is not None:
+                return owner_1 in self._touching
+            mask_1 = self._get_geom_mask(geoms_1)
+            return bool(np.any(mask_1[self.geom1] | mask_1[self.geom2]))
+
+        owner_2 = self._get_owner(geoms_2)
+        if owner_1 is not None and owner_2 is not None:
+            return owner_1 * (len(self._owners) + 1) + owner_2 in self._pairs
+
+        mask_1 = self._get_geom_mask(geoms_1)
+        mask_2 = self._get_geom_mask(geoms_2)
+        return bool(
+            np.any(
+                (mask_1[self.geom1] & mask_2[self.geom2])
+                | (mask_1[self.geom2] & mask_2[self.geom1])
+            )
+        )
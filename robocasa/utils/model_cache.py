@@ -0,0 +1,157 @@
+"""
+Cache of compiled MuJoCo models for kitchen scenes.
+
+Compiling a full kitchen (fixtures, robot, objects) from XML is the dominant cost of a hard reset.
+Scenes are identified by a signature - a hash over everything that ends up in the compiled model
+(layout, style, fixture placements, robot base pose, object assets, cameras, textures). Episodes that
+share a signature only differ in state (object poses, joint values), which is applied after the sim
+is created, so the compiled model can be reused as-is.
+"""
+import copy
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+import mujoco
+import numpy as np
+
+
+def _to_serializable(value):
+    """
+    json fallback used for hashing: numpy values become (rounded) lists, everything else its string
+    """
+    if isinstance(value, np.ndarray):
+        return np.round(value, 6).tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def compute_scene_signature(signature_dict):
+    """
+    Hashes a (nested) dictionary describing a scene into a hex digest
+
+    Args:
+        signature_dict (dict): description of everything that is baked into the compiled model
+
+    Returns:
+        str: sha1 hex digest of the description
+    """
+    signature_str = json.dumps(signature_dict, sort_keys=True, default=_to_serializable)
+    return hashlib.sha1(signature_str.encode("utf8")).hexdigest()
+
+
+class CompiledModelCache:
+    """
+    LRU cache of compiled mujoco.MjModel instances keyed by scene signature, with an
+    optional on-disk layer that stores each model as an MJB binary.
+
+    Args:
+        cache_dir (str): if set, compiled models are also saved to / loaded from this directory
+
+        max_size (int): maximum number of models to keep in memory
+    """
+
+    def __init__(self, cache_dir=None, max_size=32):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self._models = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        if self.cache_dir is not None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _mjb_path(self, key):
+        return os.path.join(self.cache_dir, "{}.mjb".format(key))
+
+    def get(self, key):
+        """
+        Look up a compiled model. Returns a copy so that callers are free to modify the model
+        (e.g. runtime randomization) without corrupting the cached instance.
+
+        Args:
+            key (str): scene signature
+
+        Returns:
+            mujoco.MjModel or None: copy of the compiled model, or None on a cache miss
+        """
+        model = self._models.get(key, None)
+        if model is not None:
+            self._models.move_to_end(key)
+        elif self.cache_dir is not None and os.path.exists(self._mjb_path(key)):
+            model = mujoco.MjModel.from_binary_path(self._mjb_path(key))
+            self._insert(key, model)
+
+        if model is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return _copy_model(model)
+
+    def put(self, key, model):
+        """
+        Store a compiled model in the cache
+
+        Args:
+            key (str): scene signature
+
+            model (mujoco.MjModel): compiled model. A copy is stored
+        """
+        self._insert(key, _copy_model(model))
+        if self.cache_dir is not None and not os.path.exists(self._mjb_path(key)):
+            # write to a temp file first so that concurrent readers never see a partial file
+            tmp_path = "{}.{}.tmp".format(self._mjb_path(key), os.getpid())
+            mujoco.mj_saveModel(model, tmp_path, None)
+            os.replace(tmp_path, self._mjb_path(key))
+
+    def _insert(self, key, model):
+        self._models[key] = model
+        self._models.move_to_end(key)
+        while len(self._models) > self.max_size:
+            self._models.popitem(last=False)
+
+    def clear(self):
+        """
+        Clears the in-memory layer of the cache. Files on disk are left untouched
+        """
+        self._models.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, key):
+        return key in self._models or (
+            self.cache_dir is not None and os.path.exists(self._mjb_path(key))
+        )
+
+    def __len__(self):
+        return len(self._models)
+
+
+def _copy_model(model):
+    """
+    Copies a mujoco.MjModel (a plain memcpy of the model buffers)
+    """
+    return copy.copy(model)
+
+
+# process-wide caches, one per on-disk location, shared by all environments in the process
+_MODEL_CACHES = {}
+
+
+def get_model_cache(cache_dir=None):
+    """
+    Returns the process-wide compiled model cache for @cache_dir, creating it if needed
+
+    Args:
+        cache_dir (str): on-disk location of the cache. None keeps models in memory only
+
+    Returns:
+        CompiledModelCache: the cache
+    """
+    if cache_dir is not None:
+        cache_dir = os.path.abspath(os.path.expanduser(cache_dir))
+    if cache_dir not in _MODEL_CACHES:
+        _MODEL_CACHES[cache_dir] = CompiledModelCache(cache_dir=cache_dir)
+    return _MODEL_CACHES[cache_dir]
@@ -0,0 +1,534 @@
+"""
+Precomputed navigation maps of kitchen scenes, one per (layout, style). A map consists of
+    - a 2D occupancy grid of the floor, and the free space of the robot base (the occupancy grid dilated
+        by the robot radius) split into connected components
+    - a candidate robot base pose for each static fixture (see Kitchen.compute_robot_base_placement_pose),
+        whether the footprint of the robot base fits there, and the connected component it is reached from
+    - for each candidate base pose, the set of fixtures within reach of the robot
+
+Only static fixtures (fixtures without a placement, i.e. fixtures whose pose is fully determined by the
+layout and style) are part of the map. Maps are generated offline with robocasa/scripts/generate_nav_maps.py
+and loaded by environments created with nav_map_dir=<dir>.
+"""
+import os
+
+import numpy as np
+import robosuite.utils.transform_utils as T
+
+# maps loaded in this process, keyed by path
+_NAV_MAPS = {}
+
+
+class NavigationMap:
+    """
+    Navigation map of a single (layout, style)
+
+    Args:
+        layout_id (int): layout id
+
+        style_id (int): style id
+
+        origin (np.array): (x, y) world coordinates of the corner of cell (0, 0)
+
+        resolution (float): size of a grid cell, in meters
+
+        occupancy (np.array): (h, w) boolean grid, True for cells occupied by walls or fixtures
+
+        free (np.array): (h, w) boolean grid, True for cells where the robot base fits
+
+        components (np.array): (h, w) int grid, connected component of each free cell (0 for non-free cells)
+
+        fixture_names (list): names of the static fixtures
+
+        fixture_pos (np.array): (n, 3) positions of the static fixtures
+
+        base_pos (np.array): (n, 3) candidate robot base position for each static fixture
+
+        base_ori (np.array): (n, 3) candidate robot base orientation (euler) for each static fixture
+
+        reachable (np.array): (n, n) boolean matrix, True if fixture j is within reach from the base pose of fixture i
+
+        base_feasible (np.array): (n,) boolean array, True if the robot base footprint is collision free at the
+            candidate base pose of each fixture. If None, the candidate base position must be a free cell
+
+        base_components (np.array): (n,) connected component the candidate base pose of each fixture is reached
+            from (0 if the pose is not feasible). If None, the component of the candidate base position is used
+
+        base_footprint (np.array): (4,) [x_min, x_max, y_min, y_max] footprint of the robot base in its own frame
+    """
+
+    def __init__(
+        self,
+        layout_id,
+        style_id,
+        origin,
+        resolution,
+        occupancy,
+        free,
+        components,
+        fixture_names,
+        fixture_pos,
+        base_pos,
+        base_ori,
+        reachable,
+        base_feasible=None,
+        base_components=None,
+        base_footprint=None,
+    ):
+        self.layout_id = int(layout_id)
+        self.style_id = int(style_id)
+        self.origin = np.array(origin, dtype=float)
+        self.resolution = float(resolution)
+        self.occupancy = np.array(occupancy, dtype=bool)
+        self.free = np.array(free, dtype=bool)
+        self.components = np.array(components, dtype=int)
+        self.fixture_names = [str(name) for name in fixture_names]
+        self.fixture_pos = np.array(fixture_pos, dtype=float).reshape(-1, 3)
+        self.base_pos = np.array(base_pos, dtype=float).reshape(-1, 3)
+        self.base_ori = np.array(base_ori, dtype=float).reshape(-1, 3)
+        self.reachable = np.array(reachable, dtype=bool).reshape(
+            len(self.fixture_names), len(self.fixture_names)
+        )
+        self._fixture_inds = {name: i for (i, name) in enumerate(self.fixture_names)}
+
+        self.base_footprint = (
+            None
+            if base_footprint is None or np.size(base_footprint) == 0
+            else np.array(base_footprint, dtype=float)
+        )
+        if base_feasible is None:
+            base_feasible = self.is_free(self.base_pos[:, :2])
+        self.base_feasible = np.array(base_feasible, dtype=bool).reshape(-1)
+        if base_components is None:
+            base_components = self.get_component(self.base_pos[:, :2])
+        # component of the candidate base pose of each fixture (0 if the robot does not fit there)
+        self.base_components = np.where(
+            self.base_feasible, np.array(base_components, dtype=int).reshape(-1), 0
+        )
+
+    def save(self, path):
+        """
+        Saves the map as a compressed npz file
+        """
+        np.savez_compressed(
+            path,
+            layout_id=self.layout_id,
+            style_id=self.style_id,
+            origin=self.origin,
+            resolution=self.resolution,
+            occupancy=self.occupancy,
+            free=self.free,
+            components=self.components,
+            fixture_names=np.array(self.fixture_names),
+            fixture_pos=self.fixture_pos,
+            base_pos=self.base_pos,
+            base_ori=self.base_ori,
+            reachable=self.reachable,
+            base_feasible=self.base_feasible,
+            base_components=self.base_components,
+            # maps without footprint store an empty array
+            base_footprint=(
+                np.zeros(0) if self.base_footprint is None else self.base_footprint
+            ),
+        )
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads a map saved with save
+        """
+        with np.load(path) as f:
+            return cls(**{k: f[k] for k in f.files})
+
+    def world_to_cell(self, xy):
+        """
+        Returns:
+            np.array: (..., 2) integer (row, col) grid indices of world points @xy, may be out of bounds
+        """
+        cells = np.floor((np.asarray(xy)[..., :2] - self.origin) / self.resolution)
+        return cells[..., ::-1].astype(int)
+
+    def _lookup(self, grid, xy, default):
+        cells = self.world_to_cell(xy)
+        h, w = grid.shape
+        in_bounds = (
+            (cells[..., 0] >= 0)
+            & (cells[..., 0] < h)
+            & (cells[..., 1] >= 0)
+            & (cells[..., 1] < w)
+        )
+        rows = np.clip(cells[..., 0], 0, h - 1)
+        cols = np.clip(cells[..., 1], 0, w - 1)
+        return np.where(in_bounds, grid[rows, cols], default)
+
+    def is_free(self, xy):
+        """
+        Returns:
+            np.array: boolean array, True for world points @xy where the robot base fits
+        """
+        return self._lookup(self.free, xy, False)
+
+    def get_component(self, xy):
+        """
+        Returns:
+            np.array: connected component of world points @xy (0 if the robot base does not fit there)
+        """
+        return self._lookup(self.components, xy, 0)
+
+    def get_base_pose(self, fixture_name):
+        """
+        Returns:
+            2-tuple or None: candidate (pos, ori) of the robot base for static fixture @fixture_name,
+                or None if the fixture is not part of the map
+        """
+        i = self._fixture_inds.get(fixture_name, None)
+        if i is None:
+            return None
+        return np.array(self.base_pos[i]), np.array(self.base_ori[i])
+
+    def has_fixture(self, fixture_name, pos=None):
+        """
+        Returns:
+            bool: True if @fixture_name is a static fixture of the map (and is at position @pos, if specified)
+        """
+        i = self._fixture_inds.get(fixture_name, None)
+        if i is None:
+            return False
+        return pos is None or np.allclose(self.fixture_pos[i], pos, atol=1e-4)
+
+    def base_pose_feasible(self, fixture_name):
+        """
+        Returns:
+            bool: True if the robot base fits at the candidate base pose of @fixture_name and can drive there
+        """
+        i = self._fixture_inds.get(fixture_name, None)
+        return i is not None and self.base_components[i] > 0
+
+    def can_navigate(self, src_fixture_name, dst_fixture_name):
+        """
+        Returns:
+            bool: True if the robot can drive from the base pose of @src_fixture_name to the base pose of
+                @dst_fixture_name
+        """
+        i = self._fixture_inds.get(src_fixture_name, None)
+        j = self._fixture_inds.get(dst_fixture_name, None)
+        if i is None or j is None:
+            return False
+        return bool(
+            self.base_components[i] > 0
+            and self.base_components[i] == self.base_components[j]
+        )
+
+    def get_reachable_fixtures(self, fixture_name):
+        """
+        Returns:
+            list: names of the static fixtures within reach from the base pose of @fixture_name
+        """
+        i = self._fixture_inds.get(fixture_name, None)
+        if i is None:
+            return []
+        return [self.fixture_names[j] for j in np.nonzero(self.reachable[i])[0]]
+
+
+def get_nav_map_path(nav_map_dir, layout_id, style_id):
+    """
+    Returns:
+        str: path of the navigation map of (@layout_id, @style_id) in @nav_map_dir
+    """
+    return os.path.join(
+        nav_map_dir, "layout{}_style{}.npz".format(int(layout_id), int(style_id))
+    )
+
+
+def load_navigation_map(nav_map_dir, layout_id, style_id):
+    """
+    Loads the navigation map of (@layout_id, @style_id) from @nav_map_dir. Maps are cached in memory.
+
+    Returns:
+        NavigationMap or None: the map, or None if there is no map for this layout and style
+    """
+    path = get_nav_map_path(nav_map_dir, layout_id, style_id)
+    if path not in _NAV_MAPS:
+        _NAV_MAPS[path] = NavigationMap.load(path) if os.path.exists(path) else None
+    return _NAV_MAPS[path]
+
+
+def _box_corners(obj):
+    """
+    Returns:
+        np.array: (8, 3) world corners of a box object (e.g. a wall)
+    """
+    half_size = np.array(obj.size, dtype=float)
+    signs = np.array(
+        [[sx, sy, sz] for sx in (-1, 1) for sy in (-1, 1) for sz in (-1, 1)],
+        dtype=float,
+    )
+    quat = np.fromstring(obj._obj.get("quat", "1 0 0 0"), sep=" ")
+    rot = T.quat2mat(T.convert_quat(quat, to="xyzw"))
+    pos = np.fromstring(obj._obj.get("pos", "0 0 0"), sep=" ")
+    return pos + (signs * half_size) @ rot.T
+
+
+def _rasterize_footprints(cell_xy, footprints):
+    """
+    Returns:
+        np.array: boolean mask over @cell_xy of the cells covered by any of the 2D parallelograms @footprints,
+            each given as (p0, px, py)
+    """
+    occupied = np.zeros(cell_xy.shape[:-1], dtype=bool)
+    for (p0, px, py) in footprints:
+        u = px - p0
+        v = py - p0
+        proj_u = cell_xy @ u
+        proj_v = cell_xy @ v
+        occupied |= (
+            (np.dot(u, p0) <= proj_u)
+            & (proj_u <= np.dot(u, px))
+            & (np.dot(v, p0) <= proj_v)
+            & (proj_v <= np.dot(v, py))
+        )
+    return occupied
+
+
+def _dist_to_footprints(points, footprints):
+    """
+    Returns:
+        np.array: (m, k) 2D distances from @points (m, 2) to the parallelograms @footprints
+    """
+    dists = np.zeros((len(points), len(footprints)))
+    for (k, (p0, px, py)) in enumerate(footprints):
+        u = px - p0
+        v = py - p0
+        # local coordinates along the (orthogonal) edges of the box
+        local = np.stack(
+            [(points - p0) @ u / np.dot(u, u), (points - p0) @ v / np.dot(v, v)],
+            axis=-1,
+        )
+        outside = np.maximum(np.maximum(-local, local - 1.0), 0.0)
+        dists[:, k] = np.linalg.norm(
+            outside * np.array([np.linalg.norm(u), np.linalg.norm(v)]), axis=-1
+        )
+    return dists
+
+
+def get_robot_base_footprint(env, clearance_z=0.3):
+    """
+    Computes the 2D footprint of the base of the (first) robot of an environment, from the collision geoms of the
+    robot that reach below @clearance_z
+
+    Args:
+        env (Kitchen): environment, after a reset
+
+        clearance_z (float): geoms with a bottom below this height are part of the base
+
+    Returns:
+        np.array: [x_min, x_max, y_min, y_max] footprint in the frame of the robot root body
+    """
+    model = env.sim.model
+    data = env.sim.data
+    root_id = model.body_name2id(env.robots[0].robot_model.root_body)
+    root_pos = np.array(data.body_xpos[root_id])
+    root_mat = np.array(data.body_xmat[root_id]).reshape(3, 3)
+
+    body_rootid = np.asarray(model.body_rootid)
+    geom_ids = np.nonzero(
+        (body_rootid[np.asarray(model.geom_bodyid)] == body_rootid[root_id])
+        & ((np.asarray(model.geom_contype) | np.asarray(model.geom_conaffinity)) != 0)
+    )[0]
+
+    # world aabbs of the geoms, from their local bounding boxes
+    geom_aabb = np.asarray(model.geom_aabb)[geom_ids].reshape(-1, 6)
+    geom_mat = np.asarray(data.geom_xmat)[geom_ids].reshape(-1, 3, 3)
+    center = np.asarray(data.geom_xpos)[geom_ids] + np.einsum(
+        "nij,nj->ni", geom_mat, geom_aabb[:, :3]
+    )
+    half = np.einsum("nij,nj->ni", np.abs(geom_mat), geom_aabb[:, 3:])
+    low = center[:, 2] - half[:, 2] < clearance_z
+    center, half = center[low], half[low]
+    if len(center) == 0:
+        return np.zeros(4)
+
+    # corners of the aabbs in the frame of the root body
+    signs = np.array([[sx, sy, 0] for sx in (-1, 1) for sy in (-1, 1)], dtype=float)
+    corners = (center[:, None, :] + signs[None] * half[:, None, :]).reshape(-1, 3)
+    local = (corners - root_pos) @ root_mat
+    return np.array(
+        [
+            local[:, 0].min(),
+            local[:, 0].max(),
+            local[:, 1].min(),
+            local[:, 1].max(),
+        ]
+    )
+
+
+def _pose_footprint(pos, yaw, footprint):
+    """
+    Returns:
+        3-tuple: (p0, px, py) parallelogram of the robot base @footprint at base position @pos and @yaw
+    """
+    c, s = np.cos(yaw), np.sin(yaw)
+    rot = np.array([[c, -s], [s, c]])
+    x_min, x_max, y_min, y_max = footprint
+    p0 = pos[:2] + rot @ [x_min, y_min]
+    px = pos[:2] + rot @ [x_max, y_min]
+    py = pos[:2] + rot @ [x_min, y_max]
+    return p0, px, py
+
+
+def build_navigation_map(
+    env,
+    resolution=0.05,
+    robot_radius=0.4,
+    reach=1.0,
+    clearance_z=0.3,
+    margin=0.5,
+    approach=0.5,
+):
+    """
+    Computes the navigation map of the current scene of a kitchen environment
+
+    The candidate base pose of a fixture stands close to the fixture (or the counter below it), closer than the
+    robot radius. A pose is therefore feasible if the actual footprint of the robot base does not overlap any
+    obstacle other than that counter, and it is reached from the free space within @approach of it
+
+    Args:
+        env (Kitchen): environment, after a reset
+
+        resolution (float): size of a grid cell, in meters
+
+        robot_radius (float): radius of the robot base for driving around, in meters
+
+        reach (float): maximum 2D distance from the robot base to a fixture for the fixture to be reachable
+
+        clearance_z (float): fixtures and walls with a bottom below this height block the robot base
+
+        margin (float): margin added around the floor when no floor is found
+
+        approach (float): maximum distance from a candidate base pose to the free space it is reached from
+
+    Returns:
+        NavigationMap: navigation map of the scene
+    """
+    from scipy import ndimage
+
+    from robocasa.models.fixtures import Fixture
+    from robocasa.models.fixtures.others import Floor, Wall
+
+    fixture_index = env._get_fixture_index()
+    placed = set(cfg["name"] for cfg in env.fixture_cfgs if "placement" in cfg)
+
+    # static fixtures and their 2D footprints
+    static_inds = [
+        i
+        for (i, (name, fxtr)) in enumerate(
+            zip(fixture_index.names, fixture_index.fixtures)
+        )
+        if name not in placed
+        and isinstance(fxtr, Fixture)
+        and fixture_index.has_corners[i]
+    ]
+    fixtures = [fixture_index.fixtures[i] for i in static_inds]
+    fixture_names = [fxtr.name for fxtr in fixtures]
+    corners = fixture_index.corners[static_inds].reshape(-1, 8, 3)
+    footprints = [(c[0, :2], c[1, :2], c[2, :2]) for c in corners]
+
+    # obstacles: low fixtures and walls, with the index of the static fixture they belong to (-1 for walls)
+    obstacles = [fp for (fp, c) in zip(footprints, corners) if c[0, 2] < clearance_z]
+    obstacle_fixtures = [i for (i, c) in enumerate(corners) if c[0, 2] < clearance_z]
+    floor_corners = []
+    for obj in env.fixtures.values():
+        if isinstance(obj, Floor) or getattr(obj, "wall_side", None) == "floor":
+            floor_corners.append(_box_corners(obj))
+        elif isinstance(obj, Wall):
+            wall_corners = _box_corners(obj)
+            if np.min(wall_corners[:, 2]) < clearance_z:
+                lo = np.min(wall_corners[:, :2], axis=0)
+                hi = np.max(wall_corners[:, :2], axis=0)
+                obstacles.append(
+                    (lo, np.array([hi[0], lo[1]]), np.array([lo[0], hi[1]]))
+                )
+                obstacle_fixtures.append(-1)
+
+    # grid bounds
+    if len(floor_corners) > 0:
+        pts = np.concatenate(floor_corners)[:, :2]
+        lo, hi = np.min(pts, axis=0), np.max(pts, axis=0)
+    else:
+        pts = corners.reshape(-1, 3)[:, :2]
+        lo, hi = np.min(pts, axis=0) - margin, np.max(pts, axis=0) + margin
+    shape = np.ceil((hi - lo) / resolution).astype(int)
+    xs = lo[0] + (np.arange(shape[0]) + 0.5) * resolution
+    ys = lo[1] + (np.arange(shape[1]) + 0.5) * resolution
+    cell_xy = np.stack(np.meshgrid(xs, ys, indexing="xy"), axis=-1)  # (h, w, 2)
+
+    obstacle_masks = [_rasterize_footprints(cell_xy, [fp]) for fp in obstacles]
+    occupancy = np.zeros(cell_xy.shape[:-1], dtype=bool)
+    for mask in obstacle_masks:
+        occupancy |= mask
+    off_floor = np.zeros_like(occupancy)
+    if len(floor_corners) > 0:
+        # cells outside of the floor are occupied as well
+        on_floor = np.zeros_like(occupancy)
+        for c in floor_corners:
+            f_lo, f_hi = np.min(c[:, :2], axis=0), np.max(c[:, :2], axis=0)
+            on_floor |= np.all((cell_xy >= f_lo) & (cell_xy <= f_hi), axis=-1)
+        off_floor = ~on_floor
+        occupancy |= off_floor
+
+    # free space of the robot base
+    r = int(np.ceil(robot_radius / resolution))
+    yy, xx = np.mgrid[-r : r + 1, -r : r + 1]
+    disk = xx**2 + yy**2 <= r**2
+    free = ~ndimage.binary_dilation(occupancy, structure=disk)
+    components, _ = ndimage.label(free)
+    # distance of every cell to the nearest free cell, and that cell
+    free_dist, (free_rows, free_cols) = ndimage.distance_transform_edt(
+        ~free, sampling=resolution, return_indices=True
+    )
+
+    # candidate base poses, whether the base footprint fits there and reachable fixtures
+    base_footprint = get_robot_base_footprint(env, clearance_z=clearance_z)
+    fixture_inds = {id(fxtr): i for (i, fxtr) in enumerate(fixtures)}
+    base_pos = np.zeros((len(fixtures), 3))
+    base_ori = np.zeros((len(fixtures), 3))
+    base_feasible = np.zeros(len(fixtures), dtype=bool)
+    base_components = np.zeros(len(fixtures), dtype=int)
+    for (i, fxtr) in enumerate(fixtures):
+        base_pos[i], base_ori[i] = env._compute_robot_base_placement_pose(fxtr)
+        # the base pose keeps a fixed distance to this fixture, it does not block the base
+        base_fixture = fixture_inds.get(id(env._get_robot_base_fixture(fxtr)), None)
+        covered = _rasterize_footprints(
+            cell_xy, [_pose_footprint(base_pos[i], base_ori[i][2], base_footprint)]
+        )
+        blocked = np.any(covered & off_floor) or any(
+            np.any(covered & mask)
+            for (mask, k) in zip(obstacle_masks, obstacle_fixtures)
+            if k != base_fixture
+        )
+        row, col = np.floor((base_pos[i, 1::-1] - lo[::-1]) / resolution).astype(int)
+        if blocked or not (0 <= row < shape[1] and 0 <= col < shape[0]):
+            continue
+        if free_dist[row, col] > approach:
+            continue
+        base_feasible[i] = True
+        base_components[i] = components[free_rows[row, col], free_cols[row, col]]
+    reachable = _dist_to_footprints(base_pos[:, :2], footprints) <= reach
+
+    return NavigationMap(
+        layout_id=env.layout_id,
+        style_id=env.style_id,
+        origin=lo,
+        resolution=resolution,
+        occupancy=occupancy,
+        free=free,
+        components=components,
+        fixture_names=fixture_names,
+        fixture_pos=np.array([fxtr.pos for fxtr in fixtures]).reshape(-1, 3),
+        base_pos=base_pos,
+        base_ori=base_ori,
+        reachable=reachable,
+        base_feasible=base_feasible,
+        base_components=base_components,
+        base_footprint=base_footprint,
+    )
@@ -7,57 +7,104 @@ from robosuite.utils.mjcf_utils import (
 )
 
 from robocasa.models.objects.objects import MJCFObject
+from robocasa.utils.transform_utils import quat2mat_batch
 
 
 def obj_inside_of(env, obj_name, fixture_id, partial_check=False):
     """
     whether an object (another mujoco object) is inside of fixture. applies for most fixtures
     """
-    from robocasa.models.fixtures import Fixture
-
-    obj = env.objects[obj_name]
-    fixture = env.get_fixture(fixture_id)
-    assert isinstance(obj, MJCFObject)
-    assert isinstance(fixture, Fixture)
-
-    # step 1: calculate fxiture points
-    fixtr_p0, fixtr_px, fixtr_py, fixtr_pz = fixture.get_int_sites(relative=False)
-    u = fixtr_px - fixtr_p0
-    v = fixtr_py - fixtr_p0
-    w = fixtr_pz - fixtr_p0
-
-    # get the position and quaternion of object
-    obj_pos = np.array(env.sim.data.body_xpos[env.obj_body_id[obj.name]])
-    obj_quat = T.convert_quat(
-        env.sim.data.body_xquat[env.obj_body_id[obj.name]], to="xyzw"
+    return bool(
+        objs_inside_of(env, [obj_name], [fixture_id], partial_check=partial_check)[0]
     )
 
+
+def get_obj_poses(env, obj_names):
+    """
+    Gathers the poses of multiple objects in one indexed read
+
+    Args:
+        env (MujocoEnv): environment
+
+        obj_names (list of str): names of the objects
+
+    Returns:
+        2-tuple: (N, 3) positions and (N, 4) orientations in (x,y,z,w) form
+    """
+    body_ids = np.array([env.obj_body_id[name] for name in obj_names], dtype=int)
+    pos = np.array(env.sim.data.body_xpos[body_ids]).reshape(-1, 3)
+    quat = np.array(env.sim.data.body_xquat[body_ids]).reshape(-1, 4)[:, [1, 2, 3, 0]]
+    return pos, quat
+
+
+def _box_frames_contain(axes, bounds, points, th=0.0):
+    """
+    Checks whether all points of each point set lie within the corresponding box (see Fixture.get_box_frame)
+
+    Args:
+        axes (np.array): (N, 3, 3) box edge vectors
+
+        bounds (np.array): (N, 2, 3) lower and upper bounds of the projections onto the edge vectors
+
+        points (np.array): (N, P, 3) point sets
+
+        th (float): tolerance added to the bounds
+
+    Returns:
+        np.array: (N,) boolean array
+    """
+    projs = np.einsum("naj,npj->npa", axes, points)
+    inside = (bounds[:, None, 0] - th <= projs) & (projs <= bounds[:, None, 1] + th)
+    return np.all(inside, axis=(1, 2))
+
+
+def objs_inside_of(env, obj_names, fixture_ids, partial_check=False):
+    """
+    Batched version of obj_inside_of
+
+    Args:
+        env (MujocoEnv): environment
+
+        obj_names (list of str): names of the objects
+
+        fixture_ids (list or str or Fixture or FixtureType): fixture to check for each object, or a single fixture
+            for all objects
+
+        partial_check (bool): if True, only checks the center of the objects instead of their bounding boxes
+
+    Returns:
+        np.array: (N,) boolean array, True where the object is inside of the fixture
+    """
+    from robocasa.models.fixtures import Fixture
+
+    obj_names = list(obj_names)
+    if not isinstance(fixture_ids, (list, tuple, np.ndarray)):
+        fixture_ids = [fixture_ids] * len(obj_names)
+    assert len(fixture_ids) == len(obj_names)
+    objs = [env.objects[name] for name in obj_names]
+    fixtures = [env.get_fixture(fixture_id) for fixture_id in fixture_ids]
+    assert all(isinstance(obj, MJCFObject) for obj in objs)
+    assert all(isinstance(fixture, Fixture) for fixture in fixtures)
+    if len(objs) == 0:
+        return np.zeros(0, dtype=bool)
+
+    frames = [fixture.get_box_frame("int") for fixture in fixtures]
+    axes = np.array([frame[0] for frame in frames])
+    bounds = np.array([frame[1] for frame in frames])
+
+    pos, quat = get_obj_poses(env, obj_names)
     if partial_check:
-        obj_points_to_check = [obj_pos]
+        points = pos[:, None]
         th = 0.0
     else:
-        # calculate 8 boundary points of object
-        obj_points_to_check = obj.get_bbox_points(trans=obj_pos, rot=obj_quat)
+        # 8 boundary points of each object
+        offsets = np.array([obj.bbox_offsets for obj in objs])
+        points = np.einsum("nij,npj->npi", quat2mat_batch(quat), offsets)
+        points += pos[:, None]
         # threshold to mitigate false negatives: even if the bounding box point is out of bounds,
         th = 0.05
 
-    inside_of = True
-    for obj_p in obj_points_to_check:
-        check1 = (
-            np.dot(u, fixtr_p0) - th <= np.dot(u, obj_p) <= np.dot(u, fixtr_px) + th
-        )
-        check2 = (
-            np.dot(v, fixtr_p0) - th <= np.dot(v, obj_p) <= np.dot(v, fixtr_py) + th
-        )
-        check3 = (
-            np.dot(w, fixtr_p0) - th <= np.dot(w, obj_p) <= np.dot(w, fixtr_pz) + th
-        )
-
-        if not (check1 and check2 and check3):
-            inside_of = False
-            break
-
-    return inside_of
+    return _box_frames_contain(axes, bounds, points, th=th)
 
 
 # used for cabinets, cabinet panels, counters, etc.
@@ -167,19 +214,28 @@ def point_in_fixture(point, fixture, only_2d=False):
 
         only_2d (bool): whether to check only in 2D
     """
-    p0, px, py, pz = fixture.get_ext_sites(relative=False)
-    th = 0.00
-    u = px - p0
-    v = py - p0
-    w = pz - p0
-    check1 = np.dot(u, p0) - th <= np.dot(u, point) <= np.dot(u, px) + th
-    check2 = np.dot(v, p0) - th <= np.dot(v, point) <= np.dot(v, py) + th
-    check3 = np.dot(w, p0) - th <= np.dot(w, point) <= np.dot(w, pz) + th
+    return bool(points_in_fixture(np.array([point]), fixture, only_2d=only_2d)[0])
+
 
+def points_in_fixture(points, fixture, only_2d=False):
+    """
+    Batched version of point_in_fixture
+
+    Args:
+        points (np.array): (N, 3) points to check
+
+        fixture (Fixture): fixture object
+
+        only_2d (bool): whether to check only in 2D
+
+    Returns:
+        np.array: (N,) boolean array, True where the point is inside of the exterior bounding box of the fixture
+    """
+    axes, bounds = fixture.get_box_frame("ext")
     if only_2d:
-        return check1 and check2
-    else:
-        return check1 and check2 and check3
+        axes, bounds = axes[:2], bounds[:, :2]
+    projs = np.asarray(points, dtype=float).reshape(-1, 3) @ axes.T
+    return np.all((bounds[0] <= projs) & (projs <= bounds[1]), axis=1)
 
 
 def obj_in_region(
@@ -313,6 +369,72 @@ def objs_intersect(
     return intersect
 
 
+def points_in_region(points, p0, px, py, pz=None):
+    """
+    Batched version of the containment check in obj_in_region. Checks whether all points of each point set lie in
+    the region defined by @p0, @px, @py (and optionally @pz)
+
+    Args:
+        points (np.array): (..., N, 3) array of point sets
+
+        p0, px, py, pz (np.array): corner points of the region
+
+    Returns:
+        np.array: (...) boolean array, True where all N points of the set are inside the region
+    """
+    in_region = np.ones(points.shape[:-1], dtype=bool)
+    for p1 in [px, py, pz]:
+        if p1 is None:
+            continue
+        axis = p1 - p0
+        projs = points @ axis
+        in_region &= (np.dot(axis, p0) <= projs) & (projs <= np.dot(axis, p1))
+    return np.all(in_region, axis=-1)
+
+
+def bboxes_intersect(points, other_points):
+    """
+    Batched version of the bounding box check in objs_intersect. Runs the same separating axis test (using the face
+    normals of both boxes) for every pair of boxes in @points and @other_points
+
+    Args:
+        points (np.array): (K, 8, 3) array of bounding box points, ordered as in get_bbox_points
+
+        other_points (np.array): (M, 8, 3) array of bounding box points, ordered as in get_bbox_points
+
+    Returns:
+        np.array: (K, M) boolean array, True where the two boxes intersect
+    """
+    normals = points[:, 1:4] - points[:, :1]
+    normals = normals / np.linalg.norm(normals, axis=-1, keepdims=True)
+    other_normals = other_points[:, 1:4] - other_points[:, :1]
+    other_normals = other_normals / np.linalg.norm(
+        other_normals, axis=-1, keepdims=True
+    )
+
+    intersect = np.ones((len(points), len(other_points)), dtype=bool)
+    # projections onto the normals of the first set of boxes: (K, 3, 8) and (K, M, 3, 8)
+    projs = np.einsum("kpj,kaj->kap", points, normals)
+    other_projs = np.einsum("mpj,kaj->kmap", other_points, normals)
+    intersect &= ~_has_gap(projs[:, None], other_projs)
+    # projections onto the normals of the second set of boxes: (K, M, 3, 8) and (M, 3, 8)
+    projs = np.einsum("kpj,maj->kmap", points, other_normals)
+    other_projs = np.einsum("mpj,maj->map", other_points, other_normals)
+    intersect &= ~_has_gap(projs, other_projs[None])
+    return intersect
+
+
+def _has_gap(projs, other_projs):
+    """
+    Returns whether the projected intervals (along the last axis) are separated along any of the axes (second to
+    last axis)
+    """
+    gap = (np.min(other_projs, axis=-1) > np.max(projs, axis=-1)) | (
+        np.min(projs, axis=-1) > np.max(other_projs, axis=-1)
+    )
+    return np.any(gap, axis=-1)
+
+
 def normalize_joint_value(raw, joint_min, joint_max):
     """
     normalize raw value to be between 0 and 1
@@ -324,17 +446,7 @@ def check_obj_in_receptacle(env, obj_name, receptacle_name, th=None):
     """
     check if object is in receptacle object based on threshold
     """
-    obj = env.objects[obj_name]
-    recep = env.objects[receptacle_name]
-    obj_pos = np.array(env.sim.data.body_xpos[env.obj_body_id[obj_name]])
-    recep_pos = np.array(env.sim.data.body_xpos[env.obj_body_id[receptacle_name]])
-    if th is None:
-        th = recep.horizontal_radius * 0.7
-    obj_in_recep = (
-        env.check_contact(obj, recep)
-        and np.linalg.norm(obj_pos[:2] - recep_pos[:2]) < th
-    )
-    return obj_in_recep
+    return bool(check_objs_in_receptacles(env, [obj_name], [receptacle_name], th=th)[0])
 
 
 def check_obj_fixture_contact(env, obj_name, fixture_name):
@@ -350,18 +462,84 @@ def gripper_obj_far(env, obj_name="obj", th=0.25):
     """
     check if gripper is far from object based on distance defined by threshold
     """
-    obj_pos = env.sim.data.body_xpos[env.obj_body_id[obj_name]]
-    gripper_site_pos = env.sim.data.site_xpos[env.robots[0].eef_site_id["right"]]
-    gripper_obj_far = np.linalg.norm(gripper_site_pos - obj_pos) > th
-    return gripper_obj_far
+    return bool(gripper_objs_far(env, [obj_name], th=th)[0])
 
 
 def obj_cos(env, obj_name="obj", ref=(0, 0, 1)):
-    def cos(u, v):
-        return np.dot(u, v) / max(np.linalg.norm(u) * np.linalg.norm(v), 1e-10)
+    return float(objs_cos(env, [obj_name], ref=ref)[0])
+
+
+def check_objs_in_receptacles(env, obj_names, receptacle_names, th=None):
+    """
+    Batched version of check_obj_in_receptacle
 
-    obj_id = env.obj_body_id[obj_name]
-    obj_quat = T.convert_quat(np.array(env.sim.data.body_xquat[obj_id]), to="xyzw")
-    obj_mat = T.quat2mat(obj_quat)
+    Args:
+        env (MujocoEnv): environment
+
+        obj_names (list of str): names of the objects
+
+        receptacle_names (list of str or str): receptacle to check for each object, or a single receptacle for all
+            objects
+
+        th (float): distance threshold, defaults to 0.7 times the horizontal radius of each receptacle
+
+    Returns:
+        np.array: (N,) boolean array, True where the object is in the receptacle
+    """
+    obj_names = list(obj_names)
+    if isinstance(receptacle_names, str):
+        receptacle_names = [receptacle_names] * len(obj_names)
+    receptacle_names = list(receptacle_names)
+    if th is None:
+        th = np.array(
+            [env.objects[name].horizontal_radius * 0.7 for name in receptacle_names]
+        )
+    obj_pos, _ = get_obj_poses(env, obj_names)
+    recep_pos, _ = get_obj_poses(env, receptacle_names)
+    in_recep = np.linalg.norm(obj_pos[:, :2] - recep_pos[:, :2], axis=1) < th
+    # contacts are only checked for objects that are close enough
+    for i in np.flatnonzero(in_recep):
+        in_recep[i] = env.check_contact(
+            env.objects[obj_names[i]], env.objects[receptacle_names[i]]
+        )
+    return in_recep
+
+
+def gripper_objs_far(env, obj_names, th=0.25):
+    """
+    Batched version of gripper_obj_far
+
+    Args:
+        env (MujocoEnv): environment
 
-    return cos(obj_mat[:, 2], np.array(ref))
+        obj_names (list of str): names of the objects
+
+        th (float): distance threshold
+
+    Returns:
+        np.array: (N,) boolean array, True where the gripper is far from the object
+    """
+    obj_pos, _ = get_obj_poses(env, obj_names)
+    gripper_site_pos = env.sim.data.site_xpos[env.robots[0].eef_site_id["right"]]
+    return np.linalg.norm(obj_pos - gripper_site_pos, axis=1) > th
+
+
+def objs_cos(env, obj_names, ref=(0, 0, 1)):
+    """
+    Batched version of obj_cos
+
+    Args:
+        env (MujocoEnv): environment
+
+        obj_names (list of str): names of the objects
+
+        ref (tuple): reference direction
+
+    Returns:
+        np.array: (N,) cosines between the z axis of each object and @ref
+    """
+    _, obj_quat = get_obj_poses(env, obj_names)
+    obj_z = quat2mat_batch(obj_quat)[:, :, 2]
+    ref = np.array(ref, dtype=float)
+    norms = np.maximum(np.linalg.norm(obj_z, axis=1) * np.linalg.norm(ref), 1e-10)
+    return obj_z @ ref / norms
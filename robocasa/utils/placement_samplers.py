@@ -9,11 +9,136 @@ from robosuite.utils.transform_utils import (
     convert_quat,
     euler2mat,
     mat2quat,
-    quat_multiply,
     rotate_2d_point,
 )
 
-from robocasa.utils.object_utils import obj_in_region, objs_intersect
+from robocasa.models.objects.objects import MJCFObject
+from robocasa.utils.object_utils import bboxes_intersect, points_in_region
+from robocasa.utils.transform_utils import quat_multiply_batch
+
+
+class PlacementGrid:
+    """
+    2D uniform grid over the footprints (xy bounding boxes) of placed objects. Used by the samplers to only run the
+    exact intersection checks against placed objects that are close to where a new object can be placed.
+
+    Args:
+        cell_size (float): side length of the grid cells
+    """
+
+    def __init__(self, cell_size=0.5):
+        self.cell_size = cell_size
+        self.cells = collections.defaultdict(set)
+        self.entries = {}
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _get_cells(self, min_xy, max_xy):
+        lo = np.floor(np.asarray(min_xy) / self.cell_size).astype(int)
+        hi = np.floor(np.asarray(max_xy) / self.cell_size).astype(int)
+        return [
+            (i, j) for i in range(lo[0], hi[0] + 1) for j in range(lo[1], hi[1] + 1)
+        ]
+
+    def add(self, name, pos, quat, obj):
+        """
+        Adds a placed object to the grid
+
+        Args:
+            name (str): name of the placed object
+
+            pos (3-array): position of the placed object
+
+            quat (4-array): orientation of the placed object in (w,x,y,z) form
+
+            obj (MujocoObject): the placed object
+        """
+        from robocasa.models.fixtures import Fixture
+
+        if name in self.entries:
+            self.remove(name)
+
+        pos = np.array(pos)
+        if isinstance(obj, MJCFObject) or isinstance(obj, Fixture):
+            bbox_points = obj.transform_bbox_points(
+                pos, convert_quat(np.array(quat), to="xyzw")
+            )[0]
+            min_xy = np.min(bbox_points[:, 0:2], axis=0)
+            max_xy = np.max(bbox_points[:, 0:2], axis=0)
+        else:
+            bbox_points = None
+            min_xy = pos[0:2] - obj.horizontal_radius
+            max_xy = pos[0:2] + obj.horizontal_radius
+
+        self.entries[name] = dict(
+            name=name,
+            pos=pos,
+            obj=obj,
+            bbox_points=bbox_points,
+            min_xy=min_xy,
+            max_xy=max_xy,
+        )
+        for cell in self._get_cells(min_xy, max_xy):
+            self.cells[cell].add(name)
+
+    def remove(self, name):
+        """
+        Removes a placed object from the grid
+
+        Args:
+            name (str): name of the placed object
+        """
+        entry = self.entries.pop(name)
+        for cell in self._get_cells(entry["min_xy"], entry["max_xy"]):
+            self.cells[cell].discard(name)
+
+    def update(self, placed_objects):
+        """
+        Adds all placements in @placed_objects that are not in the grid yet
+
+        Args:
+            placed_objects (dict): object names mapped to (pos, quat, MujocoObject)
+        """
+        for name, (pos, quat, obj) in placed_objects.items():
+            if name not in self.entries:
+                self.add(name, pos, quat, obj)
+
+    def query(self, min_xy, max_xy):
+        """
+        Returns the placed objects whose footprint overlaps the given xy bounding box
+
+        Args:
+            min_xy (2-array): lower corner of the bounding box
+
+            max_xy (2-array): upper corner of the bounding box
+
+        Returns:
+            list: entries (dicts with name, pos, obj, bbox_points, min_xy and max_xy keys) of the nearby placed
+                objects
+        """
+        names = set()
+        for cell in self._get_cells(min_xy, max_xy):
+            names.update(self.cells.get(cell, ()))
+        entries = [self.entries[name] for name in sorted(names)]
+        return [
+            entry
+            for entry in entries
+            if np.all(entry["min_xy"] <= max_xy) and np.all(min_xy <= entry["max_xy"])
+        ]
+
+    def copy(self):
+        """
+        Returns a copy of this grid that can be updated independently
+        """
+        grid = PlacementGrid(cell_size=self.cell_size)
+        grid.entries = copy(self.entries)
+        for (cell, names) in self.cells.items():
+            grid.cells[cell] = set(names)
+        return grid
 
 
 class ObjectPositionSampler:
@@ -92,7 +217,7 @@ class ObjectPositionSampler:
         """
         self.mujoco_objects = []
 
-    def sample(self, fixtures=None, reference=None, on_top=True):
+    def sample(self, fixtures=None, reference=None, on_top=True, spatial_index=None):
         """
         Uniformly sample on a surface (not necessarily table surface).
 
@@ -107,6 +232,9 @@ class ObjectPositionSampler:
 
             on_top (bool): if True, sample placement on top of the reference object.
 
+            spatial_index (PlacementGrid): if specified, index over the placements in @fixtures that is used to find
+                nearby placed objects. Newly sampled placements are added to it
+
         Return:
             dict: dictionary of all object placements, mapping object_names to (pos, quat, obj), including the
                 placements specified in @fixtures. Note quat is in (w,x,y,z) form
@@ -172,6 +300,11 @@ class UniformRandomSampler(ObjectPositionSampler):
 
         z_offset (float): Add a small z-offset to placements. This is useful for fixed objects
             that do not move (i.e. no free joint) to place them above the table.
+
+        batch_size (int): number of candidate placements that are sampled and checked at once. The first valid
+            candidate of each batch is used. With the default of 1, candidates are drawn from @rng in the same order
+            as with per-candidate sampling. Larger batches draw the random numbers in a different order, so that the
+            same seed gives different placements
     """
 
     def __init__(
@@ -189,11 +322,16 @@ class UniformRandomSampler(ObjectPositionSampler):
         z_offset=0.0,
         rng=None,
         side="all",
+        batch_size=1,
     ):
         self.x_range = x_range
         self.y_range = y_range
         self.rotation = rotation
         self.rotation_axis = rotation_axis
+        self.batch_size = batch_size
+
+        # why the last call to sample() failed, if it did (see _get_failure_info)
+        self.last_failure = None
 
         if side not in self.valid_sides:
             raise ValueError(
@@ -211,63 +349,75 @@ class UniformRandomSampler(ObjectPositionSampler):
             rng=rng,
         )
 
-    def _sample_x(self):
+    def _sample_x(self, size=None):
         """
         Samples the x location for a given object
 
+        Args:
+            size (int): if specified, samples this many x locations at once
+
         Returns:
-            float: sampled x position
+            float or np.array: sampled x position(s)
         """
         minimum, maximum = self.x_range
-        return self.rng.uniform(high=maximum, low=minimum)
+        return self.rng.uniform(high=maximum, low=minimum, size=size)
 
-    def _sample_y(self):
+    def _sample_y(self, size=None):
         """
         Samples the y location for a given object
 
+        Args:
+            size (int): if specified, samples this many y locations at once
+
         Returns:
-            float: sampled y position
+            float or np.array: sampled y position(s)
         """
         minimum, maximum = self.y_range
-        return self.rng.uniform(high=maximum, low=minimum)
+        return self.rng.uniform(high=maximum, low=minimum, size=size)
 
-    def _sample_quat(self):
+    def _sample_quat(self, size=None):
         """
         Samples the orientation for a given object
 
+        Args:
+            size (int): if specified, samples this many orientations at once
+
         Returns:
-            np.array: sampled object quaternion in (w,x,y,z) form
+            np.array: sampled object quaternion in (w,x,y,z) form, or (size, 4) array of quaternions
 
         Raises:
             ValueError: [Invalid rotation axis]
         """
         if self.rotation is None:
-            rot_angle = self.rng.uniform(high=2 * np.pi, low=0)
+            rot_angle = self.rng.uniform(high=2 * np.pi, low=0, size=size)
         elif isinstance(self.rotation, collections.abc.Iterable):
             if isinstance(self.rotation[0], collections.abc.Iterable):
-                rotation = self.rng.choice(self.rotation)
+                rotation = self.rng.choice(self.rotation, size=size)
             else:
                 rotation = self.rotation
-            rot_angle = self.rng.uniform(high=max(rotation), low=min(rotation))
+            rot_angle = self.rng.uniform(
+                high=np.max(rotation, axis=-1), low=np.min(rotation, axis=-1), size=size
+            )
         else:
-            rot_angle = self.rotation
+            rot_angle = self.rotation if size is None else np.full(size, self.rotation)
 
         # Return angle based on axis requested
-        if self.rotation_axis == "x":
-            return np.array([np.cos(rot_angle / 2), np.sin(rot_angle / 2), 0, 0])
-        elif self.rotation_axis == "y":
-            return np.array([np.cos(rot_angle / 2), 0, np.sin(rot_angle / 2), 0])
-        elif self.rotation_axis == "z":
-            return np.array([np.cos(rot_angle / 2), 0, 0, np.sin(rot_angle / 2)])
-        else:
+        axis_index = {"x": 1, "y": 2, "z": 3}.get(self.rotation_axis, None)
+        if axis_index is None:
             # Invalid axis specified, raise error
             raise ValueError(
                 "Invalid rotation axis specified. Must be 'x', 'y', or 'z'. Got: {}".format(
                     self.rotation_axis
                 )
             )
+        quat = np.zeros(np.shape(rot_angle) + (4,))
+        quat[..., 0] = np.cos(rot_angle / 2)
+        quat[..., axis_index] = np.sin(rot_angle / 2)
+        return quat
 
-    def sample(self, placed_objects=None, reference=None, on_top=True):
+    def sample(
+        self, placed_objects=None, reference=None, on_top=True, spatial_index=None
+    ):
         """
         Uniformly sample relative to this sampler's reference_pos or @reference (if specified).
 
@@ -284,6 +434,9 @@ class UniformRandomSampler(ObjectPositionSampler):
                 z-offset of the current sampled object's bottom_offset + the reference object's top_offset
                 (if specified)
 
+            spatial_index (PlacementGrid): if specified, index over the placements in @placed_objects that is used to
+                find nearby placed objects. Newly sampled placements are added to it
+
         Return:
             dict: dictionary of all object placements, mapping object_names to (pos, quat, obj), including the
                 placements specified in @fixtures. Note quat is in (w,x,y,z) form
@@ -292,8 +445,15 @@ class UniformRandomSampler(ObjectPositionSampler):
             RandomizationError: [Cannot place all objects]
             AssertionError: [Reference object name does not exist, invalid inputs]
         """
+        from robocasa.models.fixtures import Fixture
+
         # Standardize inputs
         placed_objects = {} if placed_objects is None else copy(placed_objects)
+        if spatial_index is None:
+            spatial_index = PlacementGrid()
+        if self.ensure_valid_placement:
+            spatial_index.update(placed_objects)
+        self.last_failure = None
 
         if reference is None:
             base_offset = self.reference_pos
@@ -343,75 +503,195 @@ class UniformRandomSampler(ObjectPositionSampler):
                 )
             region_points += base_offset
 
-            for i in range(5000):  # 5000 retries
-                # sample object coordinates
-                relative_x = self._sample_x()
-                relative_y = self._sample_y()
+            object_z = self.z_offset + base_offset[2]
+            if on_top:
+                object_z -= obj.bottom_offset[-1]
 
-                # apply rotation
-                object_x, object_y = rotate_2d_point(
-                    [relative_x, relative_y], rot=self.reference_rot
+            # local bounding box of the object (or its horizontal radius points if it has no bounding box)
+            has_bbox = isinstance(obj, MJCFObject) or isinstance(obj, Fixture)
+            if has_bbox:
+                obj_offsets = obj.bbox_offsets
+            else:
+                radius = obj.horizontal_radius
+                obj_offsets = np.array(
+                    [
+                        [radius, 0, 0],
+                        [-radius, 0, 0],
+                        [0, radius, 0],
+                        [0, -radius, 0],
+                    ]
                 )
 
-                object_x = object_x + base_offset[0]
-                object_y = object_y + base_offset[1]
-                object_z = self.z_offset + base_offset[2]
-                if on_top:
-                    object_z -= obj.bottom_offset[-1]
+            # only check against placed objects close to the region the object can be placed in
+            other_bbox_points = []
+            other_bbox_names = []
+            other_radius_objs = []
+            if self.ensure_valid_placement:
+                region_corners = np.array(
+                    [
+                        region_points[0][0:2],
+                        region_points[1][0:2],
+                        region_points[2][0:2],
+                        region_points[1][0:2]
+                        + region_points[2][0:2]
+                        - region_points[0][0:2],
+                    ]
+                )
+                obj_extent = np.max(np.linalg.norm(obj_offsets, axis=1))
+                for entry in spatial_index.query(
+                    min_xy=np.min(region_corners, axis=0) - obj_extent,
+                    max_xy=np.max(region_corners, axis=0) + obj_extent,
+                ):
+                    if has_bbox and entry["bbox_points"] is not None:
+                        other_bbox_points.append(entry["bbox_points"])
+                        other_bbox_names.append(entry["name"])
+                    else:
+                        other_radius_objs.append(
+                            (entry["name"], entry["pos"], entry["obj"])
+                        )
+            other_bbox_points = np.array(other_bbox_points).reshape(-1, 8, 3)
+
+            # keep track of why candidates are rejected, for reporting failures
+            num_out_of_region = 0
+            collisions = collections.Counter()
+
+            # sample and check candidates in batches, 5000 retries in total
+            for i in range(int(np.ceil(5000 / self.batch_size))):
+                n = self.batch_size
+
+                # sample object coordinates and apply rotation
+                object_xy = rotate_2d_point(
+                    [self._sample_x(size=n), self._sample_y(size=n)],
+                    rot=self.reference_rot,
+                ).T
+                object_xy = object_xy + base_offset[0:2]
+                object_pos = np.concatenate(
+                    [object_xy, np.full((n, 1), object_z)], axis=1
+                )
 
                 # random rotation
-                quat = self._sample_quat()
+                quats = self._sample_quat(size=n)
                 # multiply this quat by the object's initial rotation if it has the attribute specified
                 if hasattr(obj, "init_quat"):
-                    quat = quat_multiply(obj.init_quat, quat)
-                quat = convert_quat(
-                    quat_multiply(
-                        convert_quat(ref_quat, to="xyzw"),
-                        convert_quat(quat, to="xyzw"),
-                    ),
-                    to="wxyz",
-                )
+                    quats = quat_multiply_batch(obj.init_quat, quats)
+                quats = quat_multiply_batch(
+                    convert_quat(ref_quat, to="xyzw"), quats[:, [1, 2, 3, 0]]
+                )[:, [3, 0, 1, 2]]
 
-                location_valid = True
+                if has_bbox:
+                    obj_points = obj.transform_bbox_points(
+                        object_pos, quats[:, [1, 2, 3, 0]]
+                    )
+                else:
+                    obj_points = obj_offsets[None] + object_pos[:, None]
+
+                valid = np.ones(n, dtype=bool)
 
                 # ensure object placed fully in region
-                if self.ensure_object_boundary_in_range and not obj_in_region(
-                    obj,
-                    obj_pos=[object_x, object_y, object_z],
-                    obj_quat=convert_quat(quat, to="xyzw"),
-                    p0=region_points[0],
-                    px=region_points[1],
-                    py=region_points[2],
-                ):
-                    location_valid = False
-                    continue
+                if self.ensure_object_boundary_in_range:
+                    valid &= points_in_region(
+                        obj_points,
+                        p0=region_points[0],
+                        px=region_points[1],
+                        py=region_points[2],
+                    )
+                    num_out_of_region += n - np.count_nonzero(valid)
+                in_region = valid.copy()
 
                 # objects cannot overlap
-                if self.ensure_valid_placement:
-                    for (x, y, z), other_quat, other_obj in placed_objects.values():
-                        if objs_intersect(
-                            obj=obj,
-                            obj_pos=[object_x, object_y, object_z],
-                            obj_quat=convert_quat(quat, to="xyzw"),
-                            other_obj=other_obj,
-                            other_obj_pos=[x, y, z],
-                            other_obj_quat=convert_quat(other_quat, to="xyzw"),
-                        ):
-                            location_valid = False
-                            break
-
-                if location_valid:
+                if len(other_bbox_points) > 0:
+                    intersect = bboxes_intersect(obj_points, other_bbox_points)
+                    valid &= ~np.any(intersect, axis=1)
+                    for m in np.nonzero(np.any(intersect[in_region], axis=0))[0]:
+                        collisions[other_bbox_names[m]] += np.count_nonzero(
+                            intersect[in_region, m]
+                        )
+                for other_name, other_pos, other_obj in other_radius_objs:
+                    intersect = self._radius_intersect(
+                        obj, object_pos, other_obj, other_pos
+                    )
+                    valid &= ~intersect
+                    if np.any(intersect[in_region]):
+                        collisions[other_name] += np.count_nonzero(intersect[in_region])
+
+                if np.any(valid):
                     # location is valid, put the object down
-                    pos = (object_x, object_y, object_z)
-                    placed_objects[obj.name] = (pos, quat, obj)
+                    k = np.argmax(valid)
+                    pos = tuple(object_pos[k])
+                    placed_objects[obj.name] = (pos, quats[k], obj)
+                    spatial_index.add(obj.name, pos, quats[k], obj)
                     success = True
                     break
 
             if not success:
-                raise RandomizationError("Cannot place all objects ):")
+                self.last_failure = dict(
+                    obj=obj.name,
+                    num_tries=int(np.ceil(5000 / self.batch_size)) * self.batch_size,
+                    num_out_of_region=int(num_out_of_region),
+                    collisions=dict(collisions.most_common()),
+                )
+                raise RandomizationError(
+                    "Cannot place all objects ): {}".format(
+                        self.describe_failure(self.last_failure)
+                    )
+                )
 
         return placed_objects
 
+    @staticmethod
+    def describe_failure(failure):
+        """
+        Returns a human-readable description of a placement failure
+
+        Args:
+            failure (dict): failure info, as stored in last_failure
+
+        Returns:
+            str: description of the failure
+        """
+        desc = "no valid placement for {} in {} tries ({} outside of region".format(
+            failure["obj"], failure["num_tries"], failure["num_out_of_region"]
+        )
+        if len(failure["collisions"]) > 0:
+            desc += ", colliding with {}".format(
+                ", ".join(
+                    "{} ({})".format(name, count)
+                    for (name, count) in list(failure["collisions"].items())[:3]
+                )
+            )
+        return desc + ")"
+
+    @staticmethod
+    def _radius_intersect(obj, obj_pos, other_obj, other_obj_pos):
+        """
+        Batched version of the horizontal radius check in objs_intersect, used for objects without bounding boxes
+
+        Args:
+            obj (MujocoObject): object being placed
+
+            obj_pos (np.array): (N, 3) array of candidate positions of @obj
+
+            other_obj (MujocoObject): placed object
+
+            other_obj_pos (3-array): position of @other_obj
+
+        Returns:
+            np.array: (N,) boolean array, True where the candidate intersects @other_obj
+        """
+        other_obj_pos = np.array(other_obj_pos)
+        xy_collision = (
+            np.linalg.norm(obj_pos[:, 0:2] - other_obj_pos[0:2], axis=1)
+            <= other_obj.horizontal_radius + obj.horizontal_radius
+        )
+        z_collision = np.where(
+            obj_pos[:, 2] > other_obj_pos[2],
+            obj_pos[:, 2] - other_obj_pos[2]
+            <= other_obj.top_offset[-1] - obj.bottom_offset[-1],
+            other_obj_pos[2] - obj_pos[:, 2]
+            <= obj.top_offset[-1] - other_obj.bottom_offset[-1],
+        )
+        return xy_collision & z_collision
+
 
 class SequentialCompositeSampler(ObjectPositionSampler):
     """
@@ -419,18 +699,32 @@ class SequentialCompositeSampler(ObjectPositionSampler):
     multiple placement initializers together - so that object locations can
     be sampled on top of other objects or relative to other object placements.
 
+    If a sub-sampler fails, earlier placements are undone and re-sampled locally (backtracking) instead of failing
+    the whole sample() call: the placed object that most often blocked the failed sampler, or else the container
+    chain the failed sampler is placing relative to. If neither applies (or the sampler keeps failing), the failed
+    sampler is replaced through its resampler (e.g. to pick a different reset region) if one was specified.
+    Otherwise it is simply retried.
+
     Args:
         name (str): Name of this sampler.
+
+        max_backtracks (int): maximum number of backtracking steps per sample() call before giving up and raising
+            a RandomizationError. 0 disables backtracking
     """
 
-    def __init__(self, name, rng=None):
+    def __init__(self, name, rng=None, max_backtracks=0):
         # Samplers / args will be filled in later
         self.samplers = collections.OrderedDict()
         self.sample_args = collections.OrderedDict()
+        self.resamplers = collections.OrderedDict()
+        self.max_backtracks = max_backtracks
+
+        # object names mapped to the reason of the last failure to place them during the last sample() call
+        self.failure_reasons = {}
 
         super().__init__(name=name, rng=rng)
 
-    def append_sampler(self, sampler, sample_args=None):
+    def append_sampler(self, sampler, sample_args=None, resampler=None):
         """
         Adds a new placement initializer with corresponding @sampler and arguments
 
@@ -438,6 +732,9 @@ class SequentialCompositeSampler(ObjectPositionSampler):
             sampler (ObjectPositionSampler): sampler to add
             sample_args (None or dict): If specified, should be additional arguments to pass to @sampler's sample()
                 call. Should map corresponding sampler's arguments to values (excluding @fixtures argument)
+            resampler (None or callable): If specified, function without arguments that returns a new sampler for
+                the same objects (e.g. in a different region). Used when backtracking cannot resolve failures of
+                @sampler
 
         Raises:
             AssertionError: [Object name in samplers]
@@ -450,6 +747,8 @@ class SequentialCompositeSampler(ObjectPositionSampler):
             self.mujoco_objects.append(obj)
         self.samplers[sampler.name] = sampler
         self.sample_args[sampler.name] = sample_args
+        if resampler is not None:
+            self.resamplers[sampler.name] = resampler
 
     def hide(self, mujoco_objects):
         """
@@ -515,7 +814,9 @@ class SequentialCompositeSampler(ObjectPositionSampler):
         for sampler in self.samplers.values():
             sampler.reset()
 
-    def sample(self, placed_objects=None, reference=None, on_top=True):
+    def sample(
+        self, placed_objects=None, reference=None, on_top=True, spatial_index=None
+    ):
         """
         Sample from each placement initializer sequentially, in the order
         that they were appended.
@@ -535,6 +836,9 @@ class SequentialCompositeSampler(ObjectPositionSampler):
                 z-offset of the current sampled object's bottom_offset + the reference object's top_offset
                 (if specified)
 
+            spatial_index (PlacementGrid): if specified, index over the placements in @placed_objects that is used to
+                find nearby placed objects. Newly sampled placements are added to it
+
         Return:
             dict: dictionary of all object placements, mapping object_names to (pos, quat, obj), including the
                 placements specified in @fixtures. Note quat is in (w,x,y,z) form
@@ -545,18 +849,60 @@ class SequentialCompositeSampler(ObjectPositionSampler):
         # Standardize inputs
         placed_objects = {} if placed_objects is None else copy(placed_objects)
 
-        # Iterate through all samplers to sample
-        for sampler, s_args in zip(self.samplers.values(), self.sample_args.values()):
-            # Pre-process sampler args
-            if s_args is None:
-                s_args = {}
-            for arg_name, arg in zip(("reference", "on_top"), (reference, on_top)):
-                if arg_name not in s_args:
-                    s_args[arg_name] = arg
-            # Run sampler
-            new_placements = sampler.sample(placed_objects=placed_objects, **s_args)
+        # index over all placements, shared by the sub-samplers and updated as objects are placed
+        if spatial_index is None:
+            spatial_index = PlacementGrid()
+        spatial_index.update(placed_objects)
+
+        self.failure_reasons = {}
+        sampler_names = list(self.samplers.keys())
+        # objects placed during this call mapped to the index of the sampler that placed them
+        placed_by = {}
+        num_failures = collections.Counter()
+        num_backtracks = 0
+
+        # Iterate through all samplers to sample, in order
+        pending = list(range(len(sampler_names)))
+        while len(pending) > 0:
+            i = pending.pop(0)
+            sampler = self.samplers[sampler_names[i]]
+            s_args = self._get_sample_args(sampler_names[i], reference, on_top)
+            try:
+                # Run sampler
+                new_placements = sampler.sample(
+                    placed_objects=placed_objects, spatial_index=spatial_index, **s_args
+                )
+            except RandomizationError as e:
+                for obj in sampler.mujoco_objects:
+                    self.failure_reasons[obj.name] = str(e)
+                    # drop placements the failed sampler already added to the index
+                    if obj.name in spatial_index and obj.name not in placed_objects:
+                        spatial_index.remove(obj.name)
+                if num_backtracks >= self.max_backtracks:
+                    raise
+                num_backtracks += 1
+                num_failures[i] += 1
+
+                # undo placements that may cause the failure, and sample them again after this sampler
+                undo = self._get_backtrack_samplers(i, reference, on_top, placed_by)
+                if sampler_names[i] in self.resamplers and (
+                    len(undo) == 0 or num_failures[i] > 2
+                ):
+                    self.samplers[sampler_names[i]] = self.resamplers[
+                        sampler_names[i]
+                    ]()
+                for (obj_name, j) in list(placed_by.items()):
+                    if j in undo:
+                        del placed_by[obj_name]
+                        del placed_objects[obj_name]
+                        spatial_index.remove(obj_name)
+                pending = sorted(set(pending) | undo | {i})
+                continue
+
             # Update placements
             placed_objects.update(new_placements)
+            for obj in sampler.mujoco_objects:
+                placed_by[obj.name] = i
 
         # only return placements for newly placed objects
         sampled_obj_names = [
@@ -566,6 +912,69 @@ class SequentialCompositeSampler(ObjectPositionSampler):
         ]
         return {k: v for (k, v) in placed_objects.items() if k in sampled_obj_names}
 
+    def _get_sample_args(self, sampler_name, reference=None, on_top=True):
+        """
+        Returns the arguments to pass to the sample() call of sub-sampler @sampler_name, filling in @reference and
+        @on_top if not specified for the sub-sampler
+        """
+        s_args = dict(self.sample_args[sampler_name] or {})
+        for arg_name, arg in zip(("reference", "on_top"), (reference, on_top)):
+            if arg_name not in s_args:
+                s_args[arg_name] = arg
+        return s_args
+
+    def _get_backtrack_samplers(self, index, reference, on_top, placed_by):
+        """
+        Determines which already placed sub-samplers to undo after sub-sampler @index failed: the sampler of the
+        placed object that blocked it most often, or else the root of the chain of placed objects it is placed
+        relative to. Samplers placed relative to an undone sampler are undone as well.
+
+        Args:
+            index (int): index of the failed sub-sampler
+
+            reference (str or 3-tuple or None): reference passed to sample()
+
+            on_top (bool): on_top passed to sample()
+
+            placed_by (dict): objects placed during the current sample() call mapped to their sampler index
+
+        Returns:
+            set: indices of the sub-samplers to undo
+        """
+        sampler_names = list(self.samplers.keys())
+
+        def get_parent(i):
+            ref = self._get_sample_args(sampler_names[i], reference, on_top)[
+                "reference"
+            ]
+            if isinstance(ref, str) and ref in placed_by:
+                return placed_by[ref]
+            return None
+
+        undo = set()
+        failure = getattr(self.samplers[sampler_names[index]], "last_failure", None)
+        blockers = [
+            name for name in (failure or {}).get("collisions", {}) if name in placed_by
+        ]
+        if len(blockers) > 0:
+            undo.add(placed_by[blockers[0]])
+        elif get_parent(index) is not None:
+            root = get_parent(index)
+            while get_parent(root) is not None:
+                root = get_parent(root)
+            undo.add(root)
+
+        # also undo everything placed relative to undone samplers
+        placed_indices = sorted(set(placed_by.values()))
+        changed = len(undo) > 0
+        while changed:
+            changed = False
+            for i in placed_indices:
+                if i not in undo and get_parent(i) in undo:
+                    undo.add(i)
+                    changed = True
+        return undo
+
 
 class MultiRegionSampler(ObjectPositionSampler):
     def __init__(
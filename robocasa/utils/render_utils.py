@@ -0,0 +1,189 @@
+"""
+Single-pass multi-modality offscreen rendering. MjSim.render renders the scene again for every modality.
+Here RGB and depth are read back from one render per camera, and segmentation reuses the same scene update,
+with only a second rasterization. Results are written into preallocated buffers that are reused across calls.
+"""
+import mujoco
+import numpy as np
+from robosuite.utils.binding_utils import _MjSim_render_lock
+
+
+class RenderOutput:
+    """
+    Struct of arrays holding the images rendered for a list of cameras. Images are bottom-up, as returned by
+    MjSim.render
+
+    Args:
+        camera_names (list): names of the rendered cameras
+
+        rgb (np.array): (n_cam, H, W, 3) uint8 RGB images
+
+        depth (np.array): (n_cam, H, W) float32 normalized depth buffers, or None if not rendered
+
+        seg (np.array): (n_cam, H, W, 2) int32 (object type, object id) segmentation maps, -1 for the background.
+            None if not rendered
+    """
+
+    def __init__(self, camera_names, rgb, depth=None, seg=None):
+        self.camera_names = camera_names
+        self.rgb = rgb
+        self.depth = depth
+        self.seg = seg
+
+    def __getitem__(self, camera_name):
+        """
+        Returns:
+            dict: rgb, depth and seg images of camera @camera_name
+        """
+        i = self.camera_names.index(camera_name)
+        return dict(
+            rgb=self.rgb[i],
+            depth=None if self.depth is None else self.depth[i],
+            seg=None if self.seg is None else self.seg[i],
+        )
+
+
+class MultiModalityRenderer:
+    """
+    Renders RGB, depth and segmentation images for multiple cameras of a sim, using the persistent offscreen
+    render context of the sim
+
+    Args:
+        sim (MjSim): simulation to render
+    """
+
+    def __init__(self, sim):
+        self.sim = sim
+        self._buffers = {}
+
+    def _get_buffer(self, key, shape, dtype):
+        buf = self._buffers.get(key, None)
+        if buf is None or buf.shape != shape:
+            buf = np.empty(shape, dtype=dtype)
+            self._buffers[key] = buf
+        return buf
+
+    def _get_render_context(self, width, height):
+        """
+        Returns the offscreen render context of the sim, creating it if needed and growing its offscreen buffer
+        to at least @width x @height, as MjRenderContext.render does
+
+        Returns:
+            MjRenderContextOffscreen: render context
+        """
+        if self.sim._render_context_offscreen is None:
+            from robosuite.utils.binding_utils import MjRenderContextOffscreen
+
+            # registers itself as the offscreen render context of the sim
+            MjRenderContextOffscreen(self.sim, device_id=-1)
+        ctx = self.sim._render_context_offscreen
+        if width > ctx.con.offWidth or height > ctx.con.offHeight:
+            new_width = max(width, ctx.model.vis.global_.offwidth)
+            new_height = max(height, ctx.model.vis.global_.offheight)
+            ctx.update_offscreen_size(new_width, new_height)
+        return ctx
+
+    def render(self, camera_names, width, height, depth=True, segmentation=True):
+        """
+        Renders all requested modalities for each camera with a single scene update per camera
+
+        Args:
+            camera_names (list): names of the cameras to render
+
+            width (int): image width
+
+            height (int): image height
+
+            depth (bool): whether to render depth
+
+            segmentation (bool): whether to render segmentation
+
+        Returns:
+            RenderOutput: rendered images. The arrays are reused by the next call with the same shapes, copy
+                them to keep them
+        """
+        n = len(camera_names)
+        rgb = self._get_buffer("rgb", (n, height, width, 3), np.uint8)
+        depth_img = (
+            self._get_buffer("depth", (n, height, width), np.float32) if depth else None
+        )
+        seg = (
+            self._get_buffer("seg", (n, height, width, 2), np.int32)
+            if segmentation
+            else None
+        )
+
+        # same locking as MjSim.render, the render context is shared with it
+        with _MjSim_render_lock:
+            self._render(camera_names, width, height, rgb, depth_img, seg)
+
+        return RenderOutput(list(camera_names), rgb, depth=depth_img, seg=seg)
+
+    def _render(self, camera_names, width, height, rgb, depth, seg):
+        """
+        Renders each camera into the preallocated @rgb, @depth and @seg buffers (@depth and @seg may be None)
+        """
+        ctx = self._get_render_context(width, height)
+        if hasattr(ctx, "gl_ctx"):
+            ctx.gl_ctx.make_current()
+        model = self.sim.model._model
+        data = self.sim.data._data
+        scn = ctx.scn
+        viewport = mujoco.MjrRect(0, 0, width, height)
+
+        for (i, camera_name) in enumerate(camera_names):
+            ctx.cam.type = mujoco.mjtCamera.mjCAMERA_FIXED
+            ctx.cam.fixedcamid = self.sim.model.camera_name2id(camera_name)
+            mujoco.mjv_updateScene(
+                model,
+                data,
+                ctx.vopt,
+                ctx.pert,
+                ctx.cam,
+                mujoco.mjtCatBit.mjCAT_ALL,
+                scn,
+            )
+            mujoco.mjr_render(viewport, scn, ctx.con)
+            mujoco.mjr_readPixels(
+                rgb[i], None if depth is None else depth[i], viewport, ctx.con
+            )
+
+            if seg is not None:
+                # same scene, rasterized again with geom ids as colors
+                seg_rgb = self._get_buffer("seg_rgb", (height, width, 3), np.uint8)
+                scn.flags[mujoco.mjtRndFlag.mjRND_SEGMENT] = 1
+                scn.flags[mujoco.mjtRndFlag.mjRND_IDCOLOR] = 1
+                try:
+                    mujoco.mjr_render(viewport, scn, ctx.con)
+                    mujoco.mjr_readPixels(seg_rgb, None, viewport, ctx.con)
+                finally:
+                    scn.flags[mujoco.mjtRndFlag.mjRND_SEGMENT] = 0
+                    scn.flags[mujoco.mjtRndFlag.mjRND_IDCOLOR] = 0
+                self._decode_segmentation(scn, seg_rgb, seg[i])
+
+    def _decode_segmentation(self, scn, seg_rgb, out):
+        """
+        Converts an id-colored image into (object type, object id) pairs, as MjRenderContext.read_pixels does
+
+        Args:
+            scn (MjvScene): scene the image was rendered from
+
+            seg_rgb (np.array): (H, W, 3) id-colored image
+
+            out (np.array): (H, W, 2) output array
+        """
+        ids = self._get_buffer("seg_ids", seg_rgb.shape[:2], np.int32)
+        ids[:] = seg_rgb[:, :, 2]
+        ids <<= 8
+        ids |= seg_rgb[:, :, 1]
+        ids <<= 8
+        ids |= seg_rgb[:, :, 0]
+        ids[ids >= scn.ngeom + 1] = 0
+
+        seg_ids = np.full((scn.ngeom + 1, 2), fill_value=-1, dtype=np.int32)
+        for j in range(scn.ngeom):
+            geom = scn.geoms[j]
+            if geom.segid != -1:
+                seg_ids[geom.segid + 1, 0] = geom.objtype
+                seg_ids[geom.segid + 1, 1] = geom.objid
+        np.take(seg_ids, ids, axis=0, out=out)
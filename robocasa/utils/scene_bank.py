@@ -0,0 +1,72 @@
+"""
+Utilities for reading and writing scene banks: pre-generated, valid kitchen scenes that environments can
+draw episodes from instead of sampling scenes online (see robocasa/scripts/generate_scene_bank.py).
+
+Each entry consists of
+    - ep_meta: episode meta data (see Kitchen.get_ep_meta) extended with the fixture placements, object
+        placements and robot base pose of the scene
+    - state: the flattened sim state after the scene has been reset and settled
+"""
+import json
+
+import h5py
+import numpy as np
+
+
+def _to_serializable(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError("{} is not JSON serializable".format(type(value)))
+
+
+def save_scene_bank(path, entries, env_name=None):
+    """
+    Writes scene bank entries to an hdf5 file
+
+    Args:
+        path (str): path to the hdf5 file
+
+        entries (list of dict): scene bank entries, each with "ep_meta" and "state" keys
+
+        env_name (str): name of the environment the scenes were generated for
+    """
+    with h5py.File(path, "w") as f:
+        if env_name is not None:
+            f.attrs["env"] = env_name
+        grp = f.create_group("data")
+        for (i, entry) in enumerate(entries):
+            ep_grp = grp.create_group("scene_{}".format(i))
+            ep_grp.attrs["ep_meta"] = json.dumps(
+                entry["ep_meta"], default=_to_serializable
+            )
+            ep_grp.create_dataset("state", data=np.array(entry["state"]))
+
+
+class SceneBank:
+    """
+    In-memory collection of scene bank entries loaded from an hdf5 file written by save_scene_bank
+
+    Args:
+        path (str): path to the hdf5 file
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with h5py.File(path, "r") as f:
+            self.env_name = f.attrs.get("env", None)
+            scene_keys = sorted(f["data"].keys(), key=lambda k: int(k.split("_")[-1]))
+            self.entries = [
+                dict(
+                    ep_meta=json.loads(f["data"][k].attrs["ep_meta"]),
+                    state=np.array(f["data"][k]["state"]),
+                )
+                for k in scene_keys
+            ]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __getitem__(self, index):
+        return self.entries[index]
@@ -0,0 +1,267 @@
+"""
+Lookup-table segmentation post-processing. The segmentation maps rendered by MuJoCo hold geom ids (-1 for
+the background). All per-geom information (name, owner instance, semantic class, robot mask, colors) is
+gathered once per model into arrays indexed by geom id + 1, so that filtered, instance and class maps are a
+single fancy-index over the segmentation map and the visible geoms a single bincount.
+
+Semantic classes are keyed by object category (OBJ_CATEGORIES) and fixture class, with ids that do not
+depend on the scene, so that label maps of different layouts, episodes and workers can be mixed.
+"""
+import mujoco
+import numpy as np
+
+from robocasa.models.objects.kitchen_objects import OBJ_CATEGORIES
+
+# geoms whose names start with these prefixes are removed from the filtered segmentation maps
+EXCLUDED_GEOM_PREFIXES = ("base", "robot")
+
+# classes that are not an object category or fixture class. "object" and "fixture" are the fallbacks for
+# unknown object categories and fixture classes
+RESERVED_CLASSES = ["background", "robot", "object", "fixture"]
+
+# fixture classes placed in the kitchen scenes. New classes must be appended to keep the class ids stable
+FIXTURE_CLASSES = [
+    "Wall",
+    "Floor",
+    "Box",
+    "Counter",
+    "SingleCabinet",
+    "HingeCabinet",
+    "OpenCabinet",
+    "Drawer",
+    "PanelCabinet",
+    "HousingCabinet",
+    "Stove",
+    "Stovetop",
+    "Oven",
+    "Microwave",
+    "Sink",
+    "Hood",
+    "Fridge",
+    "Dishwasher",
+    "Accessory",
+    "CoffeeMachine",
+    "Toaster",
+    "Stool",
+    "WallAccessory",
+    "Window",
+    "FramedWindow",
+]
+
+_semantic_classes = None
+
+
+def get_semantic_classes():
+    """
+    Returns:
+        list: names of the semantic classes, the class id being the index. Reserved classes come first, then the
+            fixture classes and the object categories in alphabetical order
+    """
+    global _semantic_classes
+    if _semantic_classes is None:
+        _semantic_classes = (
+            RESERVED_CLASSES + FIXTURE_CLASSES + sorted(OBJ_CATEGORIES.keys())
+        )
+    return _semantic_classes
+
+
+def get_geom_ids(seg):
+    """
+    Returns:
+        np.array: geom id map of a (..., 2) (object type, object id) segmentation map, -1 for the background and
+            for pixels of objects that are not geoms
+    """
+    return np.where(seg[..., 0] == mujoco.mjtObj.mjOBJ_GEOM, seg[..., 1], -1)
+
+
+def id_colors(ids):
+    """
+    Returns:
+        np.array: (..., 3) uint8 colors encoding @ids in their (r, g, b) bytes
+    """
+    ids = np.asarray(ids, dtype=np.int64)
+    return np.stack(
+        [ids % 256, (ids // 256) % 256, (ids // 65536) % 256], axis=-1
+    ).astype(np.uint8)
+
+
+def segment_centroids(seg_map, ids):
+    """
+    Computes the pixel centroid of each segment of a segmentation map
+
+    Args:
+        seg_map (np.array): (H, W) integer segmentation map
+
+        ids (list of int): segment ids to compute the centroids of
+
+    Returns:
+        dict: segment id to (row, col) centroid, for the ids present in @seg_map
+    """
+    seg_map = np.asarray(seg_map)
+    if seg_map.size == 0:
+        return {}
+    height, width = seg_map.shape
+    offset = min(int(seg_map.min()), 0)
+    values = (seg_map - offset).ravel().astype(np.int64)
+    counts = np.bincount(values)
+    rows = np.bincount(values, weights=np.repeat(np.arange(height), width))
+    cols = np.bincount(values, weights=np.tile(np.arange(width), height))
+
+    centroids = {}
+    for seg_id in ids:
+        i = int(seg_id) - offset
+        if 0 <= i < len(counts) and counts[i] > 0:
+            centroids[seg_id] = (int(rows[i] / counts[i]), int(cols[i] / counts[i]))
+    return centroids
+
+
+class SegmentationTable:
+    """
+    Per-model lookup table from geom ids to segmentation labels. Entry 0 of every array is the background
+    (geom id -1), entry i + 1 is geom i
+
+    Args:
+        sim (MjSim): simulation whose model is indexed
+
+        owners (list): (name, root body name, class name) of every instance (object, fixture, robot). All
+            geoms in the body subtree of the root body belong to the instance, unless they belong to an
+            instance rooted further down the tree
+
+        robot_owners (list): names of the owners that are robots
+
+        classes (list): class names, the class id being the index. If None, classes are numbered in order of
+            appearance in @owners, starting from 1 (0 is the background)
+    """
+
+    def __init__(self, sim, owners, robot_owners=(), classes=None):
+        model = sim.model
+        self.model = model._model
+        self.ngeom = model.ngeom
+        n = self.ngeom + 1
+
+        self.geom_names = [""] + [
+            model.geom_id2name(i) or "" for i in range(self.ngeom)
+        ]
+        self.named = np.array([len(name) > 0 for name in self.geom_names], dtype=bool)
+        self.excluded = np.array(
+            [name.startswith(EXCLUDED_GEOM_PREFIXES) for name in self.geom_names],
+            dtype=bool,
+        )
+        self.named[0] = False
+
+        # instance 0 is the background / unowned geoms
+        self.instance_names = ["background"]
+        self.class_names = ["background"] if classes is None else list(classes)
+        class_ids = {name: i for (i, name) in enumerate(self.class_names)}
+        instance_classes = [0]
+        body_instance = np.zeros(model.nbody, dtype=np.int32)
+        for (name, root_body, class_name) in owners:
+            try:
+                body_id = model.body_name2id(root_body)
+            except ValueError:
+                continue
+            if class_name not in class_ids:
+                if classes is not None:
+                    raise ValueError("Unknown segmentation class {}".format(class_name))
+                class_ids[class_name] = len(self.class_names)
+                self.class_names.append(class_name)
+            self.instance_names.append(name)
+            instance_classes.append(class_ids[class_name])
+            body_instance[body_id] = len(self.instance_names) - 1
+
+        # bodies are ordered so that parents come before their children
+        parent_ids = np.asarray(model.body_parentid)
+        for body_id in range(1, model.nbody):
+            if body_instance[body_id] == 0:
+                body_instance[body_id] = body_instance[parent_ids[body_id]]
+
+        self.instance_classes = np.array(instance_classes, dtype=np.int32)
+        self.instance = np.zeros(n, dtype=np.int32)
+        self.instance[1:] = body_instance[np.asarray(model.geom_bodyid)]
+        self.semantic_class = self.instance_classes[self.instance]
+
+        robot_instances = [
+            i for (i, name) in enumerate(self.instance_names) if name in robot_owners
+        ]
+        self.robot = np.isin(self.instance, robot_instances)
+        self.robot[0] = False
+
+        # geoms kept in the filtered segmentation maps. geom 0 is left out, its id color is the background's
+        self.keep = self.named & ~self.excluded
+        self.keep[1] = False
+        # geom ids encoded as colors, entry 0 encodes -1 as white
+        self.id_color = id_colors(np.arange(-1, self.ngeom))
+        self.rgba = np.zeros((n, 4), dtype=np.uint8)
+        self.rgba[self.keep, :3] = self.id_color[self.keep]
+        self.rgba[self.keep, 3] = 255
+
+    def index(self, seg_map):
+        """
+        Returns:
+            np.array: lookup table indices (geom id + 1) of a geom id segmentation map. Ids that are not geoms of
+                the model map to the background
+        """
+        idx = np.asarray(seg_map, dtype=np.int64) + 1
+        idx[(idx < 0) | (idx >= self.ngeom + 1)] = 0
+        return idx
+
+    def get_mapping(self):
+        """
+        Returns:
+            dict: geom id to geom name, for all named geoms
+        """
+        return {i - 1: self.geom_names[i] for i in np.flatnonzero(self.named).tolist()}
+
+    def filter(self, seg_map):
+        """
+        Returns:
+            np.array: (H, W, 4) RGBA map, with the geom id encoded in the color of kept geoms and transparent
+                elsewhere
+        """
+        return self.rgba[self.index(seg_map)]
+
+    def instance_map(self, seg_map, out=None):
+        """
+        Returns:
+            np.array: map of instance ids (indices into instance_names, 0 for the background), same shape as
+                @seg_map. Written into @out if given
+        """
+        return np.take(self.instance, self.index(seg_map), out=out)
+
+    def class_map(self, seg_map, out=None):
+        """
+        Returns:
+            np.array: map of class ids (indices into class_names, 0 for the background), same shape as @seg_map.
+                Written into @out if given
+        """
+        return np.take(self.semantic_class, self.index(seg_map), out=out)
+
+    def robot_mask(self, seg_map):
+        """
+        Returns:
+            np.array: (H, W) boolean map, True for the pixels showing a robot
+        """
+        return self.robot[self.index(seg_map)]
+
+    def pixel_counts(self, seg_map):
+        """
+        Returns:
+            np.array: number of pixels of every lookup table entry (background first, then every geom)
+        """
+        return np.bincount(self.index(seg_map).ravel(), minlength=self.ngeom + 1)
+
+    def visible_mapping(self, seg_map, include_unnamed=False):
+        """
+        Returns:
+            dict: geom id to geom name of the geoms visible in @seg_map, without the excluded (robot) geoms and
+                geom 0. Unnamed geoms are named "Unknown" if @include_unnamed is set and left out otherwise
+        """
+        visible = self.pixel_counts(seg_map) > 0
+        visible &= ~self.excluded
+        visible[:2] = False
+        if not include_unnamed:
+            visible &= self.named
+        return {
+            i - 1: self.geom_names[i] or "Unknown"
+            for i in np.flatnonzero(visible).tolist()
+        }
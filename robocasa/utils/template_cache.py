@@ -0,0 +1,56 @@
+"""
+Process-wide cache of parsed xml / yaml files.
+
+Fixtures and objects are re-created from the same few dozen asset files on every hard reset. The files are
+parsed once and every caller receives a deep copy, which is considerably cheaper than re-reading and
+re-parsing the file, and safe to modify in place.
+"""
+import os
+import xml.etree.ElementTree as ET
+from copy import deepcopy
+
+import yaml
+
+_XML_TEMPLATES = {}
+_YAML_TEMPLATES = {}
+
+
+def load_xml_template(fname):
+    """
+    Returns a copy of the root element of the xml file at @fname, parsing the file only once per process
+
+    Args:
+        fname (str): path to the xml file
+
+    Returns:
+        ET.Element: root of a freshly copied element tree
+    """
+    key = os.path.abspath(fname)
+    if key not in _XML_TEMPLATES:
+        _XML_TEMPLATES[key] = ET.parse(key).getroot()
+    return deepcopy(_XML_TEMPLATES[key])
+
+
+def load_yaml_template(fname):
+    """
+    Returns a copy of the contents of the yaml file at @fname, loading the file only once per process
+
+    Args:
+        fname (str): path to the yaml file
+
+    Returns:
+        object: freshly copied yaml contents
+    """
+    key = os.path.abspath(fname)
+    if key not in _YAML_TEMPLATES:
+        with open(key, "r") as f:
+            _YAML_TEMPLATES[key] = yaml.safe_load(f)
+    return deepcopy(_YAML_TEMPLATES[key])
+
+
+def clear_template_cache():
+    """
+    Clears all cached templates, e.g. after asset files have been modified on disk
+    """
+    _XML_TEMPLATES.clear()
+    _YAML_TEMPLATES.clear()
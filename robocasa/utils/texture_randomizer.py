@@ -0,0 +1,191 @@
+"""
+Runtime randomization of the generative textures of a compiled kitchen model. Instead of rewriting
+the MJCF and recompiling, new texture images are written into the texture buffers of the replacement
+texture slots (see texture_swap.py) and re-uploaded to the render context.
+"""
+from collections import OrderedDict
+
+import mujoco
+import numpy as np
+
+# names of the texture slots created by texture_swap.apply_generative_textures, per texture category
+GEN_TEXTURE_SLOTS = OrderedDict(
+    cab_tex=["cab_replacement_texture_2d", "cab_replacement_texture_cube"],
+    counter_tex=["counter_top_replacement_texture"],
+    wall_tex=["wall_replacement_texture"],
+    floor_tex=["floor_replacement_texture"],
+)
+
+
+class TextureBank:
+    """
+    LRU cache of decoded texture images, resized to the shapes of the texture slots they are written to
+
+    Args:
+        max_size (int): maximum number of images to keep in memory
+    """
+
+    def __init__(self, max_size=64):
+        self.max_size = max_size
+        self._images = OrderedDict()
+
+    def get(self, path, width, height, nchannel=3):
+        """
+        Returns the image at @path as a (height, width, nchannel) uint8 array
+
+        Args:
+            path (str): path to the image file
+
+            width (int): width to resize the image to
+
+            height (int): height to resize the image to
+
+            nchannel (int): number of channels (3 for RGB, 4 for RGBA)
+
+        Returns:
+            np.array: decoded image
+        """
+        key = (str(path), width, height, nchannel)
+        img = self._images.get(key, None)
+        if img is not None:
+            self._images.move_to_end(key)
+            return img
+
+        from PIL import Image
+
+        with Image.open(path) as f:
+            f = f.convert("RGBA" if nchannel == 4 else "RGB")
+            if f.size != (width, height):
+                f = f.resize((width, height), Image.BILINEAR)
+            img = np.asarray(f, dtype=np.uint8)
+
+        self._images[key] = img
+        if len(self._images) > self.max_size:
+            self._images.popitem(last=False)
+        return img
+
+    def __len__(self):
+        return len(self._images)
+
+
+class TextureRandomizer:
+    """
+    Writes generative textures into the replacement texture slots of a compiled model. The model must have
+    been compiled with generative textures so that the slots exist.
+
+    Args:
+        bank (TextureBank): cache of decoded images, a new one is created if not specified
+    """
+
+    def __init__(self, bank=None):
+        self.bank = bank if bank is not None else TextureBank()
+        self._model = None
+        self._slots = None
+
+    def bind(self, model):
+        """
+        Looks up the texture slots of @model. Called automatically when a different model is passed to apply
+
+        Args:
+            model (mujoco.MjModel): compiled model
+        """
+        self._model = model
+        self._slots = OrderedDict()
+        tex_nchannel = getattr(model, "tex_nchannel", None)
+        for (category, tex_names) in GEN_TEXTURE_SLOTS.items():
+            slots = []
+            for tex_name in tex_names:
+                tex_id = mujoco.mj_name2id(model, mujoco.mjtObj.mjOBJ_TEXTURE, tex_name)
+                if tex_id < 0:
+                    continue
+                slots.append(
+                    dict(
+                        id=tex_id,
+                        adr=int(model.tex_adr[tex_id]),
+                        width=int(model.tex_width[tex_id]),
+                        height=int(model.tex_height[tex_id]),
+                        nchannel=3
+                        if tex_nchannel is None
+                        else int(tex_nchannel[tex_id]),
+                        cube=model.tex_type[tex_id] == mujoco.mjtTexture.mjTEXTURE_CUBE,
+                    )
+                )
+            self._slots[category] = slots
+
+    @property
+    def num_slots(self):
+        return 0 if self._slots is None else sum(len(s) for s in self._slots.values())
+
+    def _tex_buffer(self):
+        # mujoco renamed tex_rgb to tex_data when adding textures with other than 3 channels
+        if hasattr(self._model, "tex_data"):
+            return self._model.tex_data
+        return self._model.tex_rgb
+
+    def apply(self, sim, textures):
+        """
+        Writes @textures into the texture slots of the model of @sim and uploads them to its render context
+
+        Args:
+            sim (MjSim): simulation whose model is modified in place
+
+            textures (dict): texture paths per category (see texture_swap.get_random_textures)
+
+        Returns:
+            list: ids of the textures that were updated
+        """
+        model = sim.model._model
+        if model is not self._model:
+            self.bind(model)
+
+        tex_buffer = self._tex_buffer()
+        updated = []
+        for (category, slots) in self._slots.items():
+            if category not in textures:
+                continue
+            for slot in slots:
+                w, h, c = slot["width"], slot["height"], slot["nchannel"]
+                if slot["cube"]:
+                    # a cube texture loaded from a single file repeats the image on all six faces
+                    face_h = h // 6
+                    img = self.bank.get(textures[category], w, face_h, c)
+                    img = np.tile(img, (6, 1, 1))
+                else:
+                    img = self.bank.get(textures[category], w, h, c)
+                tex_buffer[slot["adr"] : slot["adr"] + w * h * c] = img.reshape(-1)
+                updated.append(slot["id"])
+
+        self.upload(sim, updated)
+        return updated
+
+    def upload(self, sim, tex_ids):
+        """
+        Re-uploads textures @tex_ids to the render context of @sim, if there is one. Render contexts that are
+        created later upload all textures of the model themselves.
+
+        Args:
+            sim (MjSim): simulation
+
+            tex_ids (list): ids of the textures to upload
+        """
+        render_context = getattr(sim, "_render_context_offscreen", None)
+        if render_context is None:
+            return
+        for tex_id in tex_ids:
+            render_context.upload_texture(tex_id)
+
+    def preload(self, paths, category):
+        """
+        Decodes the images at @paths into the bank ahead of time, at the shape of the slots of @category
+        of the bound model
+
+        Args:
+            paths (list): paths to image files
+
+            category (str): texture category, one of GEN_TEXTURE_SLOTS
+        """
+        assert self._slots is not None, "bind a model first"
+        for slot in self._slots[category]:
+            h = slot["height"] // 6 if slot["cube"] else slot["height"]
+            for path in paths:
+                self.bank.get(path, slot["width"], h, slot["nchannel"])
@@ -454,6 +454,218 @@ def get_random_textures(rng, frac=1.0):
     return textures
 
 
+class AssetIndex:
+    """
+    Index of the material and texture elements of a parsed MJCF tree. It is built once per tree and
+    shared by all texture replacement passes, so that each pass does not have to search the asset
+    element again. Works with both lxml and xml.etree trees.
+
+    Args:
+        root (Element): root element of the parsed MJCF tree
+    """
+
+    def __init__(self, root):
+        self.asset = root.find("asset")
+        self.materials = self.asset.findall("material")
+        self.textures = {}
+        for tex in self.asset.findall("texture"):
+            self.textures.setdefault(tex.get("name"), []).append(tex)
+
+    def find_materials(self, predicate):
+        """
+        Returns:
+            list: material elements whose name satisfies @predicate
+        """
+        return [mat for mat in self.materials if predicate(mat.get("name"))]
+
+    def get_textures(self, name):
+        """
+        Returns:
+            list: texture elements with name @name
+        """
+        return self.textures.get(name, [])
+
+    def rename_texture(self, tex, name):
+        """
+        Renames texture element @tex to @name and keeps the index up to date
+        """
+        old_name = tex.get("name")
+        self.textures[old_name].remove(tex)
+        tex.set("name", name)
+        self.textures.setdefault(name, []).append(tex)
+
+    def add_texture(self, **attribs):
+        """
+        Appends a new texture element with attributes @attribs to the asset element
+
+        Returns:
+            Element: the new texture element
+        """
+        tex = self.asset.makeelement("texture", attribs)
+        self.asset.append(tex)
+        self.textures.setdefault(tex.get("name"), []).append(tex)
+        return tex
+
+
+def _is_counter_top_mat(name):
+    return "counter_top" in name
+
+
+def _is_floor_mat(name):
+    return "floor" in name and "backing" not in name
+
+
+def _is_wall_mat(name):
+    return "wall" in name and "floor" not in name and "backing" not in name
+
+
+def _swap_material_texture(index, mat_predicate, new_tex_name, new_texture_file):
+    """
+    Replaces the texture referenced by the first material matching @mat_predicate with
+    @new_texture_file, renames it to @new_tex_name and references it in all matching materials
+
+    Returns:
+        2-tuple:
+            - (list) the matching material elements
+            - (list) the replaced texture elements
+    """
+    mats = index.find_materials(mat_predicate)
+
+    # step 1: find the name of texture that will be replaced
+    assert len(mats) > 0 and mats[0].get("texture") is not None
+    old_tex_name = mats[0].get("texture")
+
+    # step 2: find and replace texture element
+    texs = list(index.get_textures(old_tex_name))
+    for tex in texs:
+        index.rename_texture(tex, new_tex_name)
+        tex.set("file", str(new_texture_file))
+
+    # step 3: reference new textures in materials
+    for mat in mats:
+        mat.set("texture", new_tex_name)
+
+    return mats, texs
+
+
+def apply_counter_top_texture(index, new_counter_top_texture_file):
+    """
+    Replaces the counter top textures of an indexed MJCF tree in place.
+
+    Args:
+        index (AssetIndex): index of the tree to modify
+
+        new_counter_top_texture_file (str): New texture file for counter top
+    """
+    _swap_material_texture(
+        index,
+        _is_counter_top_mat,
+        "counter_top_replacement_texture",
+        new_counter_top_texture_file,
+    )
+
+
+def apply_cab_textures(index, new_cab_texture_file):
+    """
+    Replaces the cabinet and counter base textures of an indexed MJCF tree in place.
+
+    Args:
+        index (AssetIndex): index of the tree to modify
+
+        new_cab_texture_file (str): New texture file for counter base and cabinets
+    """
+    CAB_TEX_NAME_2D = "cab_replacement_texture_2d"
+    CAB_TEX_NAME_CUBE = "cab_replacement_texture_cube"
+    for (tex_name, tex_type) in [(CAB_TEX_NAME_2D, "2d"), (CAB_TEX_NAME_CUBE, "cube")]:
+        textures = index.get_textures(tex_name)
+        if len(textures) > 0:
+            textures[0].set("file", str(new_cab_texture_file))
+        else:
+            index.add_texture(
+                type=tex_type, name=tex_name, file=str(new_cab_texture_file)
+            )
+
+    for mat in index.materials:
+        name = mat.get("name")
+        if "counter_base" in name:
+            mat.set("texture", CAB_TEX_NAME_CUBE)
+        elif "housing" in name:
+            mat.set("texture", CAB_TEX_NAME_CUBE)
+        elif (
+            "stack" in name
+            or "cab" in name
+            or "shelves" in name
+            or "bottom" in name
+            or ("top" in name and "counter" not in name and "stove" not in name)
+        ):
+            if "handle" in name or "transparent" in name:
+                continue
+            elif "door" in name:
+                mat.set("texture", CAB_TEX_NAME_2D)
+            elif "shelves" in name:
+                mat.set("texture", CAB_TEX_NAME_2D)
+            else:
+                mat.set("texture", CAB_TEX_NAME_CUBE)
+
+
+def apply_floor_texture(index, new_floor_texture_file):
+    """
+    Replaces the floor textures of an indexed MJCF tree in place.
+
+    Args:
+        index (AssetIndex): index of the tree to modify
+
+        new_floor_texture_file (str): New texture file for the floor
+    """
+    FLOOR_TEX_NAME = "floor_replacement_texture"
+    mats, texs = _swap_material_texture(
+        index, _is_floor_mat, FLOOR_TEX_NAME, new_floor_texture_file
+    )
+    for tex in texs:
+        tex.set("type", "2d")
+    for mat in mats:
+        mat.set("texrepeat", "2 2")
+
+
+def apply_wall_texture(index, new_wall_texture_file):
+    """
+    Replaces the wall textures of an indexed MJCF tree in place.
+
+    Args:
+        index (AssetIndex): index of the tree to modify
+
+        new_wall_texture_file (str): New texture file for the walls
+    """
+    WALL_TEX_NAME = "wall_replacement_texture"
+    mats, texs = _swap_material_texture(
+        index, _is_wall_mat, WALL_TEX_NAME, new_wall_texture_file
+    )
+    for tex in texs:
+        tex.set("type", "2d")
+    for mat in mats:
+        mat.set("texrepeat", "3 3")
+
+
+def apply_generative_textures(root, textures, index=None):
+    """
+    Replaces the cabinet, counter top, wall and floor textures of a parsed MJCF tree in place.
+
+    Args:
+        root (Element): root element of the parsed MJCF tree
+
+        textures (dict): texture paths with keys cab_tex, counter_tex, wall_tex and floor_tex
+            (see get_random_textures)
+
+        index (AssetIndex): (optional) precomputed index of @root
+    """
+    if index is None:
+        index = AssetIndex(root)
+    apply_cab_textures(index, textures["cab_tex"])
+    apply_counter_top_texture(index, textures["counter_tex"])
+    apply_wall_texture(index, textures["wall_tex"])
+    apply_floor_texture(index, textures["floor_tex"])
+
+
 def replace_counter_top_texture(
     rng, initial_state: str, new_counter_top_texture_file: str = None
 ):
@@ -470,7 +682,6 @@ def replace_counter_top_texture(
     """
 
     root = ET.fromstring(initial_state)
-    asset = root.find("asset")
 
     if new_counter_top_texture_file is None:
         new_counter_top_texture_file = get_random_textures(rng)["counter_tex"]
@@ -479,28 +690,7 @@ def replace_counter_top_texture(
             TEXTURES_DIR, new_counter_top_texture_file
         )
 
-    # step 1: find the name of texture that will be replaced
-    counter_tex_name = None
-    for mat in asset.findall("material"):
-        name = mat.get("name")
-        if "counter_top" in name:
-            counter_tex_name = mat.get("texture")
-            break
-    assert counter_tex_name is not None
-
-    # step 2: find and replace texture element
-    CTOP_TEX_NAME = "counter_top_replacement_texture"
-    for tex in asset.findall("texture"):
-        name = tex.get("name")
-        if name == counter_tex_name:
-            tex.set("name", CTOP_TEX_NAME)
-            tex.set("file", str(new_counter_top_texture_file))
-
-    # step 3: reference new textures in materials
-    for mat in asset.findall("material"):
-        name = mat.get("name")
-        if "counter_top" in name:
-            mat.set("texture", CTOP_TEX_NAME)
+    apply_counter_top_texture(AssetIndex(root), new_counter_top_texture_file)
 
     return ET.tostring(root).decode("utf-8")
 
@@ -519,61 +709,13 @@ def replace_cab_textures(rng, initial_state: str, new_cab_texture_file: str = No
     """
 
     root = ET.fromstring(initial_state)
-    asset = root.find("asset")
 
     if new_cab_texture_file is None:
         new_cab_texture_file = get_random_textures(rng)["cab_tex"]
     else:
         new_cab_texture_file = os.path.join(TEXTURES_DIR, new_cab_texture_file)
 
-    CAB_TEX_NAME_2D = "cab_replacement_texture_2d"
-    tex_2d = find_elements(
-        asset, tags="texture", attribs={"name": CAB_TEX_NAME_2D}, return_first=True
-    )
-    if tex_2d is not None:
-        tex_2d.set("file", str(new_cab_texture_file))
-    else:
-        tex_2d = ET.Element(
-            "texture", type="2d", name=CAB_TEX_NAME_2D, file=str(new_cab_texture_file)
-        )
-        asset.append(tex_2d)
-
-    CAB_TEX_NAME_CUBE = "cab_replacement_texture_cube"
-    tex_cube = find_elements(
-        asset, tags="texture", attribs={"name": CAB_TEX_NAME_CUBE}, return_first=True
-    )
-    if tex_cube is not None:
-        tex_cube.set("file", str(new_cab_texture_file))
-    else:
-        tex_cube = ET.Element(
-            "texture",
-            type="cube",
-            name=CAB_TEX_NAME_CUBE,
-            file=str(new_cab_texture_file),
-        )
-        asset.append(tex_cube)
-
-    for mat in asset.findall("material"):
-        name = mat.get("name")
-        if "counter_base" in name:
-            mat.set("texture", CAB_TEX_NAME_CUBE)
-        elif "housing" in name:
-            mat.set("texture", CAB_TEX_NAME_CUBE)
-        elif (
-            "stack" in name
-            or "cab" in name
-            or "shelves" in name
-            or "bottom" in name
-            or ("top" in name and "counter" not in name and "stove" not in name)
-        ):
-            if "handle" in name or "transparent" in name:
-                continue
-            elif "door" in name:
-                mat.set("texture", CAB_TEX_NAME_2D)
-            elif "shelves" in name:
-                mat.set("texture", CAB_TEX_NAME_2D)
-            else:
-                mat.set("texture", CAB_TEX_NAME_CUBE)
+    apply_cab_textures(AssetIndex(root), new_cab_texture_file)
 
     return ET.tostring(root).decode("utf-8")
 
@@ -592,37 +734,13 @@ def replace_floor_texture(rng, initial_state: str, new_floor_texture_file: str =
     """
 
     root = ET.fromstring(initial_state)
-    asset = root.find("asset")
 
     if new_floor_texture_file is None:
         new_floor_texture_file = get_random_textures(rng)["floor_tex"]
     else:
         new_floor_texture_file = os.path.join(TEXTURES_DIR, new_floor_texture_file)
 
-    # step 1: find the name of texture that will be replaced
-    floor_tex_name = None
-    for mat in asset.findall("material"):
-        name = mat.get("name")
-        if "floor" in name and "backing" not in name:
-            floor_tex_name = mat.get("texture")
-            break
-    assert floor_tex_name is not None
-
-    # step 2: find and replace texture element
-    FLOOR_TEX_NAME = "floor_replacement_texture"
-    for tex in asset.findall("texture"):
-        name = tex.get("name")
-        if name == floor_tex_name:
-            tex.set("name", FLOOR_TEX_NAME)
-            tex.set("file", str(new_floor_texture_file))
-            tex.set("type", "2d")
-
-    # step 3: reference new textures in materials
-    for mat in asset.findall("material"):
-        name = mat.get("name")
-        if "floor" in name and "backing" not in name:
-            mat.set("texture", FLOOR_TEX_NAME)
-            mat.set("texrepeat", "2 2")
+    apply_floor_texture(AssetIndex(root), new_floor_texture_file)
 
     return ET.tostring(root).decode("utf-8")
 
@@ -641,36 +759,12 @@ def replace_wall_texture(rng, initial_state: str, new_wall_texture_file: str = N
     """
 
     root = ET.fromstring(initial_state)
-    asset = root.find("asset")
 
     if new_wall_texture_file is None:
         new_wall_texture_file = get_random_textures(rng)["wall_tex"]
     else:
         new_wall_texture_file = os.path.join(TEXTURES_DIR, new_wall_texture_file)
 
-    # step 1: find the name of texture that will be replaced
-    wall_tex_name = None
-    for mat in asset.findall("material"):
-        name = mat.get("name")
-        if "wall" in name and "floor" not in name and "backing" not in name:
-            wall_tex_name = mat.get("texture")
-            break
-    assert wall_tex_name is not None
-
-    # step 2: add new texture element
-    WALL_TEX_NAME = "wall_replacement_texture"
-    for tex in asset.findall("texture"):
-        name = tex.get("name")
-        if name == wall_tex_name:
-            tex.set("name", WALL_TEX_NAME)
-            tex.set("file", str(new_wall_texture_file))
-            tex.set("type", "2d")
-
-    # step 3: reference new textures in materials
-    for mat in asset.findall("material"):
-        name = mat.get("name")
-        if "wall" in name and "floor" not in name and "backing" not in name:
-            mat.set("texture", WALL_TEX_NAME)
-            mat.set("texrepeat", "3 3")
+    apply_wall_texture(AssetIndex(root), new_wall_texture_file)
 
     return ET.tostring(root).decode("utf-8")
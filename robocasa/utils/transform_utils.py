@@ -0,0 +1,62 @@
+"""
+Batched versions of the robosuite transform utilities, operating on arrays of poses at once
+"""
+import numpy as np
+from robosuite.utils.transform_utils import EPS
+
+
+def quat_multiply_batch(quaternion1, quaternion0):
+    """
+    Batched version of quat_multiply for (..., 4) arrays of (x,y,z,w) quaternions
+
+    Args:
+        quaternion1 (np.array): (..., 4) array of (x,y,z,w) quaternions
+        quaternion0 (np.array): (..., 4) array of (x,y,z,w) quaternions
+
+    Returns:
+        np.array: (..., 4) array of multiplied (x,y,z,w) quaternions (q1 * q0)
+    """
+    x0, y0, z0, w0 = np.moveaxis(quaternion0, -1, 0)
+    x1, y1, z1, w1 = np.moveaxis(quaternion1, -1, 0)
+    return np.stack(
+        [
+            x1 * w0 + y1 * z0 - z1 * y0 + w1 * x0,
+            -x1 * z0 + y1 * w0 + z1 * x0 + w1 * y0,
+            x1 * y0 - y1 * x0 + z1 * w0 + w1 * z0,
+            -x1 * x0 - y1 * y0 - z1 * z0 + w1 * w0,
+        ],
+        axis=-1,
+    )
+
+
+def quat2mat_batch(quaternion):
+    """
+    Batched version of quat2mat for (N, 4) arrays of (x,y,z,w) quaternions
+
+    Args:
+        quaternion (np.array): (N, 4) array of (x,y,z,w) quaternions
+
+    Returns:
+        np.array: (N, 3, 3) rotation matrices
+    """
+    q = quaternion[:, [3, 0, 1, 2]]
+    n = np.sum(q * q, axis=-1, keepdims=True)
+    degenerate = n[:, 0] < EPS
+    q = q * np.sqrt(2.0 / np.where(degenerate[:, None], 1.0, n))
+    q2 = q[:, :, None] * q[:, None, :]
+    mat = np.stack(
+        [
+            1.0 - q2[:, 2, 2] - q2[:, 3, 3],
+            q2[:, 1, 2] - q2[:, 3, 0],
+            q2[:, 1, 3] + q2[:, 2, 0],
+            q2[:, 1, 2] + q2[:, 3, 0],
+            1.0 - q2[:, 1, 1] - q2[:, 3, 3],
+            q2[:, 2, 3] - q2[:, 1, 0],
+            q2[:, 1, 3] - q2[:, 2, 0],
+            q2[:, 2, 3] + q2[:, 1, 0],
+            1.0 - q2[:, 1, 1] - q2[:, 2, 2],
+        ],
+        axis=-1,
+    ).reshape(-1, 3, 3)
+    mat[degenerate] = np.eye(3)
+    return mat
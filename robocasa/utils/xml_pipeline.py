@@ -0,0 +1,59 @@
+"""
+A single-parse pipeline for editing MJCF xml strings. Edit passes are registered as callbacks that
+modify the parsed tree in place, so that a model xml is parsed and serialized only once no matter
+how many edits are applied to it.
+"""
+import xml.etree.ElementTree as ET
+
+
+class XMLEditPipeline:
+    """
+    Ordered collection of edit passes applied to one parsed MJCF tree
+    """
+
+    def __init__(self):
+        self.passes = []
+
+    def register(self, fn, name=None):
+        """
+        Adds an edit pass to the end of the pipeline
+
+        Args:
+            fn (function): callback taking the root element of the parsed tree, modifies it in place
+
+            name (str): (optional) name of the pass, defaults to the name of @fn
+
+        Returns:
+            function: @fn, so that this method can also be used as a decorator
+        """
+        if name is None:
+            name = getattr(fn, "__name__", "pass_{}".format(len(self.passes)))
+        self.passes.append((name, fn))
+        return fn
+
+    def apply(self, root):
+        """
+        Applies all edit passes, in order, to an already parsed tree
+
+        Args:
+            root (Element): root element of the parsed tree
+
+        Returns:
+            Element: @root
+        """
+        for (_, fn) in self.passes:
+            fn(root)
+        return root
+
+    def run(self, xml_str):
+        """
+        Parses @xml_str, applies all edit passes and serializes the result
+
+        Args:
+            xml_str (str): MJCF xml string
+
+        Returns:
+            str: edited xml string
+        """
+        root = self.apply(ET.fromstring(xml_str))
+        return ET.tostring(root).decode("utf8")
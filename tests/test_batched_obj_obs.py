@@ -0,0 +1,60 @@
+import unittest
+
+import numpy as np
+
+import robocasa
+import robosuite
+from robosuite import load_controller_config
+
+DEFAULT_SEED = 3
+
+
+class TestBatchedObjObs(unittest.TestCase):
+    def create_env(self, batched_obj_obs):
+        config = {
+            "env_name": "PnPCounterToCab",
+            "robots": "PandaMobile",
+            "controller_configs": load_controller_config(default_controller="OSC_POSE"),
+            "has_renderer": False,
+            "has_offscreen_renderer": False,
+            "ignore_done": True,
+            "use_camera_obs": False,
+            "control_freq": 20,
+            "seed": DEFAULT_SEED,
+            "randomize_cameras": False,
+            "batched_obj_obs": batched_obj_obs,
+        }
+        return robosuite.make(**config)
+
+    def test_batched_obj_obs(self):
+        """
+        Tests that an env with batched object observations resets and steps, and returns the same object
+        observations as the per-object sensors
+        """
+        env_1 = self.create_env(batched_obj_obs=False)
+        env_2 = self.create_env(batched_obj_obs=True)
+
+        obs_1 = env_1.reset()
+        obs_2 = env_2.reset()
+        self.assertNotIn("object_states", obs_2)
+
+        action = np.zeros(env_1.action_dim)
+        for _ in range(5):
+            obs_1, _, _, _ = env_1.step(action)
+            obs_2, _, _, _ = env_2.step(action)
+
+        self.assertEqual(obs_1.keys(), obs_2.keys())
+        np.testing.assert_allclose(
+            obs_1["object-state"], obs_2["object-state"], atol=1e-6
+        )
+        for obj_name in env_1.obj_body_id:
+            np.testing.assert_allclose(
+                obs_1[f"{obj_name}_pos"], obs_2[f"{obj_name}_pos"], atol=1e-6
+            )
+
+        env_1.close()
+        env_2.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+
+import numpy as np
+
+import robocasa
+import robosuite
+import robosuite.utils.sim_utils as SU
+from robosuite import load_controller_config
+
+DEFAULT_SEED = 3
+
+
+class TestContactTable(unittest.TestCase):
+    def create_env(self):
+        config = {
+            "env_name": "PnPCounterToCab",
+            "robots": "PandaMobile",
+            "controller_configs": load_controller_config(default_controller="OSC_POSE"),
+            "has_renderer": False,
+            "has_offscreen_renderer": False,
+            "ignore_done": True,
+            "use_camera_obs": False,
+            "control_freq": 20,
+            "seed": DEFAULT_SEED,
+            "randomize_cameras": False,
+        }
+        env = robosuite.make(**config)
+        env.reset()
+        return env
+
+    def compare_contacts(self, env):
+        """
+        Compares the contact table with SU.check_contact for all objects against all fixtures, the grippers and
+        any geom
+        """
+        for obj in env.objects.values():
+            self.assertEqual(env.check_contact(obj), SU.check_contact(env.sim, obj))
+            for fxtr in env.fixtures.values():
+                if not hasattr(fxtr, "contact_geoms"):
+                    continue
+                self.assertEqual(
+                    env.check_contact(obj, fxtr), SU.check_contact(env.sim, obj, fxtr)
+                )
+            gripper = env.robots[0].gripper
+            for g in gripper.values() if isinstance(gripper, dict) else [gripper]:
+                self.assertEqual(
+                    env.check_contact(obj, g), SU.check_contact(env.sim, obj, g)
+                )
+
+    def test_contact_table(self):
+        """
+        Tests that the contact table agrees with SU.check_contact after steps and after states are set without
+        stepping the sim (same sim time)
+        """
+        env = self.create_env()
+        self.compare_contacts(env)
+
+        action = np.zeros(env.action_dim)
+        for _ in range(3):
+            env.step(action)
+            self.compare_contacts(env)
+
+        obj = env.objects["obj"]
+        joint = obj.joints[0]
+        qpos = np.array(env.sim.data.get_joint_qpos(joint))
+        self.assertTrue(env.check_contact(obj, env.counter))
+
+        # lift the object off the counter, at the same sim time
+        lifted = qpos.copy()
+        lifted[2] += 1.0
+        env.sim.data.set_joint_qpos(joint, lifted)
+        env.sim.forward()
+        self.assertFalse(env.check_contact(obj, env.counter))
+        self.compare_contacts(env)
+
+        # and put it back onto the counter
+        env.sim.data.set_joint_qpos(joint, qpos)
+        env.sim.forward()
+        self.assertTrue(env.check_contact(obj, env.counter))
+        self.compare_contacts(env)
+
+        env.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -190,6 +190,64 @@ class TestEnvDeterminism(unittest.TestCase):
                 env_2._cam_configs[camera_name]["quat"],
             )
 
+    def test_randomized_cameras_applied(self):
+        """
+        Tests env determinism with randomize_cameras enabled. The camera noise is sampled while the model is
+        built and applied to the compiled model on reset, so the same seed must give the same camera poses in
+        the model and the same object placements.
+        """
+
+        config = {
+            "env_name": "PnPCounterToCab",
+            "robots": "PandaMobile",
+            "controller_configs": load_controller_config(default_controller="OSC_POSE"),
+            "has_renderer": False,
+            "has_offscreen_renderer": False,
+            "ignore_done": True,
+            "use_camera_obs": False,
+            "control_freq": 20,
+            "seed": DEFAULT_SEED,
+            "randomize_cameras": True,
+        }
+
+        env_1 = self.create_env(config)
+        env_2 = self.create_env(config)
+
+        self.assertEqual(env_1._cam_noise, env_2._cam_noise)
+        self.assertGreater(len(env_1._cam_noise), 0)
+        model_1, model_2 = env_1.sim.model, env_2.sim.model
+        for camera_name in env_1._cam_noise.keys():
+            cam_cfg = env_1._cam_configs[camera_name]
+            cam_id = model_1.camera_name2id(camera_name)
+            quat = np.array(cam_cfg["quat"]) / np.linalg.norm(cam_cfg["quat"])
+
+            # the randomized configs are applied to the compiled model
+            np.testing.assert_allclose(model_1.cam_pos[cam_id], cam_cfg["pos"])
+            np.testing.assert_allclose(model_1.cam_quat[cam_id], quat)
+            fovy = cam_cfg.get("camera_attribs", {}).get("fovy", None)
+            if fovy is not None:
+                self.assertAlmostEqual(model_1.cam_fovy[cam_id], float(fovy))
+
+            # and are the same for the same seed
+            np.testing.assert_array_equal(
+                model_1.cam_pos[cam_id], model_2.cam_pos[cam_id]
+            )
+            np.testing.assert_array_equal(
+                model_1.cam_quat[cam_id], model_2.cam_quat[cam_id]
+            )
+            np.testing.assert_array_equal(
+                model_1.cam_fovy[cam_id], model_2.cam_fovy[cam_id]
+            )
+
+        for name in env_1.object_placements.keys():
+            pos_1, quat_1 = env_1.object_placements[name][:2]
+            pos_2, quat_2 = env_2.object_placements[name][:2]
+            np.testing.assert_allclose(pos_1, pos_2, atol=1e-7)
+            np.testing.assert_allclose(quat_1, quat_2, atol=1e-7)
+
+        env_1.close()
+        env_2.close()
+
 
 if __name__ == "__main__":
     unittest.main()
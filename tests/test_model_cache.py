@@ -0,0 +1,72 @@
+import unittest
+
+import numpy as np
+
+import robocasa
+import robosuite
+from robosuite import load_controller_config
+from robocasa.utils.model_cache import get_model_cache
+
+DEFAULT_SEED = 3
+
+
+class TestModelCache(unittest.TestCase):
+    def create_env(self, model_cache):
+        config = {
+            "env_name": "PnPCounterToCab",
+            "robots": "PandaMobile",
+            "controller_configs": load_controller_config(default_controller="OSC_POSE"),
+            "has_renderer": False,
+            "has_offscreen_renderer": False,
+            "ignore_done": True,
+            "use_camera_obs": False,
+            "control_freq": 20,
+            "seed": DEFAULT_SEED,
+            "randomize_cameras": False,
+            "model_cache": model_cache,
+        }
+        return robosuite.make(**config)
+
+    def assert_same_scene(self, env_1, env_2):
+        model_1, model_2 = env_1.sim.model, env_2.sim.model
+        self.assertEqual(model_1.nq, model_2.nq)
+        self.assertEqual(model_1.nbody, model_2.nbody)
+        self.assertEqual(model_1.ngeom, model_2.ngeom)
+        np.testing.assert_array_equal(model_1.body_pos, model_2.body_pos)
+        np.testing.assert_array_equal(model_1.geom_size, model_2.geom_size)
+        np.testing.assert_allclose(env_1.sim.data.qpos, env_2.sim.data.qpos)
+
+    def test_model_cache(self):
+        """
+        Tests that a cache miss and a cache hit give the same model and initial state as compiling the scene
+        """
+        cache = get_model_cache()
+        cache.clear()
+
+        env_ref = self.create_env(model_cache=False)
+        env_miss = self.create_env(model_cache=True)
+        self.assertEqual(cache.hits, 0)
+        env_hit = self.create_env(model_cache=True)
+        self.assertGreater(cache.hits, 0)
+
+        for env in [env_ref, env_miss, env_hit]:
+            env.reset()
+        self.assert_same_scene(env_ref, env_miss)
+        self.assert_same_scene(env_ref, env_hit)
+
+        # the restored models step like the compiled one
+        action = np.zeros(env_ref.action_dim)
+        for _ in range(5):
+            for env in [env_ref, env_miss, env_hit]:
+                env.step(action)
+        np.testing.assert_allclose(
+            env_ref.sim.data.qpos, env_hit.sim.data.qpos, atol=1e-6
+        )
+
+        for env in [env_ref, env_miss, env_hit]:
+            env.close()
+        cache.clear()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import tempfile
+import unittest
+
+import numpy as np
+
+import robocasa
+import robosuite
+from robosuite import load_controller_config
+
+from robocasa.scripts.generate_nav_maps import generate_nav_maps
+from robocasa.utils.nav_map import load_navigation_map
+
+DEFAULT_SEED = 3
+
+
+class TestNavMap(unittest.TestCase):
+    def test_nav_map(self):
+        """
+        Builds the navigation map of a real layout and checks that the candidate base poses computed by
+        compute_robot_base_placement_pose are feasible, and that an env using the map can be reset
+        """
+        with tempfile.TemporaryDirectory() as nav_map_dir:
+            generate_nav_maps(
+                env_name="PnPCounterToCab",
+                robots="PandaMobile",
+                output_dir=nav_map_dir,
+                layout_ids=[0],
+                style_ids=[0],
+                resolution=0.05,
+                robot_radius=0.4,
+                reach=1.0,
+            )
+            nav_map = load_navigation_map(nav_map_dir, 0, 0)
+            self.assertIsNotNone(nav_map)
+            self.assertGreater(len(nav_map.fixture_names), 0)
+            # the base is placed in front of counters, closer than the robot radius
+            self.assertTrue(np.any(nav_map.base_feasible))
+            self.assertTrue(np.any(nav_map.base_components > 0))
+
+            config = {
+                "env_name": "PnPCounterToCab",
+                "robots": "PandaMobile",
+                "controller_configs": load_controller_config(
+                    default_controller="OSC_POSE"
+                ),
+                "has_renderer": False,
+                "has_offscreen_renderer": False,
+                "ignore_done": True,
+                "use_camera_obs": False,
+                "control_freq": 20,
+                "seed": DEFAULT_SEED,
+                "randomize_cameras": False,
+                "layout_ids": [0],
+                "style_ids": [0],
+                "nav_map_dir": nav_map_dir,
+            }
+            env = robosuite.make(**config)
+            env.reset()
+            self.assertIs(env.nav_map, nav_map)
+            self.assertTrue(env._check_nav_map(nav_map))
+            env.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+from unittest import mock
+
+import robocasa.models.objects.kitchen_object_utils as KOU
+from robocasa.models.objects.kitchen_object_utils import ObjCat
+
+
+class TestObjectManifest(unittest.TestCase):
+    def test_folder_missing_from_manifest(self):
+        """
+        Tests that categories whose folder is missing from a stale manifest fall back to walking the folder
+        instead of resolving to no models
+        """
+        walked = ObjCat(name="apple", types="fruit")
+        with mock.patch.object(KOU, "_OBJECT_MANIFEST", None), mock.patch.object(
+            KOU, "_OBJECT_MANIFEST_LOADED", True
+        ), mock.patch.object(KOU, "_OBJECT_MANIFEST_FOLDERS", None):
+            walked_paths = walked.mjcf_paths
+        self.assertGreater(len(walked_paths), 0)
+
+        stale_manifest = {"objaverse/banana/banana_0/model.xml": dict(size=[0.1] * 3)}
+        stale = ObjCat(name="apple", types="fruit")
+        with mock.patch.object(
+            KOU, "_OBJECT_MANIFEST", stale_manifest
+        ), mock.patch.object(KOU, "_OBJECT_MANIFEST_LOADED", True), mock.patch.object(
+            KOU, "_OBJECT_MANIFEST_FOLDERS", None
+        ):
+            self.assertEqual(stale.mjcf_paths, walked_paths)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import unittest
+
+import numpy as np
+from robosuite.models.objects import BoxObject
+from robosuite.utils import RandomizationError
+
+from robocasa.utils.placement_samplers import (
+    SequentialCompositeSampler,
+    UniformRandomSampler,
+)
+
+DEFAULT_SEED = 3
+
+
+class TestPlacementSamplers(unittest.TestCase):
+    def create_sampler(self, objects, batch_size, seed=DEFAULT_SEED, **kwargs):
+        return UniformRandomSampler(
+            name="sampler",
+            mujoco_objects=objects,
+            x_range=(-0.3, 0.3),
+            y_range=(-0.3, 0.3),
+            rotation=0,
+            rng=np.random.default_rng(seed),
+            batch_size=batch_size,
+            **kwargs,
+        )
+
+    def test_scalar_draw_order(self):
+        """
+        Tests that the default batch size draws the candidates in the same order as per-candidate sampling
+        """
+        obj = BoxObject(name="box", size=(0.02, 0.02, 0.02))
+        sampler = self.create_sampler(
+            [obj], batch_size=1, ensure_object_boundary_in_range=False
+        )
+        placements = sampler.sample()
+
+        rng = np.random.default_rng(DEFAULT_SEED)
+        x = rng.uniform(high=0.3, low=-0.3)
+        y = rng.uniform(high=0.3, low=-0.3)
+        pos, _, _ = placements["box"]
+        np.testing.assert_allclose(pos[:2], [x, y])
+
+    def test_batched_placements_valid(self):
+        """
+        Tests that batched and scalar sampling both place all objects inside the region without overlaps
+        """
+        for batch_size in [1, 16]:
+            objs = [
+                BoxObject(name=f"box{i}", size=(0.05, 0.05, 0.02)) for i in range(6)
+            ]
+            placements = self.create_sampler(objs, batch_size=batch_size).sample()
+            self.assertEqual(len(placements), len(objs))
+
+            positions = np.array([placements[obj.name][0] for obj in objs])
+            radii = np.array([obj.horizontal_radius for obj in objs])
+            self.assertTrue(np.all(np.abs(positions[:, :2]) + radii[:, None] <= 0.3))
+            dists = np.linalg.norm(
+                positions[:, None, :2] - positions[None, :, :2], axis=-1
+            )
+            min_dists = radii[:, None] + radii[None, :]
+            off_diag = ~np.eye(len(objs), dtype=bool)
+            self.assertTrue(np.all(dists[off_diag] > min_dists[off_diag]))
+
+    def create_blocking_sampler(self, seed, max_backtracks):
+        """
+        Creates a composite sampler whose first object is often placed where it blocks the fixed position of
+        the second one
+        """
+        rng = np.random.default_rng(seed)
+        composite = SequentialCompositeSampler(
+            name="composite", rng=rng, max_backtracks=max_backtracks
+        )
+        composite.append_sampler(
+            UniformRandomSampler(
+                name="free",
+                mujoco_objects=BoxObject(name="free", size=(0.05, 0.05, 0.02)),
+                x_range=(-0.3, 0.3),
+                y_range=(-0.1, 0.1),
+                rotation=0,
+                rng=rng,
+            )
+        )
+        composite.append_sampler(
+            UniformRandomSampler(
+                name="fixed",
+                mujoco_objects=BoxObject(name="fixed", size=(0.05, 0.05, 0.02)),
+                x_range=(0.2, 0.2),
+                y_range=(0, 0),
+                rotation=0,
+                ensure_object_boundary_in_range=False,
+                rng=rng,
+                batch_size=500,
+            )
+        )
+        return composite
+
+    def test_backtracking(self):
+        """
+        Tests that backtracking re-samples the placement that blocks a later sampler instead of failing
+        """
+        seeds = range(20)
+        num_failures = 0
+        for seed in seeds:
+            try:
+                self.create_blocking_sampler(seed, max_backtracks=0).sample()
+            except RandomizationError:
+                num_failures += 1
+        # without backtracking, some seeds place the first object in the way of the second one
+        self.assertGreater(num_failures, 0)
+
+        for seed in seeds:
+            composite = self.create_blocking_sampler(seed, max_backtracks=5)
+            placements = composite.sample()
+            self.assertEqual(set(placements.keys()), {"free", "fixed"})
+            free_pos = np.array(placements["free"][0])
+            fixed_pos = np.array(placements["fixed"][0])
+            radius = composite.samplers["free"].mujoco_objects[0].horizontal_radius
+            self.assertGreater(np.linalg.norm(free_pos[:2] - fixed_pos[:2]), 2 * radius)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+
+import numpy as np
+
+from robocasa.models.objects.kitchen_object_utils import (
+    OBJ_CATEGORIES,
+    get_object_size,
+    sample_kitchen_object,
+)
+
+DEFAULT_SEED = 3
+
+
+class TestSampleKitchenObject(unittest.TestCase):
+    def test_max_size_per_axis_scale(self):
+        """
+        Tests the max_size filter on a category whose scale is a per-axis list
+        """
+        obj_cat = OBJ_CATEGORIES["bar"]["objaverse"]
+        self.assertEqual(len(obj_cat.scale), 3)
+        scaled_sizes = np.array(
+            [get_object_size(path) * obj_cat.scale for path in obj_cat.mjcf_paths]
+        )
+        max_z = float(np.median(scaled_sizes[:, 2]))
+
+        rng = np.random.default_rng(DEFAULT_SEED)
+        for _ in range(10):
+            mjcf_kwargs, info = sample_kitchen_object(
+                "bar",
+                rng=rng,
+                obj_registries=("objaverse",),
+                max_size=(None, None, max_z),
+            )
+            self.assertEqual(info["cat"], "bar")
+            size = get_object_size(mjcf_kwargs["mjcf_path"]) * np.array(
+                mjcf_kwargs["scale"]
+            )
+            self.assertLessEqual(size[2], max_z)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import robocasa
+import robosuite
+from robosuite import load_controller_config
+from robocasa.scripts.generate_scene_bank import generate_scenes
+from robocasa.utils.scene_bank import save_scene_bank
+
+DEFAULT_SEED = 3
+
+
+class TestSceneBank(unittest.TestCase):
+    def create_env(self, scene_bank):
+        config = {
+            "env_name": "PnPCounterToCab",
+            "robots": "PandaMobile",
+            "controller_configs": load_controller_config(default_controller="OSC_POSE"),
+            "has_renderer": False,
+            "has_offscreen_renderer": False,
+            "ignore_done": True,
+            "use_camera_obs": False,
+            "control_freq": 20,
+            "seed": DEFAULT_SEED,
+            "randomize_cameras": False,
+            "scene_bank": scene_bank,
+        }
+        return robosuite.make(**config)
+
+    def test_scene_bank_reset(self):
+        """
+        Tests that resets from a scene bank restore the object and fixture joints of the stored scene, while
+        the robot keeps its reset pose so that its controller and observations stay consistent
+        """
+        entries = generate_scenes(
+            "PnPCounterToCab", "PandaMobile", n=2, seed=DEFAULT_SEED
+        )
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "scene_bank.hdf5")
+            save_scene_bank(path, entries, env_name="PnPCounterToCab")
+            env = self.create_env(scene_bank=path)
+
+            nq, nv = env.sim.model.nq, env.sim.model.nv
+            for _ in range(2):
+                obs = env.reset()
+                robot_qpos, robot_qvel = env._get_robot_state_mask()
+                self.assertTrue(robot_qpos.any())
+
+                state = env.sim.get_state().flatten()
+                matches = [
+                    np.allclose(
+                        state[1 : 1 + nq][~robot_qpos],
+                        entry["state"][1 : 1 + nq][~robot_qpos],
+                    )
+                    for entry in entries
+                ]
+                self.assertTrue(any(matches))
+
+                # the robot observations and controller goal match the robot pose in the sim
+                robot = env.robots[0]
+                eef_pos = env.sim.data.site_xpos[robot.eef_site_id["right"]]
+                np.testing.assert_allclose(
+                    obs[robot.robot_model.naming_prefix + "eef_pos"], eef_pos, atol=1e-6
+                )
+
+                qpos_before = env.sim.data.qpos[robot_qpos].copy()
+                action = np.zeros(env.action_dim)
+                for _ in range(5):
+                    env.step(action)
+                np.testing.assert_allclose(
+                    env.sim.data.qpos[robot_qpos], qpos_before, atol=0.05
+                )
+
+            env.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
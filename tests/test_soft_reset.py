@@ -0,0 +1,96 @@
+import unittest
+
+import numpy as np
+
+import robocasa
+import robosuite
+from robosuite import load_controller_config
+
+DEFAULT_SEED = 3
+
+
+class TestSoftReset(unittest.TestCase):
+    def create_env(self, **kwargs):
+        config = {
+            "env_name": "PnPCounterToCab",
+            "robots": "PandaMobile",
+            "controller_configs": load_controller_config(default_controller="OSC_POSE"),
+            "has_renderer": False,
+            "has_offscreen_renderer": False,
+            "ignore_done": True,
+            "use_camera_obs": False,
+            "control_freq": 20,
+            "seed": DEFAULT_SEED,
+            "randomize_cameras": False,
+            "soft_reset": True,
+        }
+        config.update(kwargs)
+        return robosuite.make(**config)
+
+    def get_placements(self, env):
+        return {
+            name: np.array(pos) for (name, (pos, _, _)) in env.object_placements.items()
+        }
+
+    def test_soft_reset(self):
+        """
+        Tests that soft resets keep the compiled model and re-sample the object placements
+        """
+        env = self.create_env()
+        env.reset()
+        sim = env.sim
+        placements = self.get_placements(env)
+
+        env.reset()
+        self.assertIs(env.sim, sim)
+        new_placements = self.get_placements(env)
+        self.assertEqual(placements.keys(), new_placements.keys())
+        self.assertTrue(
+            any(
+                not np.allclose(placements[name], new_placements[name])
+                for name in placements
+            )
+        )
+
+        # the new placements are written to the sim
+        for (name, pos) in new_placements.items():
+            obj_pos = env.sim.data.body_xpos[env.obj_body_id[name]]
+            np.testing.assert_allclose(obj_pos[:2], pos[:2], atol=0.02)
+
+        action = np.zeros(env.action_dim)
+        for _ in range(5):
+            env.step(action)
+        env.close()
+
+    def test_soft_reset_determinism(self):
+        """
+        Tests that soft resets with the same seed give the same placements
+        """
+        env_1 = self.create_env()
+        env_2 = self.create_env()
+        for _ in range(3):
+            env_1.reset()
+            env_2.reset()
+            placements_1 = self.get_placements(env_1)
+            placements_2 = self.get_placements(env_2)
+            for name in placements_1:
+                np.testing.assert_allclose(placements_1[name], placements_2[name])
+        env_1.close()
+        env_2.close()
+
+    def test_scene_refresh_interval(self):
+        """
+        Tests that a hard reset is done every scene_refresh_interval episodes
+        """
+        env = self.create_env(scene_refresh_interval=2)
+        env.reset()
+        sim = env.sim
+        env.reset()
+        self.assertIs(env.sim, sim)
+        env.reset()
+        self.assertIsNot(env.sim, sim)
+        env.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
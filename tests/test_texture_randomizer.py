@@ -0,0 +1,79 @@
+import unittest
+
+import numpy as np
+
+import robocasa
+import robosuite
+from robosuite import load_controller_config
+from robocasa.utils.texture_randomizer import TextureRandomizer
+from robocasa.utils.texture_swap import get_random_textures
+
+DEFAULT_SEED = 3
+
+
+class TestTextureRandomizer(unittest.TestCase):
+    def create_env(self):
+        config = {
+            "env_name": "PnPCounterToCab",
+            "robots": "PandaMobile",
+            "controller_configs": load_controller_config(default_controller="OSC_POSE"),
+            "has_renderer": False,
+            "has_offscreen_renderer": False,
+            "ignore_done": True,
+            "use_camera_obs": False,
+            "control_freq": 20,
+            "seed": DEFAULT_SEED,
+            "randomize_cameras": False,
+            "generative_textures": "100p",
+        }
+        return robosuite.make(**config)
+
+    def test_randomizer_updates_only_texture_slots(self):
+        """
+        Tests that runtime texture randomization rewrites the replacement texture slots of a model compiled with
+        generative textures, and leaves the rest of the texture buffer untouched
+        """
+        env = self.create_env()
+        env.reset()
+
+        randomizer = TextureRandomizer()
+        randomizer.bind(env.sim.model._model)
+        self.assertGreater(randomizer.num_slots, 0)
+        tex_before = np.array(randomizer._tex_buffer())
+
+        # pick textures that differ from the ones the model was compiled with
+        rng = np.random.default_rng(DEFAULT_SEED)
+        textures = get_random_textures(rng)
+        while textures == env._curr_gen_fixtures:
+            textures = get_random_textures(rng)
+
+        updated = randomizer.apply(env.sim, textures)
+        tex_after = np.array(randomizer._tex_buffer())
+
+        slots = [slot for slots in randomizer._slots.values() for slot in slots]
+        self.assertEqual(sorted(updated), sorted(slot["id"] for slot in slots))
+
+        in_slot = np.zeros(len(tex_before), dtype=bool)
+        for slot in slots:
+            size = slot["width"] * slot["height"] * slot["nchannel"]
+            in_slot[slot["adr"] : slot["adr"] + size] = True
+        np.testing.assert_array_equal(tex_after[~in_slot], tex_before[~in_slot])
+        self.assertFalse(np.array_equal(tex_after[in_slot], tex_before[in_slot]))
+
+        # the slots hold the new images
+        for (category, cat_slots) in randomizer._slots.items():
+            for slot in cat_slots:
+                if slot["cube"]:
+                    continue
+                w, h, c = slot["width"], slot["height"], slot["nchannel"]
+                expected = randomizer.bank.get(textures[category], w, h, c)
+                np.testing.assert_array_equal(
+                    tex_after[slot["adr"] : slot["adr"] + w * h * c],
+                    expected.reshape(-1),
+                )
+
+        env.close()
+
+
+if __name__ == "__main__":
+    unittest.main()